@@ -57,7 +57,7 @@ Please extract Entities and Relationships following the ALIVE Ontology.
 async def classify_and_extract(text: str) -> Dict[str, Any]:
     try:
         prompt = CLASSIFY_PROMPT.format(text=text)
-        response = model.generate_content(
+        response = await model.generate_content_async(
             prompt,
             generation_config=genai.types.GenerationConfig(
                 response_mime_type="application/json",
@@ -1,16 +1,15 @@
 import os
+import asyncio
 import json
 import logging
 from typing import List, Dict, Any, Optional
 import google.generativeai as genai
-from neo4j import GraphDatabase
+from database.pool import neo4j_pool
 from dotenv import load_dotenv
 
 load_dotenv()
 
 # --- Configuration ---
-NEO4J_URI = os.getenv("NEO4J_URI", "neo4j+ssc://b60a0727.databases.neo4j.io")
-NEO4J_AUTH = (os.getenv("NEO4J_USERNAME"), os.getenv("NEO4J_PASSWORD"))
 GENAI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 if GENAI_API_KEY:
@@ -27,69 +26,72 @@ class ActiveInterviewer:
     Scans the graph for missing links (e.g., Job without Satisfaction, Event without Emotion)
     and generates questions to fill them.
     """
-    def __init__(self):
-        self.driver = GraphDatabase.driver(NEO4J_URI, auth=NEO4J_AUTH)
+    def __init__(self, driver=None):
+        self.driver = driver or neo4j_pool.get_driver()
         self.model = genai.GenerativeModel('gemini-3-flash-preview')
 
-    def close(self):
-        self.driver.close()
-
-    def scan_for_missing_links(self) -> Dict[str, Any]:
+    async def scan_for_missing_links(self) -> Dict[str, Any]:
         """
         Step 1: Scan.
         Finds isolated nodes or pattern gaps using Cypher.
         """
-        missing_patterns = []
-        
-        with self.driver.session() as session:
-            # 1. Events without Emotion (What did you feel?)
-            result = session.run("""
-                MATCH (p:Person)-[:EXPERIENCED]->(e:Event)
-                WHERE NOT (e)-[:CAUSED]->(:Emotion)
-                RETURN e.summary AS event, e.timestamp AS date
-                LIMIT 1
-            """)
-            record = result.single()
-            if record:
-                missing_patterns.append({
-                    "type": "missing_emotion",
-                    "context": f"Event: {record['event']} ({record['date']})",
-                    "target_node": "Emotion"
-                })
-
-            # 2. Skill without Origin (How did you learn this?)
-            result = session.run("""
-                MATCH (p:Person)-[:HAS_SKILL]->(s:Skill)
-                WHERE NOT (s)<-[:RELATED_TO]-(:Event) AND NOT (s)<-[:RELATED_TO]-(:Organization)
-                RETURN s.name AS skill
-                LIMIT 1
-            """)
-            record = result.single()
-            if record:
-                missing_patterns.append({
-                    "type": "missing_origin",
-                    "context": f"Skill: {record['skill']}",
-                    "target_node": "Event/Organization"
-                })
-
-             # 3. Organization without Role/Period (What did you do?)
-            result = session.run("""
-                MATCH (p:Person)-[r:BELONGS_TO]->(o:Organization)
-                WHERE r.role IS NULL
-                RETURN o.name AS org
-                LIMIT 1
-            """)
-            record = result.single()
-            if record:
-                missing_patterns.append({
-                    "type": "missing_role",
-                    "context": f"Organization: {record['org']}",
-                    "target_node": "Role Property"
-                })
+        async with self.driver.session() as session:
+            missing_patterns = await session.execute_read(self._scan_tx)
 
         # Return the first found issue for focused questioning
         return missing_patterns[0] if missing_patterns else None
 
+    @staticmethod
+    async def _scan_tx(tx) -> List[Dict[str, Any]]:
+        missing_patterns = []
+
+        # 1. Events without Emotion (What did you feel?)
+        result = await tx.run("""
+            MATCH (p:Person)-[:EXPERIENCED]->(e:Event)
+            WHERE NOT (e)-[:CAUSED]->(:Emotion)
+            RETURN e.summary AS event, e.timestamp AS date
+            LIMIT 1
+        """)
+        record = await result.single()
+        if record:
+            missing_patterns.append({
+                "type": "missing_emotion",
+                "context": f"Event: {record['event']} ({record['date']})",
+                "target_node": "Emotion"
+            })
+
+        # 2. Skill without Origin (How did you learn this?)
+        result = await tx.run("""
+            MATCH (p:Person)-[:HAS_SKILL]->(s:Skill)
+            WHERE NOT (s)<-[:RELATED_TO]-(:Event) AND NOT (s)<-[:RELATED_TO]-(:Organization)
+            RETURN s.name AS skill
+            LIMIT 1
+        """)
+        record = await result.single()
+        if record:
+            missing_patterns.append({
+                "type": "missing_origin",
+                "context": f"Skill: {record['skill']}",
+                "target_node": "Event/Organization"
+            })
+
+         # 3. Organization without Role/Period (What did you do?)
+        result = await tx.run("""
+            MATCH (p:Person)-[r:BELONGS_TO]->(o:Organization)
+            WHERE r.role IS NULL
+            RETURN o.name AS org
+            LIMIT 1
+        """)
+        record = await result.single()
+        if record:
+            missing_patterns.append({
+                "type": "missing_role",
+                "context": f"Organization: {record['org']}",
+                "target_node": "Role Property"
+            })
+
+        return missing_patterns
+
     def generate_question(self, gap_info: Dict[str, Any]) -> str:
         """
         Step 2: Generate Question.
@@ -118,17 +120,21 @@ class ActiveInterviewer:
             logger.error(f"Error generating question: {e}")
             return "그 일에 대해 좀 더 자세히 이야기해 줄 수 있어?"
 
-    def get_proactive_question(self) -> str:
+    async def get_proactive_question(self) -> str:
         """
         Orchestration method.
         """
-        gap = self.scan_for_missing_links()
-        question = self.generate_question(gap)
+        gap = await self.scan_for_missing_links()
+        # generate_content blocks on the Gemini call; keep it off the event loop
+        question = await asyncio.to_thread(self.generate_question, gap)
         return question
 
-if __name__ == "__main__":
-    # Test
+async def _main():
     agent = ActiveInterviewer()
-    q = agent.get_proactive_question()
+    q = await agent.get_proactive_question()
     print(f"Agent Question: {q}")
-    agent.close()
+    await neo4j_pool.close()
+
+if __name__ == "__main__":
+    # Test
+    asyncio.run(_main())
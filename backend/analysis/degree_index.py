@@ -0,0 +1,69 @@
+"""
+Top nodes by degree, kept in sync with the incremental centrality service.
+
+Nodes sit in one bucket per degree. An edge update changes a degree by exactly one, so a
+node moves to the neighboring bucket in O(1) and the highest non-empty degree moves by at
+most one step. top(k) walks buckets down from the highest degree and stops after k
+matches, independent of the graph size. Only nodes with a name are returned, matching
+the keyword queries this replaces.
+"""
+
+class DegreeIndex:
+    def __init__(self):
+        self.degree = {} # node id -> degree
+        self.buckets = {} # degree -> {node id: None} (insertion-ordered set)
+        self.max_degree = 0
+        self.names = {} # node id -> name, for keyword selection
+
+    def _place(self, u, d):
+        self.degree[u] = d
+        self.buckets.setdefault(d, {})[u] = None
+        if d > self.max_degree:
+            self.max_degree = d
+
+    def _unplace(self, u) -> int:
+        d = self.degree.pop(u)
+        bucket = self.buckets[d]
+        del bucket[u]
+        if not bucket:
+            del self.buckets[d]
+            while self.max_degree > 0 and self.max_degree not in self.buckets:
+                self.max_degree -= 1
+        return d
+
+    def add(self, u):
+        if u not in self.degree:
+            self._place(u, 0)
+
+    def increment(self, u):
+        self._place(u, self._unplace(u) + 1 if u in self.degree else 1)
+
+    def decrement(self, u):
+        if u in self.degree:
+            self._place(u, max(self._unplace(u) - 1, 0))
+
+    def discard(self, u):
+        if u in self.degree:
+            self._unplace(u)
+        self.names.pop(u, None)
+
+    def load(self, degrees: dict):
+        """Rebuilds from {node id: degree}; names are kept."""
+        self.degree, self.buckets, self.max_degree = {}, {}, 0
+        for u, d in degrees.items():
+            self._place(u, d)
+
+    def set_names(self, names: dict):
+        self.names.update((u, name) for u, name in names.items() if name)
+
+    def top(self, k: int) -> list:
+        """[(name, degree)] of the k highest-degree named nodes, highest first."""
+        result = []
+        for d in range(self.max_degree, -1, -1):
+            for u in self.buckets.get(d, ()):
+                name = self.names.get(u)
+                if name:
+                    result.append((name, d))
+                    if len(result) >= k:
+                        return result
+        return result
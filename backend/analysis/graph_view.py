@@ -0,0 +1,171 @@
+"""
+Compact in-memory graph shared by the analytics steps of one request.
+
+Node ids are interned and mapped to int indices, edges are two int arrays and
+relationship names are interned strings. Root resolution, centrality, community
+detection and component filtering all read the same view, so a request builds its
+graph once and node payloads are only turned into response dicts at the end.
+"""
+import sys
+import hashlib
+from array import array
+
+from .root_index import RootIndex
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+class NodeRecord:
+    """A node payload plus its analytics results, merged into the payload by to_dict()."""
+    __slots__ = ("payload", "val", "centrality", "group", "is_root", "position")
+
+    def __init__(self, payload: dict):
+        self.payload = payload
+        self.val = None
+        self.centrality = None
+        self.group = None
+        self.is_root = False
+        self.position = None
+
+    def to_dict(self) -> dict:
+        payload = self.payload
+        if self.val is not None:
+            payload['val'] = self.val
+            payload['centrality'] = self.centrality
+        if self.is_root:
+            payload['isRoot'] = True
+        if self.group is not None:
+            payload['group'] = self.group
+        if self.position is not None:
+            # Server-side layout: pinned (fx/fy/fz) and initial (x/y/z) coordinates,
+            # so the client does not have to run the force simulation
+            payload['fx'], payload['fy'], payload['fz'] = self.position
+            payload['x'], payload['y'], payload['z'] = self.position
+        return payload
+
+class GraphView:
+    """
+    - ids / index: node id <-> int index
+    - records: NodeRecord per index
+    - src / dst / link_names: one entry per link, endpoints as indices
+    """
+    __slots__ = ("ids", "index", "records", "src", "dst", "link_names", "_root_index")
+
+    def __init__(self):
+        self.ids = []
+        self.index = {}
+        self.records = []
+        self.src = array('i')
+        self.dst = array('i')
+        self.link_names = []
+        self._root_index = None
+
+    @classmethod
+    def from_payload(cls, nodes: list, links: list):
+        """View over get_graph-style dicts. Links to unknown nodes are dropped."""
+        view = cls()
+        for node in nodes:
+            view.add_node(node['id'], node)
+        for l in links:
+            src_id = _link_id(l.get('source'))
+            tgt_id = _link_id(l.get('target'))
+            if src_id in view.index and tgt_id in view.index:
+                view.add_link(src_id, tgt_id, l.get('name', ""))
+        return view
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, nid):
+        return nid in self.index
+
+    def add_node(self, nid, payload: dict) -> int:
+        """Adds a node (first payload wins) and returns its index."""
+        idx = self.index.get(nid)
+        if idx is not None:
+            return idx
+        nid = _intern(nid)
+        payload['id'] = nid
+        idx = len(self.ids)
+        self.ids.append(nid)
+        self.index[nid] = idx
+        self.records.append(NodeRecord(payload))
+        self._root_index = None
+        return idx
+
+    def add_link(self, src_id, tgt_id, name: str = ""):
+        self.src.append(self.index[src_id])
+        self.dst.append(self.index[tgt_id])
+        self.link_names.append(_intern(name))
+
+    def subgraph(self, keep) -> "GraphView":
+        """New view over a set of indices; node records are shared, not copied."""
+        view = GraphView()
+        for idx in sorted(keep):
+            nid = self.ids[idx]
+            view.index[nid] = len(view.ids)
+            view.ids.append(nid)
+            view.records.append(self.records[idx])
+        for s, t, name in zip(self.src, self.dst, self.link_names):
+            if s in keep and t in keep:
+                view.src.append(view.index[self.ids[s]])
+                view.dst.append(view.index[self.ids[t]])
+                view.link_names.append(name)
+        return view
+
+    def adjacency(self) -> dict:
+        """{node_id: [neighbor ids]} over the view's links."""
+        adjacency = {nid: [] for nid in self.ids}
+        for s, t in zip(self.src, self.dst):
+            if s != t:
+                adjacency[self.ids[s]].append(self.ids[t])
+                adjacency[self.ids[t]].append(self.ids[s])
+        return adjacency
+
+    # --- Analytics Inputs ---
+
+    def node_range(self) -> range:
+        return range(len(self.ids))
+
+    def edge_pairs(self) -> list:
+        """(src, dst) index tuples, the input shape of the network_stats jobs."""
+        return list(zip(self.src, self.dst))
+
+    @property
+    def root_index(self) -> RootIndex:
+        if self._root_index is None:
+            self._root_index = RootIndex(r.payload for r in self.records)
+        return self._root_index
+
+    def resolve_root(self, root_id: str = None, root_index: RootIndex = None):
+        """Index of the root node, or None."""
+        root_nid = (root_index or self.root_index).resolve(root_id)
+        return self.index.get(root_nid)
+
+    def fingerprint(self) -> str:
+        """Graph version: hash of the node ids and undirected links, independent of record order."""
+        ids = self.ids
+        h = hashlib.blake2b(digest_size=16)
+        h.update("\0".join(sorted(map(str, ids))).encode())
+        pairs = sorted(tuple(sorted((str(ids[s]), str(ids[t])))) for s, t in zip(self.src, self.dst))
+        h.update("\0".join(f"{a}\1{b}" for a, b in pairs).encode())
+        return h.hexdigest()
+
+    # --- Output ---
+
+    def to_payload(self, keep=None) -> dict:
+        """{"nodes", "links"} response dicts, optionally restricted to a set of indices."""
+        ids = self.ids
+        if keep is None:
+            nodes = [r.to_dict() for r in self.records]
+            links = [{"source": ids[s], "target": ids[t], "name": name}
+                     for s, t, name in zip(self.src, self.dst, self.link_names)]
+        else:
+            nodes = [self.records[i].to_dict() for i in sorted(keep)]
+            links = [{"source": ids[s], "target": ids[t], "name": name}
+                     for s, t, name in zip(self.src, self.dst, self.link_names)
+                     if s in keep and t in keep]
+        return {"nodes": nodes, "links": links}
+
+def _link_id(endpoint):
+    return endpoint['id'] if isinstance(endpoint, dict) else endpoint
@@ -0,0 +1,335 @@
+"""
+Incremental PageRank maintained as nodes and edges are ingested.
+
+Keeps an estimate p and a residual r per node (forward-push formulation) with the invariant
+
+    p(t) + a*r(t) = a + (1-a) * sum_{w: t in out(w)} p(w) / |out(w)|
+
+where a is the teleport probability and out(w) is w's neighbor set (a self-loop for
+isolated nodes). When r is 0, p/n is the PageRank vector. An edge update only changes
+the terms of its two endpoints, so it is absorbed by adjusting a few residuals and
+pushing them locally until every |r(u)| <= tolerance * deg(u). A full power iteration
+runs every FULL_RECOMPUTE_EVERY updates to bound accumulated drift. It runs in a background
+thread on a snapshot of the graph; updates made meanwhile are logged and replayed onto the
+result (local pushes only) before it is swapped in.
+"""
+import os
+import threading
+from collections import deque
+
+from .degree_index import DegreeIndex
+
+DAMPING = 0.85
+TOLERANCE = float(os.getenv("PAGERANK_TOLERANCE", "1e-3"))
+FULL_RECOMPUTE_EVERY = int(os.getenv("PAGERANK_FULL_RECOMPUTE_EVERY", "2000"))
+
+class IncrementalPageRank:
+    def __init__(self, damping: float = DAMPING, tolerance: float = TOLERANCE,
+                 full_recompute_every: int = FULL_RECOMPUTE_EVERY):
+        self.alpha = 1.0 - damping # teleport probability
+        self.tolerance = tolerance
+        self.full_recompute_every = full_recompute_every
+        self.adj = {}
+        self.p = {}
+        self.r = {}
+        self.updates_since_full = 0
+        self.ready = False # True once loaded from the database
+        self.degree_index = DegreeIndex() # top-degree nodes for keyword selection
+        self.element_ids = {} # node id -> Neo4j elementId, for index-free lookups by id
+        # Held by updates and by the snapshot / swap of a rebuild running in another thread
+        self.lock = threading.Lock()
+        self.log = None # updates since the snapshot of a running rebuild, replayed onto it
+        self.generation = 0 # bumped by each load, so an older rebuild is discarded
+        self.loading = False # between track_changes()/load() and the load's swap
+        self.recomputing = False
+
+    # --- Graph Mutation ---
+
+    def _out(self, u):
+        return self.adj[u] or (u,)
+
+    def _add_node(self, u) -> bool:
+        if u in self.adj:
+            return False
+        self.adj[u] = set()
+        self.p[u] = 0.0
+        self.r[u] = 1.0 # teleport mass of the new node
+        self.degree_index.add(u)
+        return True
+
+    def _rewire(self, x, mutate):
+        """Applies mutate() to x's neighbor set and moves x's contribution to match."""
+        old_out = self._out(x)
+        old_share = (1.0 - self.alpha) * self.p[x] / len(old_out) / self.alpha
+        for t in old_out:
+            self.r[t] -= old_share
+        mutate()
+        new_out = self._out(x)
+        new_share = (1.0 - self.alpha) * self.p[x] / len(new_out) / self.alpha
+        for t in new_out:
+            self.r[t] += new_share
+        return set(old_out) | set(new_out)
+
+    def _add_edge(self, u, v) -> set:
+        self._add_node(u)
+        self._add_node(v)
+        if v in self.adj[u]:
+            return set()
+        touched = self._rewire(u, lambda: self.adj[u].add(v))
+        self.degree_index.increment(u)
+        if u != v:
+            touched |= self._rewire(v, lambda: self.adj[v].add(u))
+            self.degree_index.increment(v)
+        return touched | {u, v}
+
+    def _remove_edge(self, u, v) -> set:
+        if u not in self.adj or v not in self.adj[u]:
+            return set()
+        touched = self._rewire(u, lambda: self.adj[u].discard(v))
+        self.degree_index.decrement(u)
+        if u != v:
+            touched |= self._rewire(v, lambda: self.adj[v].discard(u))
+            self.degree_index.decrement(v)
+        return touched
+
+    # --- Local Push ---
+
+    def _threshold(self, u):
+        return self.tolerance * max(len(self.adj[u]), 1)
+
+    def _push(self, seeds):
+        queue = deque(u for u in seeds if u in self.r and abs(self.r[u]) > self._threshold(u))
+        queued = set(queue)
+        while queue:
+            u = queue.popleft()
+            queued.discard(u)
+            ru = self.r[u]
+            self.p[u] += self.alpha * ru
+            self.r[u] = 0.0
+            out = self._out(u)
+            share = (1.0 - self.alpha) * ru / len(out)
+            for t in out:
+                self.r[t] += share
+                if t not in queued and abs(self.r[t]) > self._threshold(t):
+                    queue.append(t)
+                    queued.add(t)
+
+    def _after_update(self, touched: set, count: int):
+        self._push(touched)
+        self.updates_since_full += count
+        due = self.updates_since_full >= self.full_recompute_every
+        if due and self.ready and not self.loading and not self.recomputing:
+            self.recomputing = True
+            threading.Thread(target=self.recompute, name="pagerank-recompute", daemon=True).start()
+
+    def _apply_add(self, node_ids: list, edges: list) -> set:
+        touched = {u for u in node_ids if self._add_node(u)}
+        for u, v in edges:
+            touched |= self._add_edge(u, v)
+        return touched
+
+    def _apply_remove(self, u) -> set:
+        touched = set()
+        for v in list(self.adj[u]):
+            touched |= self._remove_edge(u, v)
+        # Isolated now: u only feeds itself, so dropping it leaves the invariant intact
+        del self.adj[u], self.p[u], self.r[u]
+        self.degree_index.discard(u)
+        touched.discard(u)
+        return touched
+
+    # --- Rebuilds ---
+
+    def _rebuilt(self, adj: dict) -> "IncrementalPageRank":
+        """A separate instance over `adj` with converged scores; touches nothing shared."""
+        fresh = IncrementalPageRank(1.0 - self.alpha, self.tolerance, self.full_recompute_every)
+        fresh.adj = adj
+        fresh.p = dict.fromkeys(adj, 0.0)
+        fresh.r = dict.fromkeys(adj, 1.0)
+        fresh._full_recompute()
+        return fresh
+
+    def _swap(self, fresh: "IncrementalPageRank"):
+        """Replays the logged updates onto `fresh` and takes over its scores. Caller holds the lock."""
+        for op, *args in self.log or ():
+            if op == "add":
+                fresh._push(fresh._apply_add(*args))
+            elif args[0] in fresh.adj:
+                fresh._push(fresh._apply_remove(args[0]))
+        self.log = None
+        self.adj, self.p, self.r = fresh.adj, fresh.p, fresh.r
+
+    # --- Public API ---
+
+    def add(self, node_ids: list, edges: list):
+        """Adds nodes and undirected (source, target) edges, then restores the tolerance locally."""
+        with self.lock:
+            if self.log is not None:
+                self.log.append(("add", list(node_ids), list(edges)))
+            touched = self._apply_add(node_ids, edges)
+            self._after_update(touched, len(node_ids) + len(edges))
+
+    def remove_node(self, u):
+        with self.lock:
+            if self.log is not None:
+                self.log.append(("remove", u))
+            self.element_ids.pop(u, None)
+            if u in self.adj:
+                self._after_update(self._apply_remove(u), 1)
+
+    def _begin_load(self) -> int:
+        self.generation += 1 # a running recompute must not swap in or consume the log
+        if not self.loading:
+            self.log = []
+            self.loading = True
+        return self.generation
+
+    def track_changes(self):
+        """Starts the update log replayed by the next load(), e.g. before reading the graph it loads."""
+        with self.lock:
+            self._begin_load()
+
+    def discard_changes(self):
+        """Stops the log started by track_changes() when the load will not happen."""
+        with self.lock:
+            self.generation += 1
+            self.log = None
+            self.loading = False
+
+    def load(self, node_ids: list, edges: list):
+        """
+        Replaces the whole graph (startup / reset) and runs a full recomputation. Blocking, so
+        run it off the event loop; updates made since track_changes() (or since the call) are
+        replayed onto the loaded graph.
+        """
+        with self.lock:
+            generation = self._begin_load()
+        adj = {}
+        for u in node_ids:
+            adj.setdefault(u, set())
+        for u, v in edges:
+            adj.setdefault(u, set()).add(v)
+            adj.setdefault(v, set()).add(u)
+        fresh = self._rebuilt(adj)
+        fresh.degree_index.load(fresh.degrees())
+        with self.lock:
+            if generation != self.generation:
+                return # a newer load() owns the swap
+            self._swap(fresh)
+            fresh.degree_index.names = self.degree_index.names
+            self.degree_index = fresh.degree_index
+            self.element_ids = {u: eid for u, eid in self.element_ids.items() if u in self.adj}
+            self.updates_since_full = 0
+            self.loading = False
+            self.ready = True
+
+    def recompute(self):
+        """
+        Full power iteration on a snapshot of the graph. Blocking, but only the snapshot copy
+        and the swap hold the lock; updates made meanwhile are replayed onto the result.
+        """
+        self.recomputing = True
+        try:
+            with self.lock:
+                if self.loading:
+                    return # the load recomputes anyway
+                adj = {u: set(nbrs) for u, nbrs in self.adj.items()}
+                generation = self.generation
+                if self.log is None:
+                    self.log = []
+                self.updates_since_full = 0
+            fresh = None
+            try:
+                fresh = self._rebuilt(adj)
+            finally:
+                with self.lock:
+                    if generation == self.generation:
+                        if fresh is not None:
+                            # The degree index already follows every update; only scores are swapped
+                            self._swap(fresh)
+                        else:
+                            self.log = None
+        finally:
+            self.recomputing = False
+
+    def _full_recompute(self):
+        """Full power iteration, then residuals recomputed exactly from the invariant."""
+        n = len(self.adj)
+        if n == 0:
+            return
+        node_ids = list(self.adj)
+        try:
+            from .sparse_engine import build_csr, pagerank
+        except ImportError:
+            # No NumPy/SciPy: restart the push from the teleport vector
+            self.p = {u: 0.0 for u in node_ids}
+            self.r = {u: 1.0 for u in node_ids}
+            self._push(node_ids)
+            return
+        edges = [(u, v) for u, nbrs in self.adj.items() for v in nbrs if u <= v]
+        A, _ = build_csr(node_ids, edges)
+        # Isolated nodes keep their mass (self-loop), matching the push formulation
+        isolated = [i for i, u in enumerate(node_ids) if not self.adj[u]]
+        if isolated:
+            A = A.tolil()
+            A[isolated, isolated] = 1.0
+            A = A.tocsr()
+        scores = pagerank(A, alpha=1.0 - self.alpha, tol=self.tolerance / n)
+        self.p = {u: float(s) * n for u, s in zip(node_ids, scores)}
+
+        rhs = {u: self.alpha for u in node_ids}
+        for w in node_ids:
+            out = self._out(w)
+            share = (1.0 - self.alpha) * self.p[w] / len(out)
+            for t in out:
+                rhs[t] += share
+        self.r = {u: (rhs[u] - self.p[u]) / self.alpha for u in node_ids}
+        self._push(node_ids)
+
+    def scores(self) -> dict:
+        """Normalized PageRank per node id (sums to ~1)."""
+        n = len(self.p)
+        return {u: pu / n for u, pu in self.p.items()} if n else {}
+
+    def scores_for(self, node_ids: list):
+        """Scores for a subgraph, or None if any node is unknown to the service."""
+        if not self.ready:
+            return None
+        n = len(self.p)
+        try:
+            return {u: self.p[u] / n for u in node_ids}
+        except KeyError:
+            return None
+
+    def degree(self, u) -> int:
+        return len(self.adj.get(u, ()))
+
+    def degrees(self) -> dict:
+        return {u: len(nbrs) for u, nbrs in self.adj.items()}
+
+    def set_names(self, names: dict):
+        """Display names by node id, for top_names()."""
+        self.degree_index.set_names(names)
+
+    def set_element_ids(self, element_ids: dict):
+        """Neo4j elementIds by node id, so callers can seek nodes by elementId."""
+        self.element_ids.update(element_ids)
+
+    def element_id(self, u):
+        return self.element_ids.get(u)
+
+    def top_names(self, k: int) -> list:
+        """Names of the k highest-degree named nodes, without touching the database."""
+        return [name for name, _ in self.degree_index.top(k)]
+
+# Process-wide service fed by Neo4jIngestor.ingest_batch
+centrality_service = IncrementalPageRank()
+
+def batch_names(graph_data: dict) -> dict:
+    """{node id: name} of an ingestion batch, for the degree index."""
+    names = {}
+    for n in graph_data.get("nodes", []):
+        name = n.get("name") or (n.get("properties") or {}).get("name")
+        if n.get("id") and name:
+            names[str(n["id"])] = name
+    return names
@@ -0,0 +1,150 @@
+"""
+Server-side 3D force-directed layout (NumPy).
+
+Fruchterman-Reingold: springs along links, repulsion between all node pairs and a weak
+pull to the origin, with a cooling step size. Repulsion is exact for small graphs;
+larger graphs use a one-level Barnes-Hut grid where nodes in the same cell repel
+exactly and every other cell acts through its center of mass.
+Coordinates are in frontend units: the ideal link length is LINK_DISTANCE.
+"""
+import os
+import numpy as np
+
+LINK_DISTANCE = float(os.getenv("LAYOUT_LINK_DISTANCE", "60"))
+ITERATIONS = int(os.getenv("LAYOUT_ITERATIONS", "150"))
+# Runs after small edits start from the cached positions and only need a short, cool pass
+INCREMENTAL_ITERATIONS = int(os.getenv("LAYOUT_INCREMENTAL_ITERATIONS", "30"))
+# Warm start when at least this share of the nodes already has a position
+INCREMENTAL_MIN_KNOWN = 0.8
+EXACT_MAX_NODES = 1500
+GRAVITY = float(os.getenv("LAYOUT_GRAVITY", "0.05"))
+REPULSION = float(os.getenv("LAYOUT_REPULSION", "0.05"))
+_ROW_CHUNK = 512
+
+def _repulsion_block(pos_rows, pos_cols, weights, k2):
+    """
+    Repulsion on pos_rows from point masses at pos_cols: sum_j w_j * k^2 / d^2 * (p_i - p_j).
+    Distances come from |a|^2 + |b|^2 - 2ab so the heavy work is a matrix product.
+    """
+    d2 = (np.einsum('ij,ij->i', pos_rows, pos_rows)[:, None]
+          + np.einsum('ij,ij->i', pos_cols, pos_cols)[None, :]
+          - 2.0 * pos_rows @ pos_cols.T)
+    np.maximum(d2, 1e-2, out=d2)
+    w = weights * (REPULSION * k2) / d2
+    return pos_rows * w.sum(axis=1)[:, None] - w @ pos_cols
+
+def _repulsion_exact(pos, k2):
+    disp = np.zeros_like(pos)
+    ones = np.ones(pos.shape[0])
+    for start in range(0, pos.shape[0], _ROW_CHUNK):
+        rows = slice(start, start + _ROW_CHUNK)
+        # Self-pairs have delta 0 and add nothing
+        disp[rows] = _repulsion_block(pos[rows], pos, ones[None, :], k2)
+    return disp
+
+def _repulsion_grid(pos, k2):
+    n = pos.shape[0]
+    # ~sqrt(n) cells balances the near-field (n^2 / cells) and far-field (n * cells) work
+    side = max(2, int(round(n ** (1.0 / 6.0))))
+    lo = pos.min(axis=0)
+    span = np.maximum(pos.max(axis=0) - lo, 1e-9)
+    coords = np.minimum(((pos - lo) / span * side).astype(np.int64), side - 1)
+    cell = (coords[:, 0] * side + coords[:, 1]) * side + coords[:, 2]
+
+    mass = np.bincount(cell, minlength=side ** 3).astype(np.float64)
+    occupied = np.flatnonzero(mass)
+    center = np.stack([np.bincount(cell, weights=pos[:, d], minlength=side ** 3) for d in range(3)], axis=1)
+    center = center[occupied] / mass[occupied, None]
+    mass = mass[occupied]
+    cell_rank = np.searchsorted(occupied, cell)
+
+    disp = np.zeros_like(pos)
+    # Far field: every other cell through its center of mass
+    for start in range(0, n, _ROW_CHUNK):
+        rows = slice(start, start + _ROW_CHUNK)
+        weights = np.broadcast_to(mass, (pos[rows].shape[0], mass.shape[0])).copy()
+        weights[np.arange(weights.shape[0]), cell_rank[rows]] = 0.0
+        disp[rows] = _repulsion_block(pos[rows], center, weights, k2)
+
+    # Near field: exact within each cell
+    order = np.argsort(cell_rank, kind="stable")
+    bounds = np.searchsorted(cell_rank[order], np.arange(occupied.shape[0] + 1))
+    for c in range(occupied.shape[0]):
+        members = order[bounds[c]:bounds[c + 1]]
+        if members.shape[0] > 1:
+            disp[members] += _repulsion_exact(pos[members], k2)
+    return disp
+
+def _attraction(pos, src, dst, k):
+    delta = pos[src] - pos[dst]
+    dist = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+    pull = delta * (dist / k)[:, None]
+    n = pos.shape[0]
+    disp = np.zeros_like(pos)
+    for d in range(3):
+        disp[:, d] = np.bincount(dst, weights=pull[:, d], minlength=n) - np.bincount(src, weights=pull[:, d], minlength=n)
+    return disp
+
+def _place_new_nodes(pos, known, src, dst, rng, k):
+    """New nodes start next to their placed neighbors (a few propagation rounds), else at random."""
+    placed = known.copy()
+    for _ in range(3):
+        if placed.all():
+            break
+        mask = placed[src] & ~placed[dst]
+        rev = placed[dst] & ~placed[src]
+        targets = np.concatenate([dst[mask], src[rev]])
+        sources = np.concatenate([src[mask], dst[rev]])
+        if targets.shape[0] == 0:
+            break
+        counts = np.bincount(targets, minlength=pos.shape[0])
+        hit = counts > 0
+        for d in range(3):
+            sums = np.bincount(targets, weights=pos[sources, d], minlength=pos.shape[0])
+            pos[hit, d] = sums[hit] / counts[hit]
+        pos[hit] += rng.normal(scale=k * 0.5, size=(int(hit.sum()), 3))
+        placed |= hit
+    radius = np.abs(pos[known]).max() if known.any() else k * np.cbrt(pos.shape[0])
+    pos[~placed] = rng.uniform(-radius, radius, size=(int((~placed).sum()), 3))
+    return pos
+
+def compute_layout(n: int, edges: list, initial: dict = None, seed: int = 0) -> list:
+    """
+    3D positions [[x, y, z], ...] per node index.
+    `initial` ({index: [x, y, z]}) seeds known nodes; when it covers most of the graph
+    only a short incremental pass runs, so existing nodes barely move.
+    """
+    if n == 0:
+        return []
+    rng = np.random.default_rng(seed)
+    k = LINK_DISTANCE
+    pairs = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    src, dst = pairs[:, 0], pairs[:, 1]
+
+    pos = np.zeros((n, 3))
+    known = np.zeros(n, dtype=bool)
+    for idx, xyz in (initial or {}).items():
+        pos[idx] = xyz
+        known[idx] = True
+
+    incremental = known.sum() >= INCREMENTAL_MIN_KNOWN * n
+    if incremental:
+        pos = _place_new_nodes(pos, known, src, dst, rng, k)
+        iterations, temperature = INCREMENTAL_ITERATIONS, k * 0.25
+    else:
+        pos = rng.uniform(-1.0, 1.0, size=(n, 3)) * k * np.cbrt(n)
+        iterations, temperature = ITERATIONS, k * np.cbrt(n)
+
+    repulsion = _repulsion_exact if n <= EXACT_MAX_NODES else _repulsion_grid
+    k2 = k * k
+    for step in range(iterations):
+        disp = repulsion(pos, k2) + _attraction(pos, src, dst, k) - GRAVITY * pos
+        length = np.sqrt(np.einsum('ij,ij->i', disp, disp))
+        limit = temperature * (1.0 - step / iterations)
+        scale = np.minimum(length, limit) / np.maximum(length, 1e-9)
+        pos += disp * scale[:, None]
+
+    if not incremental:
+        pos -= pos.mean(axis=0)
+    return np.round(pos, 2).tolist()
@@ -0,0 +1,121 @@
+"""
+Background job that writes graph analytics back onto Neo4j nodes:
+- pagerank: from the incremental PageRank service
+- degree: distinct neighbors in the same graph
+- community: full-graph Louvain, warm-started from the cached partition
+Only values that changed since the last run are written, in batched transactions.
+"""
+import os
+import asyncio
+
+from database.transactions import fetch_all, consume
+
+from .incremental_pagerank import centrality_service
+from .worker_pool import detect_communities_async
+
+PERSIST_INTERVAL = float(os.getenv("ANALYTICS_PERSIST_INTERVAL", "60"))
+PERSIST_BATCH_SIZE = int(os.getenv("ANALYTICS_PERSIST_BATCH_SIZE", "1000"))
+PERSIST_COMMUNITY_TIMEOUT = float(os.getenv("ANALYTICS_PERSIST_COMMUNITY_TIMEOUT", "60.0"))
+# Relative PageRank change below which a node is not rewritten
+PAGERANK_WRITE_EPSILON = 0.01
+
+# Labels with id and pagerank/degree/community indexes (optimize_db.py). A label-less match
+# scans every node, so id and degree lookups only go through these labels.
+INDEXED_LABELS = ("Person", "Organization", "Skill", "Interest", "Event", "Concept")
+
+# Element ids of service ids the centrality service has no mapping for
+ELEMENT_IDS_QUERY = """
+UNWIND $ids AS id
+CALL {
+    WITH id
+""" + "\n    UNION WITH id\n".join(f"    MATCH (n:{label} {{id: id}}) RETURN n" for label in INDEXED_LABELS) + """
+}
+RETURN DISTINCT id, elementId(n) AS eid
+"""
+
+WRITE_QUERY = """
+UNWIND $rows AS row
+MATCH (n) WHERE elementId(n) = row.eid
+SET n.pagerank = row.pagerank,
+    n.degree = row.degree,
+    n.community = coalesce(row.community, n.community)
+"""
+
+def _changed(old, new) -> bool:
+    if old is None:
+        return True
+    old_rank, old_degree, old_community = old
+    rank, degree, community = new
+    return (degree != old_degree
+            or (community is not None and community != old_community)
+            or abs(rank - old_rank) > PAGERANK_WRITE_EPSILON * max(old_rank, 1e-12))
+
+class AnalyticsMaterializer:
+    def __init__(self, driver):
+        self.driver = driver
+        self.element_ids = {}
+        self.written = {} # node id -> (pagerank, degree, community) last written
+
+    async def _resolve_element_ids(self, ids: list):
+        unknown = []
+        for nid in ids:
+            if nid in self.element_ids:
+                continue
+            # Kept by the service from the bootstrap and every ingested batch
+            eid = centrality_service.element_id(nid)
+            if eid is not None:
+                self.element_ids[nid] = eid
+            else:
+                unknown.append(nid)
+        if not unknown:
+            return
+        async with self.driver.session() as session:
+            records = await session.execute_read(fetch_all, ELEMENT_IDS_QUERY, ids=unknown)
+        self.element_ids.update((r["id"], r["eid"]) for r in records)
+        # Service ids are coalesce(n.id, elementId(n)): ids left unresolved are element ids already
+        for nid in unknown:
+            self.element_ids.setdefault(nid, nid)
+
+    async def run_once(self) -> int:
+        """Writes changed pagerank/degree/community values; returns the number of nodes written."""
+        if not centrality_service.ready:
+            return 0
+        scores = centrality_service.scores()
+        degrees = centrality_service.degrees()
+        node_ids = list(scores)
+        edges = [(u, v) for u, nbrs in centrality_service.adj.items() for v in nbrs if u <= v]
+        groups = await detect_communities_async(node_ids, edges, PERSIST_COMMUNITY_TIMEOUT) or {}
+
+        # Forget nodes deleted since the last run
+        for nid in set(self.written) - set(scores):
+            del self.written[nid]
+            self.element_ids.pop(nid, None)
+
+        rows = []
+        for nid in node_ids:
+            values = (scores[nid], degrees.get(nid, 0), groups.get(nid))
+            if _changed(self.written.get(nid), values):
+                rows.append((nid, values))
+        if not rows:
+            return 0
+
+        await self._resolve_element_ids([nid for nid, _ in rows])
+        async with self.driver.session() as session:
+            for start in range(0, len(rows), PERSIST_BATCH_SIZE):
+                batch = rows[start:start + PERSIST_BATCH_SIZE]
+                payload = [{"eid": self.element_ids[nid], "pagerank": rank, "degree": degree, "community": community}
+                           for nid, (rank, degree, community) in batch]
+                await session.execute_write(consume, WRITE_QUERY, rows=payload)
+                for nid, values in batch:
+                    self.written[nid] = values
+        return len(rows)
+
+    async def run_forever(self, interval: float = PERSIST_INTERVAL):
+        while True:
+            try:
+                written = await self.run_once()
+                if written:
+                    print(f"[Materialize] Wrote pagerank/degree/community for {written} nodes.")
+            except Exception as e:
+                print(f"[Materialize] Run failed, retrying in {interval}s: {e}")
+            await asyncio.sleep(interval)
@@ -1,171 +1,282 @@
 
+import os
 import networkx as nx
 import math
+from collections import Counter
 
-def enrich_graph_data(nodes: list, links: list, root_id: str = None) -> dict:
+from .root_index import RootIndex
+from .graph_view import GraphView, _link_id
+from .local_push import personalized_pagerank
+
+try:
+    from .sparse_engine import compute_centrality_sparse, detect_communities_sparse
+    SPARSE_ENGINE_AVAILABLE = True
+except ImportError:
+    SPARSE_ENGINE_AVAILABLE = False
+
+# Graphs with at least this many edges use the NumPy/SciPy engine instead of NetworkX
+SPARSE_ENGINE_MIN_EDGES = int(os.getenv("ANALYTICS_SPARSE_MIN_EDGES", "5000"))
+# Share of nodes the previous partition must cover before community detection warm-starts from it
+WARM_START_MIN_COVERAGE = float(os.getenv("ANALYTICS_WARM_START_MIN_COVERAGE", "0.5"))
+# Nodes kept in a root-centered neighborhood, by personalized PageRank
+ROOT_NEIGHBORHOOD_MAX_NODES = int(os.getenv("ROOT_NEIGHBORHOOD_MAX_NODES", "150"))
+
+# --- Graph Construction ---
+
+def edge_list(links: list, node_map: dict) -> list:
     """
-    Analyzes the graph structure using NetworkX to calculate node importance (centrality)
-    and detect communities (topic clusters).
+    Reduces links to (source_id, target_id) tuples between known nodes.
+    Plain tuples keep the payload cheap to pickle for the analytics worker pool.
     """
-    if not nodes or not links:
-        return {"nodes": nodes, "links": links}
-
-    # 1. Build NetworkX Graph
-    G = nx.Graph()
-    node_map = {n['id']: n for n in nodes}
-    
-    # [ALIVE] Find best root match if provided
-    actual_root_id = None
-    
-    # 0. Priority: Look for explicit 'isRoot' property in nodes
-    for nid, node in node_map.items():
-        if node.get('properties', {}).get('isRoot') == True or node.get('isRoot') == True:
-            actual_root_id = nid
-            print(f"[NetworkStats] Found explicit root node by flag: {nid}")
-            break
-
-    if not actual_root_id and root_id:
-        rid = root_id.lower().strip().replace(" ", "_")
-        print(f"[NetworkStats] Searching for root node for keyword: '{rid}'")
-        
-        # 1. Try exact match by ID
-        if rid in node_map:
-            actual_root_id = rid
-            print(f"[NetworkStats] Found exact root by ID: {actual_root_id}")
-        else:
-            # 2. Try semantic match
-            for nid, node in node_map.items():
-                name = str(node.get('name', '')).lower()
-                topic = str(node.get('topic', '')).lower()
-                nid_str = str(nid).lower()
-                if (rid in name or rid in topic or rid in nid_str or 
-                    name in rid or topic in rid or nid_str in rid):
-                    actual_root_id = nid
-                    print(f"[NetworkStats] Found semantic root: ID={nid}, Name={name}")
-                    break
-    for n in nodes:
-        G.add_node(n['id'])
-        
+    edges = []
     for l in links:
-        src = l.get('source')
-        tgt = l.get('target')
-        src_id = src['id'] if isinstance(src, dict) else src
-        tgt_id = tgt['id'] if isinstance(tgt, dict) else tgt
-        
+        src_id = _link_id(l.get('source'))
+        tgt_id = _link_id(l.get('target'))
         if src_id in node_map and tgt_id in node_map:
-            G.add_edge(src_id, tgt_id)
+            edges.append((src_id, tgt_id))
+    return edges
 
-    # 2. Calculate Centrality
+def _build_graph(node_ids: list, edges: list) -> nx.Graph:
+    G = nx.Graph()
+    G.add_nodes_from(node_ids)
+    G.add_edges_from(edges)
+    return G
+
+# --- Analytics Jobs (pure functions, safe to run in a worker process) ---
+
+def use_sparse_engine(edges: list) -> bool:
+    return SPARSE_ENGINE_AVAILABLE and len(edges) >= SPARSE_ENGINE_MIN_EDGES
+
+def compute_centrality(node_ids: list, edges: list) -> dict:
+    """PageRank per node id, falling back to degree centrality."""
+    if use_sparse_engine(edges):
+        return compute_centrality_sparse(node_ids, edges)
+    G = _build_graph(node_ids, edges)
     try:
-        centrality = nx.pagerank(G, alpha=0.85)
+        return nx.pagerank(G, alpha=0.85)
     except Exception:
-        centrality = nx.degree_centrality(G)
+        return nx.degree_centrality(G)
 
-    vals = list(centrality.values())
-    if vals:
-        min_v, max_v = min(vals), max(vals)
-        range_v = max_v - min_v if max_v > min_v else 1.0
-        
-        for n_id, score in centrality.items():
-            if n_id in node_map:
-                # Force maximum size for Root Node
-                if n_id == actual_root_id:
-                    node_map[n_id]['val'] = 15 # Hero size
-                    node_map[n_id]['isRoot'] = True
-                    node_map[n_id]['centrality'] = 1.0
-                else:
-                    normalized_score = (score - min_v) / range_v
-                    size_boost = math.log(1 + normalized_score * 8) * 2.5 
-                    node_map[n_id]['val'] = 2 + size_boost
-                    node_map[n_id]['centrality'] = score
+def degree_centrality(node_ids: list, edges: list) -> dict:
+    """O(V+E) degree centrality without building a NetworkX graph. Used as a cheap fallback."""
+    degree = {nid: 0 for nid in node_ids}
+    for src, tgt in set(edges):
+        if src == tgt:
+            degree[src] += 2
+            continue
+        degree[src] += 1
+        degree[tgt] += 1
+    scale = 1.0 / (len(node_ids) - 1) if len(node_ids) > 1 else 1.0
+    return {nid: d * scale for nid, d in degree.items()}
 
-    # 3. Detect Communities (Topics -> Color Group)
-    # Using Greedy Modularity Communities (Built-in NX)
-    # Returns list of sets of nodes
-    try:
+def detect_communities(node_ids: list, edges: list, previous: dict = None) -> dict:
+    """
+    Greedy modularity communities (built-in NX), or sparse Louvain on large graphs.
+    Returns {node_id: group} with 1-based group ids, largest community first.
+    With a `previous` partition ({node_id: group}) that covers most nodes, Louvain
+    warm-starts from it, and group ids are matched to it so colors stay stable.
+    """
+    if previous and use_warm_start(node_ids, previous):
+        groups = detect_communities_sparse(node_ids, edges, previous)
+    elif use_sparse_engine(edges):
+        groups = detect_communities_sparse(node_ids, edges)
+    else:
+        G = _build_graph(node_ids, edges)
         communities = nx.community.greedy_modularity_communities(G)
-        
+        groups = {}
         for group_id, community_set in enumerate(communities):
             for n_id in community_set:
-                if n_id in node_map:
-                    node_map[n_id]['group'] = group_id + 1 # 1-based index for safety
+                groups[n_id] = group_id + 1 # 1-based index for safety
+    return match_groups(groups, previous) if previous else groups
+
+def use_warm_start(node_ids, previous: dict) -> bool:
+    return SPARSE_ENGINE_AVAILABLE and len(node_ids) > 0 and len(previous) >= WARM_START_MIN_COVERAGE * len(node_ids)
+
+def match_groups(groups: dict, previous: dict, max_id: int = 0) -> dict:
+    """
+    Renames each group to the previous group it shares the most nodes with
+    (largest overlaps matched first). Unmatched groups take new ids above every id in
+    `previous` and above `max_id` (the highest id in use elsewhere, e.g. the whole cache),
+    so they never share an id with another community.
+    """
+    overlap = Counter((group, previous[n_id]) for n_id, group in groups.items() if n_id in previous)
+    rename, taken = {}, set()
+    for (group, old_group), _ in sorted(overlap.items(), key=lambda item: (-item[1], item[0])):
+        if group not in rename and old_group not in taken:
+            rename[group] = old_group
+            taken.add(old_group)
+
+    next_id = max(max_id, max(previous.values(), default=0)) + 1
+    for group, _ in sorted(Counter(groups.values()).items(), key=lambda item: (-item[1], item[0])):
+        if group in rename:
+            continue
+        rename[group] = next_id
+        next_id += 1
+    return {n_id: rename[group] for n_id, group in groups.items()}
+
+def connected_component_ids(node_ids, edges: list, root_nid=None):
+    """
+    Returns the set of node ids in the component containing root_nid,
+    or the Largest Connected Component if the root is absent. None for an empty graph.
+    """
+    if not node_ids:
+        return None
+    adjacency = {nid: [] for nid in node_ids}
+    for src, tgt in edges:
+        adjacency[src].append(tgt)
+        adjacency[tgt].append(src)
+
+    def component_of(start):
+        seen = {start}
+        stack = [start]
+        while stack:
+            for nbr in adjacency[stack.pop()]:
+                if nbr not in seen:
+                    seen.add(nbr)
+                    stack.append(nbr)
+        return seen
+
+    # 3. Select Target Component
+    if root_nid is not None and root_nid in adjacency:
+        target_component = component_of(root_nid)
+        print(f"[NetworkStats] Found Root '{root_nid}' in component of size {len(target_component)}")
+        return target_component
+
+    # 4. Fallback: If root not found, return the Largest Connected Component
+    target_component, visited = set(), set()
+    for nid in node_ids:
+        if nid not in visited:
+            component = component_of(nid)
+            visited |= component
+            if len(component) > len(target_component):
+                target_component = component
+    print(f"[NetworkStats] Target root '{root_nid}' not found in any component. Using LCC of size {len(target_component)}")
+    return target_component
+
+def personalized_centrality(view: GraphView, root_idx, adjacency: dict = None):
+    """
+    Personalized PageRank from the root for every view node (0.0 if the push never
+    reached it), keyed by node id. Runs over `adjacency` (e.g. the incremental PageRank
+    graph) when it knows the root, else over the view's own links. None without a root.
+    """
+    if root_idx is None:
+        return None
+    root_nid = view.ids[root_idx]
+    if adjacency is None or root_nid not in adjacency:
+        adjacency = view.adjacency()
+    scores = personalized_pagerank(adjacency, root_nid)
+    return {nid: scores.get(nid, 0.0) for nid in view.ids}
+
+def top_by_centrality(view: GraphView, centrality: dict, root_idx=None, limit: int = ROOT_NEIGHBORHOOD_MAX_NODES) -> set:
+    """Indices of the root plus the highest-scoring nodes, at most `limit` in total."""
+    ranked = sorted(view.node_range(), key=lambda idx: (idx != root_idx, -centrality[view.ids[idx]], idx))
+    return set(ranked[:limit])
+
+# --- Result Application ---
+
+def _centrality_range(centrality: dict):
+    vals = list(centrality.values())
+    if not vals:
+        return None
+    min_v, max_v = min(vals), max(vals)
+    return min_v, (max_v - min_v if max_v > min_v else 1.0)
+
+def node_size(score: float, min_v: float, range_v: float) -> float:
+    normalized_score = (score - min_v) / range_v
+    return 2 + math.log(1 + normalized_score * 8) * 2.5
+
+def apply_centrality(node_map: dict, centrality: dict, actual_root_id=None):
+    bounds = _centrality_range(centrality)
+    if bounds is None:
+        return
+    for n_id, score in centrality.items():
+        if n_id in node_map:
+            # Force maximum size for Root Node
+            if n_id == actual_root_id:
+                node_map[n_id]['val'] = 15 # Hero size
+                node_map[n_id]['isRoot'] = True
+                node_map[n_id]['centrality'] = 1.0
+            else:
+                node_map[n_id]['val'] = node_size(score, *bounds)
+                node_map[n_id]['centrality'] = score
+
+def apply_view_centrality(view: GraphView, centrality: dict, root_idx=None):
+    """apply_centrality for a GraphView; centrality is keyed by node index."""
+    bounds = _centrality_range(centrality)
+    if bounds is None:
+        return
+    records = view.records
+    for idx, score in centrality.items():
+        record = records[idx]
+        if idx == root_idx:
+            record.val, record.centrality, record.is_root = 15, 1.0, True # Hero size
+        else:
+            record.val, record.centrality = node_size(score, *bounds), score
+
+def apply_view_groups(view: GraphView, groups: dict):
+    records = view.records
+    for idx, group in groups.items():
+        records[idx].group = group
+
+# --- Public API ---
+
+def enrich_view(view: GraphView, root_id: str = None, root_index: RootIndex = None) -> GraphView:
+    """
+    Analyzes the graph structure to calculate node importance (centrality)
+    and detect communities (topic clusters). Results are stored on the view's records.
+    Runs inline; async handlers should use analysis.worker_pool.enrich_view_async.
+    """
+    if not len(view) or not len(view.src):
+        return view
+
+    # 1. Graph Inputs (int indices)
+    root_idx = view.resolve_root(root_id, root_index)
+    node_ids = view.node_range()
+    edges = view.edge_pairs()
+
+    # 2. Calculate Centrality
+    apply_view_centrality(view, compute_centrality(node_ids, edges), root_idx)
+
+    # 3. Detect Communities (Topics -> Color Group)
+    try:
+        apply_view_groups(view, detect_communities(node_ids, edges))
     except Exception as e:
         # Fallback: single group if detection fails
         print(f"Community detection failed: {e}")
-        for n in nodes:
-            n['group'] = 1
+        for record in view.records:
+            record.group = 1
+    return view
 
-    return {"nodes": list(node_map.values()), "links": links}
+def select_component(view: GraphView, target_component) -> dict:
+    result = view.to_payload(keep=target_component)
+    print(f"Final Graph Logic: {len(view)} total -> {len(result['nodes'])} in target component.")
+    return result
 
-def filter_connected_component(nodes: list, links: list, root_id: str = None) -> dict:
+def filter_view(view: GraphView, root_id: str = None, root_index: RootIndex = None) -> dict:
     """
-    Filters the graph to keep only the Largest Connected Component (LCC),
-    OR the component containing the root_id if provided.
+    Keeps only the component containing the root (or the Largest Connected Component)
+    and returns the response payload.
     """
+    if not len(view) or not len(view.src):
+        return view.to_payload()
+
+    root_idx = view.resolve_root(root_id, root_index)
+    target_component = connected_component_ids(view.node_range(), view.edge_pairs(), root_idx)
+    if target_component is None:
+        return view.to_payload()
+    return select_component(view, target_component)
+
+def enrich_graph_data(nodes: list, links: list, root_id: str = None, root_index: RootIndex = None) -> dict:
+    """enrich_view over get_graph-style node/link dicts."""
     if not nodes or not links:
         return {"nodes": nodes, "links": links}
+    return enrich_view(GraphView.from_payload(nodes, links), root_id, root_index).to_payload()
 
-    G = nx.Graph()
-    node_map = {n['id']: n for n in nodes}
-    
-    # [ALIVE] 1. Find the actual internal ID of the root node
-    actual_root_nid = None
-    
-    # Priority A: isRoot flag
-    for nid, node in node_map.items():
-        if node.get('properties', {}).get('isRoot') == True or node.get('isRoot') == True:
-            actual_root_nid = nid
-            break
-            
-    # Priority B: Semantic match if root_id string provided
-    if not actual_root_nid and root_id:
-        rid = root_id.lower().strip().replace(" ", "_")
-        for nid, node in node_map.items():
-            name = str(node.get('name', '')).lower()
-            topic = str(node.get('topic', '')).lower()
-            # fuzzy check
-            if rid == nid or rid == name or rid == topic or rid in name:
-                actual_root_nid = nid
-                print(f"[NetworkStats] Found root semantic match: {rid} -> {nid}")
-                break
-    
-    # 2. Build NetworkX Graph
-    for n in nodes:
-        G.add_node(n['id'])
-    for l in links:
-        src_id = l.get('source')['id'] if isinstance(l.get('source'), dict) else l.get('source')
-        tgt_id = l.get('target')['id'] if isinstance(l.get('target'), dict) else l.get('target')
-        if src_id in node_map and tgt_id in node_map:
-            G.add_edge(src_id, tgt_id)
-            
-    if nx.is_empty(G):
+def filter_connected_component(nodes: list, links: list, root_id: str = None, root_index: RootIndex = None) -> dict:
+    """
+    Filters the graph to keep only the Largest Connected Component (LCC),
+    OR the component containing the root_id if provided.
+    """
+    if not nodes or not links:
         return {"nodes": nodes, "links": links}
-        
-    components = list(nx.connected_components(G))
-    target_component = None
-    
-    # 3. Select Target Component
-    if actual_root_nid:
-        for component in components:
-            if actual_root_nid in component:
-                target_component = component
-                print(f"[NetworkStats] Found Root '{actual_root_nid}' in component of size {len(component)}")
-                break
-    
-    # 4. Fallback: If root not found, return the Largest Connected Component
-    if not target_component:
-        # Sort components by size descending
-        sorted_components = sorted(components, key=len, reverse=True)
-        target_component = sorted_components[0]
-        print(f"[NetworkStats] Target root '{actual_root_nid}' not found in any component. Using LCC of size {len(target_component)}")
-    
-    filtered_nodes = [n for n in nodes if n['id'] in target_component]
-    filtered_links = []
-    for l in links:
-        src_id = l.get('source')['id'] if isinstance(l.get('source'), dict) else l.get('source')
-        tgt_id = l.get('target')['id'] if isinstance(l.get('target'), dict) else l.get('target')
-        if src_id in target_component and tgt_id in target_component:
-            filtered_links.append(l)
-            
-    print(f"Final Graph Logic: {len(nodes)} total -> {len(filtered_nodes)} in target component.")
-    return {"nodes": filtered_nodes, "links": filtered_links}
+    return filter_view(GraphView.from_payload(nodes, links), root_id, root_index)
@@ -0,0 +1,148 @@
+import re
+from collections import Counter
+
+def normalize_key(text) -> str:
+    """Same normalization the extractor applies to ids: lowercase, stripped, spaces -> '_'."""
+    return str(text).lower().strip().replace(" ", "_")
+
+def _tokens(key: str) -> set:
+    return {t for t in re.split(r"[^\w]+|_", key) if t}
+
+def _trigrams(key: str) -> set:
+    padded = f"#{key}#"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+# Field weights for exact hits: an id match beats a display-name match beats a topic match
+FIELD_BONUS = {"id": 0.3, "name": 0.2, "topic": 0.1}
+MIN_SCORE = 0.2
+
+class RootIndex:
+    """
+    Lookup index over node id / name / topic, built once per graph snapshot.
+    - exact: normalized key -> [(node_id, field)]
+    - tokens / trigrams: inverted indexes for partial matches
+    Resolution results are memoized, so enrichment and component filtering of one
+    GraphView share a single lookup.
+    """
+    def __init__(self, nodes):
+        self.flagged = []
+        self.exact = {}
+        self.tokens = {}
+        self.trigrams = None
+        self.keys = {}
+        self._resolved = {}
+
+        for node in nodes:
+            nid = node['id']
+            if node.get('properties', {}).get('isRoot') == True or node.get('isRoot') == True:
+                self.flagged.append(nid)
+            keys = set()
+            for field in ("id", "name", "topic"):
+                value = nid if field == "id" else node.get(field)
+                if not value:
+                    continue
+                key = normalize_key(value)
+                if not key:
+                    continue
+                self.exact.setdefault(key, []).append((nid, field))
+                keys.add(key)
+            self.keys[nid] = keys
+            for key in keys:
+                for token in _tokens(key):
+                    self.tokens.setdefault(token, set()).add(nid)
+
+        # Very common tokens/trigrams carry little signal and make candidate sets large
+        self.max_posting = max(50, len(self.keys) // 20)
+
+    def _trigram_index(self) -> dict:
+        # Built on first use: most lookups end at an exact or token hit
+        if self.trigrams is None:
+            self.trigrams = {}
+            for nid, keys in self.keys.items():
+                for key in keys:
+                    for gram in _trigrams(key):
+                        self.trigrams.setdefault(gram, set()).add(nid)
+        return self.trigrams
+
+    def _candidates(self, query: str, limit: int) -> set:
+        """Top candidates by shared tokens (or trigrams when no token matches), skipping stop-postings."""
+        postings = [self.tokens[t] for t in _tokens(query) if t in self.tokens]
+        if not postings:
+            trigrams = self._trigram_index()
+            postings = [trigrams[g] for g in _trigrams(query) if g in trigrams]
+        if not postings:
+            return set()
+        selective = [p for p in postings if len(p) <= self.max_posting]
+        if not selective:
+            # Only common terms: sample the rarest posting
+            rarest = min(postings, key=len)
+            return set(list(rarest)[:limit * 4])
+        counts = Counter()
+        for posting in selective:
+            counts.update(posting)
+        return {nid for nid, _ in counts.most_common(limit * 4)}
+
+    def _score(self, query: str, nid) -> float:
+        q_tokens, q_grams = _tokens(query), _trigrams(query)
+        best = 0.0
+        for key in self.keys.get(nid, ()):
+            k_tokens = _tokens(key)
+            score = 0.0
+            if q_tokens and k_tokens:
+                overlap = len(q_tokens & k_tokens)
+                if overlap:
+                    jaccard = overlap / len(q_tokens | k_tokens)
+                    # All query tokens present (e.g. 'ai' in 'ai_ethics') ranks above a loose overlap
+                    score = 0.8 + 0.1 * jaccard if overlap == len(q_tokens) else 0.6 * jaccard
+            k_grams = _trigrams(key)
+            dice = 2 * len(q_grams & k_grams) / (len(q_grams) + len(k_grams))
+            best = max(best, score, 0.7 * dice)
+        return best
+
+    def rank(self, root_id: str, limit: int = 5, candidates=None) -> list:
+        """Candidate roots as [(node_id, score)], best first."""
+        query = normalize_key(root_id)
+        if not query:
+            return []
+        scores = {}
+
+        # 1. Exact hits
+        for nid, field in self.exact.get(query, ()):
+            scores[nid] = max(scores.get(nid, 0.0), 1.0 + FIELD_BONUS[field])
+
+        # 2. Partial hits from the inverted indexes
+        pool = self._candidates(query, limit) if candidates is None else set(candidates)
+
+        for nid in pool:
+            if nid not in scores:
+                score = self._score(query, nid)
+                if score >= MIN_SCORE:
+                    scores[nid] = score
+
+        if candidates is not None:
+            scores = {nid: s for nid, s in scores.items() if nid in pool}
+        return sorted(scores.items(), key=lambda item: (-item[1], str(item[0])))[:limit]
+
+    def resolve(self, root_id: str = None):
+        """
+        Root node id for a request:
+        1. Nodes flagged isRoot win; with several, the one ranked best for root_id.
+        2. Otherwise the best-ranked node for root_id.
+        """
+        cache_key = normalize_key(root_id) if root_id else None
+        if cache_key in self._resolved:
+            return self._resolved[cache_key]
+
+        actual_root_id = None
+        if self.flagged:
+            ranked = self.rank(root_id, limit=1, candidates=self.flagged) if root_id else []
+            actual_root_id = ranked[0][0] if ranked else self.flagged[0]
+            print(f"[NetworkStats] Found explicit root node by flag: {actual_root_id}")
+        elif root_id:
+            ranked = self.rank(root_id, limit=1)
+            if ranked:
+                actual_root_id = ranked[0][0]
+                print(f"[NetworkStats] Found root for '{cache_key}': ID={actual_root_id} (score {ranked[0][1]:.2f})")
+
+        self._resolved[cache_key] = actual_root_id
+        return actual_root_id
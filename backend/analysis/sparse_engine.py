@@ -0,0 +1,180 @@
+"""
+Sparse-matrix analytics engine for large graphs.
+
+Builds a CSR adjacency once and runs vectorized PageRank power iteration and
+Louvain community detection over arrays. Results use the same {node_id: value} shape as
+the NetworkX jobs in network_stats, so the apply_* helpers work unchanged.
+"""
+import numpy as np
+import scipy.sparse as sp
+
+def build_csr(node_ids: list, edges: list):
+    """
+    Symmetric 0/1 CSR adjacency for an undirected simple graph (duplicate edges collapse,
+    self-loops kept once), matching nx.Graph semantics.
+    Returns (A, index) where index maps node_id -> row.
+    """
+    n = len(node_ids)
+    # GraphView passes range(n): edges are already row indices
+    index = node_ids if isinstance(node_ids, range) else {nid: i for i, nid in enumerate(node_ids)}
+    if not edges:
+        return sp.csr_matrix((n, n), dtype=np.float64), index
+
+    if isinstance(node_ids, range):
+        pairs = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        src, dst = pairs[:, 0], pairs[:, 1]
+    else:
+        src = np.fromiter((index[s] for s, _ in edges), dtype=np.int64, count=len(edges))
+        dst = np.fromiter((index[t] for _, t in edges), dtype=np.int64, count=len(edges))
+    rows = np.concatenate([src, dst])
+    cols = np.concatenate([dst, src])
+    A = sp.csr_matrix((np.ones(rows.shape[0]), (rows, cols)), shape=(n, n))
+    A.sum_duplicates()
+    A.data[:] = 1.0
+    return A, index
+
+def pagerank(A, alpha: float = 0.85, tol: float = 1.0e-6, max_iter: int = 100) -> np.ndarray:
+    """
+    Power iteration with uniform teleport; dangling mass is spread uniformly.
+    Same convergence test as nx.pagerank (L1 change < n * tol).
+    """
+    n = A.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    out_degree = np.asarray(A.sum(axis=1)).ravel()
+    dangling = out_degree == 0
+    inv_degree = np.zeros(n)
+    inv_degree[~dangling] = 1.0 / out_degree[~dangling]
+    # Column-stochastic transition as P^T = A^T D^-1 (A is symmetric, so A D^-1)
+    PT = (A @ sp.diags(inv_degree)).tocsr()
+
+    x = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        x_last = x
+        x = alpha * (PT @ x_last + x_last[dangling].sum() / n) + (1.0 - alpha) / n
+        if np.abs(x - x_last).sum() < n * tol:
+            break
+    return x / x.sum()
+
+def _segment_starts(sorted_keys: np.ndarray) -> np.ndarray:
+    starts = np.ones(sorted_keys.shape[0], dtype=bool)
+    starts[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    return np.flatnonzero(starts)
+
+def _best_per_row(rows: np.ndarray, cols: np.ndarray, scores: np.ndarray):
+    """
+    (row, col, score) of the highest score per row for pairs sorted by (row, col);
+    ties go to the lowest col.
+    """
+    starts = _segment_starts(rows)
+    row_max = np.maximum.reduceat(scores, starts)
+    lengths = np.diff(np.append(starts, rows.shape[0]))
+    hits = np.flatnonzero(scores >= np.repeat(row_max, lengths))
+    first = hits[_segment_starts(rows[hits])]
+    return rows[first], cols[first], scores[first]
+
+def _compact(labels: np.ndarray) -> np.ndarray:
+    return np.unique(labels, return_inverse=True)[1]
+
+def _aggregate(A, comm: np.ndarray):
+    """Coarse graph S^T A S: one node per community, internal weight on the diagonal."""
+    k = int(comm.max()) + 1
+    S = sp.csr_matrix((np.ones(comm.shape[0]), (np.arange(comm.shape[0]), comm)), shape=(comm.shape[0], k))
+    return (S.T @ A @ S).tocsr()
+
+def _local_moving(A, two_m: float, comm: np.ndarray, rng, max_sweeps: int, min_change: float) -> np.ndarray:
+    """
+    Parallel Louvain local moving. Every sweep scores all (node, neighbor community)
+    pairs at once and a random half of the improving nodes move, which avoids the
+    swap oscillation of fully synchronous updates.
+    """
+    n = A.shape[0]
+    degree = np.asarray(A.sum(axis=1)).ravel()
+    coo = A.tocoo()
+    off_diag = coo.row != coo.col
+    rows, cols, weights = coo.row[off_diag].astype(np.int64), coo.col[off_diag], coo.data[off_diag]
+    if rows.shape[0] == 0:
+        return comm
+
+    for _ in range(max_sweeps):
+        sigma_tot = np.bincount(comm, weights=degree, minlength=n)
+
+        # Links from each node into each neighboring community, sorted by (node, community)
+        keys = rows * n + comm[cols]
+        order = np.argsort(keys)
+        keys = keys[order]
+        starts = _segment_starts(keys)
+        k_in = np.add.reduceat(weights[order], starts)
+        pair_rows, pair_comms = keys[starts] // n, keys[starts] % n
+
+        # Modularity gain (up to a constant factor) of node i sitting in community c
+        own = comm[pair_rows] == pair_comms
+        sigma = sigma_tot[pair_comms] - np.where(own, degree[pair_rows], 0.0)
+        gain = k_in - degree[pair_rows] * sigma / two_m
+
+        stay = -degree * (sigma_tot[comm] - degree) / two_m
+        stay[pair_rows[own]] = gain[own]
+
+        best_rows, best_comms, best_gain = _best_per_row(pair_rows, pair_comms, gain)
+        improving = (best_gain > stay[best_rows] + 1e-12) & (best_comms != comm[best_rows])
+        if improving.sum() <= min_change * n:
+            break
+        movers = improving & (rng.random(best_rows.shape[0]) < 0.5)
+        comm = comm.copy()
+        comm[best_rows[movers]] = best_comms[movers]
+    return comm
+
+def louvain(A, seed: int = 0, initial_communities: np.ndarray = None,
+            max_levels: int = 10, max_sweeps: int = 10, min_change: float = 5.0e-3) -> np.ndarray:
+    """
+    Louvain community detection over CSR arrays: local moving, then aggregate
+    communities into a coarse graph and repeat until no level merges anything.
+    `initial_communities` seeds the first level's partition.
+    Returns a community label per row.
+    """
+    n = A.shape[0]
+    membership = np.arange(n)
+    two_m = float(A.sum())
+    if n == 0 or two_m == 0:
+        return membership
+    rng = np.random.default_rng(seed)
+
+    level_graph = A.tocsr()
+    comm = np.arange(n) if initial_communities is None else _compact(initial_communities)
+    for _ in range(max_levels):
+        comm = _compact(_local_moving(level_graph, two_m, comm, rng, max_sweeps, min_change))
+        membership = comm[membership]
+        if comm.max() + 1 == level_graph.shape[0]:
+            break
+        level_graph = _aggregate(level_graph, comm)
+        comm = np.arange(level_graph.shape[0])
+    return membership
+
+def groups_from_labels(labels: np.ndarray) -> np.ndarray:
+    """Renumbers labels to 1-based groups ordered by community size, largest first."""
+    unique, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    order = np.argsort(-counts, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(1, len(order) + 1)
+    return rank[inverse]
+
+def compute_centrality_sparse(node_ids: list, edges: list) -> dict:
+    A, _ = build_csr(node_ids, edges)
+    scores = pagerank(A)
+    return dict(zip(node_ids, scores.tolist()))
+
+def detect_communities_sparse(node_ids: list, edges: list, previous: dict = None) -> dict:
+    """
+    Louvain groups. A `previous` partition ({node_id: group}) is refined instead:
+    one level of local moving from the old groups (new nodes start alone), without
+    re-aggregation, which keeps most nodes in place after small edits.
+    """
+    A, _ = build_csr(node_ids, edges)
+    if previous:
+        offset = max(previous.values()) + 1
+        initial = np.array([previous.get(nid, offset + i) for i, nid in enumerate(node_ids)])
+        labels = louvain(A, initial_communities=initial, max_levels=1)
+    else:
+        labels = louvain(A)
+    groups = groups_from_labels(labels)
+    return dict(zip(node_ids, groups.tolist()))
@@ -0,0 +1,237 @@
+import os
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from .network_stats import (
+    compute_centrality,
+    degree_centrality,
+    detect_communities,
+    connected_component_ids,
+    apply_view_centrality,
+    apply_view_groups,
+    select_component,
+    match_groups,
+)
+from .graph_view import GraphView
+
+try:
+    from .layout import compute_layout
+    LAYOUT_AVAILABLE = True
+except ImportError:
+    LAYOUT_AVAILABLE = False
+from .root_index import RootIndex
+
+# --- Pool Config ---
+# ANALYTICS_POOL_SIZE=0 runs jobs on the default thread executor instead of worker processes.
+POOL_SIZE = int(os.getenv("ANALYTICS_POOL_SIZE", "2"))
+CENTRALITY_TIMEOUT = float(os.getenv("ANALYTICS_CENTRALITY_TIMEOUT", "5.0"))
+COMMUNITY_TIMEOUT = float(os.getenv("ANALYTICS_COMMUNITY_TIMEOUT", "3.0"))
+COMPONENT_TIMEOUT = float(os.getenv("ANALYTICS_COMPONENT_TIMEOUT", "3.0"))
+LAYOUT_TIMEOUT = float(os.getenv("ANALYTICS_LAYOUT_TIMEOUT", "3.0"))
+
+_executor = None
+
+# Last known group per node id: seeds the next community job and is served
+# when detection misses its deadline.
+_cached_groups = {}
+# At most one community job in flight: a job that overran its deadline keeps
+# its worker busy, so new requests reuse the cache instead of queueing behind it.
+_community_job = None
+# Same guard for PageRank: requests arriving while a job overruns use degree centrality.
+_centrality_job = None
+
+# Last 3D layout per node id, and the graph version (GraphView.fingerprint) it was computed for.
+_cached_positions = {}
+_layout_version = None
+_layout_job = None
+
+def get_executor():
+    global _executor
+    if _executor is None and POOL_SIZE > 0:
+        # 'spawn' avoids forking the event loop and driver state into the workers
+        _executor = ProcessPoolExecutor(max_workers=POOL_SIZE, mp_context=multiprocessing.get_context("spawn"))
+        print(f"[AnalyticsPool] Started {POOL_SIZE} worker processes.")
+    return _executor
+
+def shutdown_pool():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+async def warm_up():
+    """Imports NetworkX in every worker so the first request does not pay the spawn cost."""
+    executor = get_executor()
+    if executor is None:
+        return
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*[loop.run_in_executor(executor, compute_centrality, [], []) for _ in range(POOL_SIZE)])
+
+def _submit(fn, *args) -> asyncio.Future:
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(get_executor(), fn, *args)
+
+async def _await_job(job: asyncio.Future, timeout: float, name: str):
+    """Waits for a pool job; returns None on timeout or failure so callers can fall back."""
+    try:
+        # shield: a timeout must not cancel the shared community future
+        return await asyncio.wait_for(asyncio.shield(job), timeout=timeout)
+    except asyncio.TimeoutError:
+        print(f"[AnalyticsPool] {name} missed its {timeout}s deadline. Using fallback.")
+    except Exception as e:
+        print(f"[AnalyticsPool] {name} failed: {e}. Using fallback.")
+    return None
+
+def _store_groups(groups: dict, previous: dict, ids: list = None) -> dict:
+    """
+    Gives communities not matched to `previous` ids above every id in the cache, then
+    merges the result in (keyed through `ids` when groups are view indexes). Runs on the
+    event loop, so jobs finishing side by side cannot hand out the same id.
+    """
+    groups = match_groups(groups, previous, max(_cached_groups.values(), default=0))
+    # Merged rather than replaced: subgraph requests keep the rest of the partition warm
+    _cached_groups.update(groups.items() if ids is None else ((ids[idx], group) for idx, group in groups.items()))
+    return groups
+
+async def _run_community_job(view: GraphView, edges: list, previous: dict):
+    try:
+        groups = await _submit(detect_communities, view.node_range(), edges, previous)
+    except Exception as e:
+        print(f"[AnalyticsPool] Community detection failed: {e}")
+        return None
+    # Late results still refresh the cache for the next request
+    return _store_groups(groups, previous, view.ids)
+
+def _submit_centrality_job(node_ids: list, edges: list):
+    global _centrality_job
+    if _centrality_job is not None and not _centrality_job.done():
+        print("[AnalyticsPool] PageRank still running from a previous request.")
+        return None
+    _centrality_job = _submit(compute_centrality, node_ids, edges)
+    return _centrality_job
+
+def _submit_community_job(view: GraphView, edges: list):
+    global _community_job
+    if _community_job is not None and not _community_job.done():
+        print("[AnalyticsPool] Community detection still running from a previous request.")
+        return None
+    # Seeded from the cached partition so groups (node colors) stay stable between requests
+    previous = {idx: _cached_groups[nid] for idx, nid in enumerate(view.ids) if nid in _cached_groups}
+    _community_job = asyncio.ensure_future(_run_community_job(view, edges, previous))
+    return _community_job
+
+def seed_groups(groups: dict):
+    """Seeds the partition cache, e.g. from community ids persisted on the nodes."""
+    for nid, group in groups.items():
+        _cached_groups.setdefault(nid, group)
+
+async def detect_communities_async(node_ids: list, edges: list, timeout: float):
+    """
+    Full-graph community detection for background jobs, warm-started from the cache.
+    Runs outside the single in-flight request job; returns None past the deadline.
+    """
+    previous = {nid: _cached_groups[nid] for nid in node_ids if nid in _cached_groups}
+    job = _submit(detect_communities, node_ids, edges, previous)
+    groups = await _await_job(job, timeout, "Full-graph community detection")
+    return _store_groups(groups, previous) if groups is not None else None
+
+def cached_groups_for(view: GraphView) -> dict:
+    """
+    Previous partition for known nodes, keyed by view index. New nodes inherit a
+    cached neighbor's group, otherwise the default group 1.
+    """
+    groups = {idx: _cached_groups[nid] for idx, nid in enumerate(view.ids) if nid in _cached_groups}
+    for src, tgt in zip(view.src, view.dst):
+        if src not in groups and tgt in groups:
+            groups[src] = groups[tgt]
+        elif tgt not in groups and src in groups:
+            groups[tgt] = groups[src]
+    for idx in view.node_range():
+        groups.setdefault(idx, 1)
+    return groups
+
+async def enrich_view_async(view: GraphView, root_id: str = None, centrality: dict = None,
+                            root_index: RootIndex = None) -> GraphView:
+    """
+    enrich_view with PageRank and community detection running in the worker pool.
+    - Precomputed `centrality` by node id (e.g. from the incremental PageRank service) skips the PageRank job.
+    - Centrality past its deadline, or while an earlier PageRank job still runs, falls back to degree centrality.
+    - Community detection past its deadline falls back to the previous cached groups.
+    """
+    if not len(view) or not len(view.src):
+        return view
+
+    root_idx = view.resolve_root(root_id, root_index)
+    node_ids = view.node_range()
+    edges = view.edge_pairs()
+    if centrality is not None:
+        centrality = {idx: centrality[nid] for idx, nid in enumerate(view.ids)}
+
+    # Both jobs start before either is awaited so they run side by side
+    centrality_job = _submit_centrality_job(node_ids, edges) if centrality is None else None
+    community_job = _submit_community_job(view, edges)
+
+    if centrality_job is not None:
+        centrality = await _await_job(centrality_job, CENTRALITY_TIMEOUT, "PageRank")
+    if centrality is None:
+        centrality = degree_centrality(node_ids, edges)
+    apply_view_centrality(view, centrality, root_idx)
+
+    groups = None
+    if community_job is not None:
+        groups = await _await_job(community_job, COMMUNITY_TIMEOUT, "Community detection")
+    if groups is None:
+        groups = cached_groups_for(view)
+    apply_view_groups(view, groups)
+    return view
+
+def _store_positions(node_ids: list, version: str, job: asyncio.Future):
+    global _layout_version
+    if job.cancelled() or job.exception() is not None:
+        return
+    _cached_positions.update(zip(node_ids, job.result()))
+    _layout_version = version
+
+def _submit_layout_job(view: GraphView, version: str):
+    global _layout_job
+    if _layout_job is not None and not _layout_job.done():
+        print("[AnalyticsPool] Layout still running from a previous request.")
+        return None
+    # Known nodes seed the layout, so small edits only need an incremental pass
+    initial = {idx: _cached_positions[nid] for idx, nid in enumerate(view.ids) if nid in _cached_positions}
+    _layout_job = _submit(compute_layout, len(view), view.edge_pairs(), initial)
+    _layout_job.add_done_callback(functools.partial(_store_positions, view.ids, version))
+    return _layout_job
+
+async def layout_view_async(view: GraphView) -> GraphView:
+    """
+    Sets 3D positions on the view's records from the layout cache. The layout is
+    recomputed in the worker pool only when the graph version changed; past the
+    deadline, nodes without a cached position are left to the client simulation.
+    """
+    if not LAYOUT_AVAILABLE or not len(view):
+        return view
+
+    version = view.fingerprint()
+    if version != _layout_version:
+        job = _submit_layout_job(view, version)
+        if job is not None:
+            await _await_job(job, LAYOUT_TIMEOUT, "Layout")
+
+    for record, nid in zip(view.records, view.ids):
+        record.position = _cached_positions.get(nid)
+    return view
+
+async def filter_view_async(view: GraphView, root_id: str = None, root_index: RootIndex = None) -> dict:
+    """filter_view in the worker pool; on timeout the whole graph is returned."""
+    if not len(view) or not len(view.src):
+        return view.to_payload()
+
+    root_idx = view.resolve_root(root_id, root_index)
+    job = _submit(connected_component_ids, view.node_range(), view.edge_pairs(), root_idx)
+    target_component = await _await_job(job, COMPONENT_TIMEOUT, "Component filter")
+    if target_component is None:
+        return view.to_payload()
+    return select_component(view, target_component)
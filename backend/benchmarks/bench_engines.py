@@ -0,0 +1,98 @@
+"""
+Benchmark: NetworkX vs sparse (NumPy/SciPy) analytics engine.
+
+Usage (from backend/):
+    python -m benchmarks.bench_engines
+    python -m benchmarks.bench_engines --sizes 1000 10000 --networkx-max 10000
+"""
+import argparse
+import random
+import time
+
+import networkx as nx
+
+from analysis import network_stats
+from analysis.sparse_engine import compute_centrality_sparse, detect_communities_sparse
+from benchmarks.generators import scale_free_graph
+
+def _time(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+def _networkx_centrality(node_ids, edges):
+    G = nx.Graph()
+    G.add_nodes_from(node_ids)
+    G.add_edges_from(edges)
+    return nx.pagerank(G, alpha=0.85)
+
+def _networkx_communities(node_ids, edges):
+    G = nx.Graph()
+    G.add_nodes_from(node_ids)
+    G.add_edges_from(edges)
+    return nx.community.greedy_modularity_communities(G)
+
+def _modularity(node_ids, edges, communities):
+    G = nx.Graph()
+    G.add_nodes_from(node_ids)
+    G.add_edges_from(edges)
+    return nx.community.modularity(G, communities)
+
+def _as_sets(groups: dict):
+    sets = {}
+    for nid, group in groups.items():
+        sets.setdefault(group, set()).add(nid)
+    return list(sets.values())
+
+def _small_edit(node_ids, edges, share=0.01, seed=1):
+    """Adds ~share*E edges and share/2*V new nodes, like a few ingestion batches."""
+    rng = random.Random(seed)
+    new_ids = [f"new{i}" for i in range(max(1, int(len(node_ids) * share / 2)))]
+    all_ids = node_ids + new_ids
+    new_edges = [(nid, rng.choice(node_ids)) for nid in new_ids]
+    new_edges += [(rng.choice(node_ids), rng.choice(node_ids)) for _ in range(int(len(edges) * share))]
+    return all_ids, edges + new_edges
+
+def _stable_share(before: dict, after: dict) -> float:
+    return sum(before[k] == after[k] for k in before) / len(before)
+
+def _warm_start(node_ids, edges, groups):
+    edited_ids, edited_edges = _small_edit(node_ids, edges)
+    t_cold, cold = _time(network_stats.detect_communities, edited_ids, edited_edges)
+    t_warm, warm = _time(network_stats.detect_communities, edited_ids, edited_edges, groups)
+    print(f"edit +1% cold {t_cold:8.3f}s   warm-started      {t_warm:8.3f}s   "
+          f"unchanged group ids: cold {_stable_share(groups, cold):.0%} / warm {_stable_share(groups, warm):.0%}   "
+          f"Q cold={_modularity(edited_ids, edited_edges, _as_sets(cold)):.3f} warm={_modularity(edited_ids, edited_edges, _as_sets(warm)):.3f}")
+
+def run(sizes, networkx_max):
+    for n in sizes:
+        nodes, links = scale_free_graph(n)
+        node_map = {node["id"]: node for node in nodes}
+        node_ids = list(node_map)
+        edges = network_stats.edge_list(links, node_map)
+        print(f"\n--- {n} nodes / {len(edges)} edges ---")
+
+        t_pr, sparse_scores = _time(compute_centrality_sparse, node_ids, edges)
+        t_lp, sparse_groups = _time(detect_communities_sparse, node_ids, edges)
+        sparse_sets = _as_sets(sparse_groups)
+        print(f"sparse   pagerank {t_pr:8.3f}s   louvain           {t_lp:8.3f}s   "
+              f"groups={len(sparse_sets)} Q={_modularity(node_ids, edges, sparse_sets):.3f}")
+        _warm_start(node_ids, edges, network_stats.detect_communities(node_ids, edges))
+
+        if n > networkx_max:
+            print(f"networkx skipped (> {networkx_max} nodes)")
+            continue
+        t_pr_nx, nx_scores = _time(_networkx_centrality, node_ids, edges)
+        t_cm_nx, nx_groups = _time(_networkx_communities, node_ids, edges)
+        max_err = max(abs(nx_scores[k] - sparse_scores[k]) for k in node_ids)
+        print(f"networkx pagerank {t_pr_nx:8.3f}s   greedy modularity {t_cm_nx:8.3f}s   "
+              f"groups={len(nx_groups)} Q={_modularity(node_ids, edges, nx_groups):.3f}")
+        print(f"speedup  pagerank {t_pr_nx / t_pr:8.1f}x   communities {t_cm_nx / t_lp:8.1f}x   max |Δpagerank|={max_err:.2e}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--networkx-max", type=int, default=10_000,
+                        help="Skip NetworkX above this node count (greedy modularity is superlinear)")
+    args = parser.parse_args()
+    run(args.sizes, args.networkx_max)
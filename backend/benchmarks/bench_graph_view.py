@@ -0,0 +1,54 @@
+"""
+Benchmark: graph construction for one /ingest/search-style request.
+
+- networkx: node_map + edge list + one nx.Graph for enrichment and a second one for
+  component filtering (the pre-GraphView pipeline)
+- graph view: one GraphView plus its int edge pairs, shared by both steps
+
+Usage (from backend/):
+    python -m benchmarks.bench_graph_view
+    python -m benchmarks.bench_graph_view --edges 100000
+"""
+import argparse
+import time
+import tracemalloc
+
+from analysis import network_stats
+from analysis.graph_view import GraphView
+from benchmarks.generators import scale_free_graph
+
+def _networkx_build(nodes, links):
+    graphs = []
+    for _ in range(2): # enrich_graph_data, then filter_connected_component
+        node_map = {n['id']: n for n in nodes}
+        edges = network_stats.edge_list(links, node_map)
+        graphs.append(network_stats._build_graph(list(node_map.keys()), edges))
+    return graphs
+
+def _view_build(nodes, links):
+    view = GraphView.from_payload(nodes, links)
+    return view, view.edge_pairs()
+
+def _measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+def run(edge_count):
+    nodes, links = scale_free_graph(max(edge_count // 3, 4))
+    print(f"--- {len(nodes)} nodes / {len(links)} links ---")
+    # Warm-up run so interning and allocator effects do not favor the second case
+    _view_build(nodes, links)
+    for name, fn in (("networkx", _networkx_build), ("graph view", _view_build)):
+        elapsed, peak, _ = _measure(fn, nodes, links)
+        print(f"{name:<11} build {elapsed:8.3f}s   peak {peak / 1024 / 1024:8.1f} MiB")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--edges", type=int, default=100000)
+    args = parser.parse_args()
+    run(args.edges)
@@ -0,0 +1,138 @@
+"""
+Benchmark suite: enrich_graph_data and filter_connected_component at scale.
+
+Times both functions on synthetic graphs (scale-free, community-structured and
+extract_concept_graph-style stars) from 1k to 1M edges, records peak memory with
+tracemalloc, and saves the results as JSON so runs can be compared.
+
+Usage (from backend/):
+    python -m benchmarks.bench_network_stats
+    python -m benchmarks.bench_network_stats --edges 1000 10000 --generators scale_free --repeat 3
+    python -m benchmarks.bench_network_stats --compare benchmarks/results/<earlier run>.json
+"""
+import argparse
+import contextlib
+import copy
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+
+from analysis import network_stats
+from benchmarks.generators import GENERATORS
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+CASES = {
+    "enrich_graph_data": lambda nodes, links: network_stats.enrich_graph_data(nodes, links, root_id="search_0"),
+    "filter_connected_component": lambda nodes, links: network_stats.filter_connected_component(nodes, links, root_id="search_0"),
+}
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+def _quiet(fn, *args):
+    # network_stats logs root/component lookups; keep the report readable
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        return fn(*args)
+
+def _time_case(case, nodes, links, repeat):
+    seconds = []
+    for _ in range(repeat):
+        run_nodes = copy.deepcopy(nodes) # enrich_graph_data writes into the node dicts
+        start = time.perf_counter()
+        _quiet(case, run_nodes, links)
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+def _peak_memory(case, nodes, links):
+    run_nodes = copy.deepcopy(nodes)
+    tracemalloc.start()
+    _quiet(case, run_nodes, links)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+def run(edge_counts, generators, repeat, seed):
+    results = []
+    for name in generators:
+        for target in edge_counts:
+            nodes, links = GENERATORS[name](target, seed=seed)
+            for case_name, case in CASES.items():
+                seconds = _time_case(case, nodes, links, repeat)
+                peak = _peak_memory(case, nodes, links)
+                row = {
+                    "generator": name,
+                    "target_edges": target,
+                    "nodes": len(nodes),
+                    "edges": len(links),
+                    "function": case_name,
+                    "seconds": seconds,
+                    "median_seconds": statistics.median(seconds),
+                    "peak_mib": peak / 1024 / 1024,
+                }
+                results.append(row)
+                print(f"{name:<13} {len(nodes):>8} nodes {len(links):>8} edges  {case_name:<27} "
+                      f"{row['median_seconds']:9.3f}s  peak {row['peak_mib']:8.1f} MiB")
+    return results
+
+def _key(row):
+    return row["generator"], row["target_edges"], row["function"]
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = {_key(row): row for row in json.load(f)["results"]}
+    print(f"\n--- vs {baseline_path} (ratio > 1 means faster / smaller now) ---")
+    matched = [row for row in results if _key(row) in baseline]
+    if not matched:
+        print("No matching generator/size/function entries in the baseline.")
+    for row in matched:
+        old = baseline[_key(row)]
+        speedup = old["median_seconds"] / max(row["median_seconds"], 1e-9)
+        memory = old["peak_mib"] / max(row["peak_mib"], 1e-9)
+        print(f"{row['generator']:<13} {row['target_edges']:>8} {row['function']:<27} "
+              f"time x{speedup:6.2f}   memory x{memory:6.2f}")
+
+def save(results, args, output):
+    payload = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sparse_engine": network_stats.SPARSE_ENGINE_AVAILABLE,
+            "sparse_min_edges": network_stats.SPARSE_ENGINE_MIN_EDGES,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(payload, f, indent=2)
+    print(f"\nSaved {len(results)} results to {output}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--edges", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--generators", nargs="+", choices=sorted(GENERATORS), default=sorted(GENERATORS))
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None,
+                        help="JSON output path (default: benchmarks/results/network_stats-<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    results = run(args.edges, args.generators, args.repeat, args.seed)
+    output = args.output or os.path.join(RESULTS_DIR, f"network_stats-{datetime.now():%Y%m%d-%H%M%S}.json")
+    save(results, args, output)
+    if args.compare:
+        compare(results, args.compare)
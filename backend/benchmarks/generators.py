@@ -0,0 +1,80 @@
+"""
+Synthetic graph generators for analytics benchmarks.
+All generators return (nodes, links) in the same dict shape get_graph builds from Neo4j.
+"""
+import random
+
+def scale_free_graph(n: int, m: int = 3, seed: int = 0):
+    """Barabási–Albert preferential attachment: n nodes, ~n*m edges."""
+    rng = random.Random(seed)
+    node_ids = [f"n{i}" for i in range(n)]
+    edges = []
+    targets = list(range(min(m, n)))
+    repeated = []
+    for source in range(m, n):
+        for t in set(targets):
+            edges.append((source, t))
+        repeated.extend(targets)
+        repeated.extend([source] * m)
+        targets = [rng.choice(repeated) for _ in range(m)]
+    return _to_payload(node_ids, edges)
+
+def _to_payload(node_ids: list, edges: list):
+    nodes = [{"id": nid, "name": nid, "label": "Concept", "val": 1} for nid in node_ids]
+    links = [{"source": node_ids[s], "target": node_ids[t], "name": "RELATED"} for s, t in edges]
+    return nodes, links
+
+def community_graph(n: int, communities: int = None, avg_degree: int = 8, p_intra: float = 0.9, seed: int = 0):
+    """Planted partition: ~n*avg_degree/2 edges, a p_intra share inside equal-sized communities."""
+    rng = random.Random(seed)
+    communities = communities or max(2, int(n ** 0.5) // 2)
+    node_ids = [f"c{i}" for i in range(n)]
+    size = max(1, n // communities)
+    edges = []
+    for _ in range(n * avg_degree // 2):
+        s = rng.randrange(n)
+        if rng.random() < p_intra:
+            base = min(s // size, communities - 1) * size
+            t = base + rng.randrange(min(size, n - base))
+        else:
+            t = rng.randrange(n)
+        if s != t:
+            edges.append((s, t))
+    return _to_payload(node_ids, edges)
+
+def concept_star_graph(stars: int, leaves: int = 15, intra_links: int = 5, shared: float = 0.1, seed: int = 0):
+    """
+    Union of extract_concept_graph-style results: one isRoot concept per search, linked to
+    its extracted concepts (ROOT_CONCEPT_OF bridges included) plus a few links among them.
+    A `shared` share of the concepts is reused from earlier searches, which joins the stars.
+    """
+    rng = random.Random(seed)
+    node_ids, roots, edges = [], set(), []
+    for star in range(stars):
+        root = len(node_ids)
+        node_ids.append(f"search_{star}")
+        roots.add(root)
+        members = []
+        for leaf in range(leaves):
+            if node_ids and rng.random() < shared and len(node_ids) > leaves:
+                members.append(rng.randrange(len(node_ids)))
+            else:
+                members.append(len(node_ids))
+                node_ids.append(f"concept_{star}_{leaf}")
+        edges.extend((root, m) for m in members if m != root)
+        for _ in range(intra_links):
+            a, b = rng.sample(members, 2)
+            if a != b:
+                edges.append((a, b))
+    nodes, links = _to_payload(node_ids, edges)
+    for idx in roots:
+        nodes[idx]["isRoot"] = True
+        nodes[idx]["label"] = "Concept"
+    return nodes, links
+
+# Generators by name, each taking a target edge count
+GENERATORS = {
+    "scale_free": lambda edges, seed=0: scale_free_graph(max(edges // 3, 4), m=3, seed=seed),
+    "community": lambda edges, seed=0: community_graph(max(edges // 4, 8), avg_degree=8, seed=seed),
+    "concept_star": lambda edges, seed=0: concept_star_graph(max(edges // 20, 1), seed=seed),
+}
@@ -0,0 +1,115 @@
+"""
+One Neo4j driver, and so one connection pool, per process.
+
+Components take their driver from neo4j_pool instead of opening their own, so Aura TLS
+handshakes are paid once per pooled connection and no pool is leaked per request.
+Pool limits come from the environment:
+- NEO4J_MAX_POOL_SIZE: connections per server
+- NEO4J_MAX_CONNECTION_LIFETIME: seconds before a connection is retired (Aura drops
+  connections after 60 minutes, so stay below that)
+- NEO4J_ACQUISITION_TIMEOUT: seconds a query waits for a free connection
+"""
+import os
+
+from neo4j import AsyncGraphDatabase
+from dotenv import load_dotenv
+
+load_dotenv()
+
+URI = os.getenv("NEO4J_URI", "neo4j+s://1a1d8907.databases.neo4j.io")
+AUTH = (os.getenv("NEO4J_USERNAME"), os.getenv("NEO4J_PASSWORD"))
+
+MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "50"))
+MAX_CONNECTION_LIFETIME = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "2700"))
+ACQUISITION_TIMEOUT = float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "30"))
+
+class _TrackedSession:
+    """Counts open sessions; a session holds at most one pooled connection at a time."""
+    def __init__(self, pool, session):
+        self.pool = pool
+        self.session = session
+
+    async def __aenter__(self):
+        self.pool._opened()
+        return await self.session.__aenter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            return await self.session.__aexit__(exc_type, exc, tb)
+        finally:
+            self.pool._closed(exc)
+
+class _TrackedDriver:
+    """The shared AsyncDriver with session() counted; everything else is passed through."""
+    def __init__(self, pool, driver):
+        self._pool = pool
+        self._driver = driver
+
+    def session(self, **config):
+        return _TrackedSession(self._pool, self._driver.session(**config))
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+class Neo4jPool:
+    def __init__(self):
+        self._driver = None
+        self.sessions_open = 0
+        self.sessions_peak = 0
+        self.sessions_total = 0
+        self.acquisition_timeouts = 0
+
+    def get_driver(self) -> _TrackedDriver:
+        """The process-wide driver, created on first use."""
+        if self._driver is None:
+            driver = AsyncGraphDatabase.driver(
+                URI, auth=AUTH,
+                max_connection_pool_size=MAX_POOL_SIZE,
+                max_connection_lifetime=MAX_CONNECTION_LIFETIME,
+                connection_acquisition_timeout=ACQUISITION_TIMEOUT,
+            )
+            self._driver = _TrackedDriver(self, driver)
+            print(f"[Neo4jPool] Driver for {URI} (pool {MAX_POOL_SIZE}, lifetime {MAX_CONNECTION_LIFETIME:.0f}s)")
+        return self._driver
+
+    async def close(self):
+        if self._driver is not None:
+            driver, self._driver = self._driver, None
+            await driver.close()
+
+    def _opened(self):
+        self.sessions_open += 1
+        self.sessions_total += 1
+        self.sessions_peak = max(self.sessions_peak, self.sessions_open)
+
+    def _closed(self, exc):
+        self.sessions_open -= 1
+        if exc is not None and "failed to obtain a connection from the pool" in str(exc):
+            self.acquisition_timeouts += 1
+
+    def _connections(self) -> tuple:
+        """(open, in use) connections across servers, read from the driver's pool."""
+        # Not public driver API; reported as None if the internals change
+        try:
+            deques = list(self._driver._driver._pool.connections.values())
+            connections = [c for d in deques for c in list(d)]
+            return len(connections), sum(1 for c in connections if c.in_use)
+        except AttributeError:
+            return None, None
+
+    def stats(self) -> dict:
+        connections_open, connections_in_use = self._connections() if self._driver else (0, 0)
+        return {
+            "max_pool_size": MAX_POOL_SIZE,
+            "max_connection_lifetime": MAX_CONNECTION_LIFETIME,
+            "acquisition_timeout": ACQUISITION_TIMEOUT,
+            "connections_open": connections_open,
+            "connections_in_use": connections_in_use,
+            "utilization": connections_in_use / MAX_POOL_SIZE if connections_in_use is not None else None,
+            "sessions_open": self.sessions_open,
+            "sessions_peak": self.sessions_peak,
+            "sessions_total": self.sessions_total,
+            "acquisition_timeouts": self.acquisition_timeouts,
+        }
+
+neo4j_pool = Neo4jPool()
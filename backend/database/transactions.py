@@ -0,0 +1,19 @@
+"""
+Managed transaction functions shared by every component that queries Neo4j.
+
+Passed to session.execute_read / execute_write so the driver can retry transient
+failures. Records are materialized inside the transaction. Query parameters go in as
+keyword arguments, so none may be called `query`.
+"""
+
+async def fetch_all(tx, query, **params):
+    result = await tx.run(query, **params)
+    return [record async for record in result]
+
+async def fetch_single(tx, query, **params):
+    result = await tx.run(query, **params)
+    return await result.single()
+
+async def consume(tx, query, **params):
+    result = await tx.run(query, **params)
+    await result.consume()
@@ -2,15 +2,24 @@
 import os
 import json
 import traceback
+import asyncio
 from dotenv import load_dotenv
 from parser.web_search import perform_web_search
 from parser.extractor import extract_concept_graph
 from parser.ingest import Neo4jIngestor
+from database.pool import neo4j_pool
 from neo4j import GraphDatabase
 
 # Load Env
 load_dotenv()
 
+async def _ingest(data):
+    ingestor = Neo4jIngestor()
+    try:
+        await ingestor.ingest_batch(data)
+    finally:
+        await neo4j_pool.close()
+
 def debug_pipeline(keyword="Superman"):
     print(f"--- 1. Testing Web Search for '{keyword}' ---")
     try:
@@ -54,9 +63,7 @@ def debug_pipeline(keyword="Superman"):
 
     print(f"\n--- 3. Testing Neo4j Ingestion ---")
     try:
-        ingestor = Neo4jIngestor()
-        ingestor.ingest_batch(data) # Using the batch method we improved
-        ingestor.close()
+        asyncio.run(_ingest(data)) # Using the batch method we improved
         print("SUCCESS: Ingestion called without error.")
     except Exception as e:
         print(f"FAIL: Ingestion Error: {e}")
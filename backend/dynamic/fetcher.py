@@ -1,57 +1,51 @@
 
-import os
 import logging
-from neo4j import GraphDatabase
-from parser.web_search import perform_web_search
+from database.pool import neo4j_pool
+from database.transactions import fetch_all
+from analysis.incremental_pagerank import centrality_service
+from analysis.materialize import INDEXED_LABELS
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# --- Neo4j Config ---
-URI = os.getenv("NEO4J_URI", "neo4j+ssc://b60a0727.databases.neo4j.io")
-AUTH = (os.getenv("NEO4J_USERNAME"), os.getenv("NEO4J_PASSWORD"))
+# Best `limit` per label from the degree indexes, then merged
+TOP_KEYWORDS_QUERY = """
+CALL {
+""" + "\n    UNION\n".join(
+    f"""    MATCH (n:{label}) WHERE n.degree IS NOT NULL AND n.name IS NOT NULL
+    RETURN n ORDER BY n.degree DESC LIMIT $limit""" for label in INDEXED_LABELS) + """
+}
+RETURN n.name AS name
+ORDER BY n.degree DESC, n.pagerank DESC
+LIMIT $limit
+"""
 
-def get_top_keywords(limit=3):
+TOP_KEYWORDS_FALLBACK_QUERY = f"""
+MATCH (n:{"|".join(INDEXED_LABELS)})
+WHERE n.name IS NOT NULL
+RETURN n.name AS name, count{{(n)--()}} AS degree
+ORDER BY degree DESC
+LIMIT $limit
+"""
+
+async def get_top_keywords(limit=3, driver=None):
     """
-    Fetches top connected nodes (Degree Centrality) from Neo4j to form a context-aware query.
+    Fetches top connected nodes (Degree Centrality) to form a context-aware query.
     """
-    driver = GraphDatabase.driver(URI, auth=AUTH)
+    if centrality_service.ready:
+        # Degree counters kept current by ingestion/deletion; no graph scan
+        return centrality_service.top_names(limit)
+    driver = driver or neo4j_pool.get_driver()
     keywords = []
     try:
-        with driver.session() as session:
-            # Simple Degree Centrality
-            query = """
-            MATCH (n)
-            WHERE n.name IS NOT NULL
-            RETURN n.name AS name, count{(n)--()} AS degree
-            ORDER BY degree DESC
-            LIMIT $limit
-            """
-            result = session.run(query, limit=limit)
-            keywords = [record["name"] for record in result]
+        async with driver.session() as session:
+            # Degree/PageRank materialized on the nodes by the analytics job
+            records = await session.execute_read(fetch_all, TOP_KEYWORDS_QUERY, limit=limit)
+            if not records:
+                # Nothing materialized yet: count degree on the fly
+                records = await session.execute_read(fetch_all, TOP_KEYWORDS_FALLBACK_QUERY, limit=limit)
+            keywords = [record["name"] for record in records]
     except Exception as e:
         logging.error(f"Error fetching top keywords: {e}")
-    finally:
-        driver.close()
     
     return keywords
-
-def fetch_dynamic_content():
-    """
-    1. Analyze Graph (Get Top Keywords)
-    2. Generate Search Query
-    3. Perform Web Search
-    4. Return Context & Used Query
-    """
-    keywords = get_top_keywords(limit=2)
-    
-    if not keywords:
-        query = "latest technology trends AI and Future" # Fallback
-    else:
-        # Construct a query that looks for "News" or "Updates" about these components
-        query = f"{' '.join(keywords)} latest developments trends news"
-    
-    print(f"[Dynamic Fetcher] Generated Query: {query}")
-    
-    context = perform_web_search(query, max_results=5)
-    return context, query
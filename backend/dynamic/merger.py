@@ -1,52 +1,30 @@
-
-from parser.extractor import extract_concept_graph
 from parser.ingest import Neo4jIngestor
 
-def merge_dynamic_data(keyword_query: str, context_text: str):
+def combine_extractions(extractions: list) -> dict:
+    """One ingest payload from several extractions; nodes by id, relationships by (source, type, target)."""
+    nodes, relationships = {}, {}
+    for data in extractions:
+        for node in data.get("nodes", []):
+            if node.get("id") is None:
+                continue
+            if node["id"] in nodes:
+                merged = nodes[node["id"]]
+                merged["properties"] = {**(merged.get("properties") or {}), **(node.get("properties") or {})}
+            else:
+                nodes[node["id"]] = dict(node)
+        for rel in data.get("relationships", []):
+            key = (rel.get("source") or rel.get("from"), rel.get("type"), rel.get("target") or rel.get("to"))
+            relationships.setdefault(key, rel)
+    return {"nodes": list(nodes.values()), "relationships": list(relationships.values())}
+
+async def merge_extractions(extractions: list, driver=None) -> dict:
     """
-    1. Extract Graph from Context (using Gemini).
-    2. Ingest to Neo4j.
-    3. Return 'Diff' (The extracted subgraph).
+    Writes the extractions in one ingest_batch and returns the 'Diff' (GraphData shape):
+    only the nodes and links the write actually created or changed, so the frontend
+    does not re-animate what already existed.
     """
-    print(f"[Dynamic Merger] Extracting from context of length {len(context_text)}...")
-    
-    # 1. Extraction
-    # We use 'extract_concept_graph' because it's designed for "Search Context -> Graph"
-    # Even though query might be "AI Future", it treats it as the core concept.
-    extracted_data = extract_concept_graph(keyword_query, context_text)
-    
-    nodes = extracted_data.get("nodes", [])
-    if not nodes:
-        print("[Dynamic Merger] No nodes extracted.")
+    extracted_data = combine_extractions(extractions)
+    if not extracted_data["nodes"]:
         return {"nodes": [], "links": []}
-
-    # 2. Ingestion (Merege)
-    print(f"[Dynamic Merger] Ingesting {len(nodes)} nodes...")
-    ingestor = Neo4jIngestor()
-    ingestor.ingest_batch(extracted_data)
-    ingestor.close()
-    
-    # 3. Return Diff
-    # For visualization, we just return what was found. 
-    # The Frontend will merge this into the existing 3D graph, highlighting new stuff.
-    # To confirm persistence, we might want to re-fetch from DB, but for "Diff" visualization, 
-    # the extracted structure is exactly what we want to "Flash".
-    
-    # However, to ensure IDs match DB logic (if any specific ID generation happens), 
-    # we usually rely on Ingestor. But Ingestor uses IDs provided in JSON if they look valid.
-    # Our prompt asks for normalized IDs.
-    
-    # Let's standardize the return format to match GraphData model
-    # Convert 'relationships' -> 'links' with source/target
-    links = []
-    for rel in extracted_data.get("relationships", []):
-        links.append({
-            "source": rel["from"],
-            "target": rel["to"],
-            "name": rel["type"]
-        })
-        
-    return {
-        "nodes": nodes,
-        "links": links
-    }
+    ingestor = Neo4jIngestor(driver_override=driver)
+    return await ingestor.ingest_batch(extracted_data)
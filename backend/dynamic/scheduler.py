@@ -0,0 +1,148 @@
+"""
+Background graph evolution.
+
+Cycles run when POST /graph/update triggers them. Periodic runs are opt-in: every cycle
+makes paid Gemini and DuckDuckGo calls and writes to the graph, so they only happen when
+EVOLUTION_INTERVAL is set to a number of seconds (unset or 0 = trigger-only).
+
+Each cycle picks frontier topics from the materialized centrality (most central names that
+were not searched within EVOLUTION_COOLDOWN), runs web search + concept extraction for them
+with at most EVOLUTION_CONCURRENCY in flight, and writes everything found in one
+ingest_batch. The diff of every cycle is appended to a changes feed that clients poll
+(GET /graph/changes?since=<seq>) instead of waiting on the HTTP call.
+"""
+import os
+import time
+import asyncio
+from collections import deque
+
+from parser.web_search import perform_web_search
+from parser.extractor import extract_concept_graph
+from .fetcher import get_top_keywords
+from .merger import merge_extractions
+
+# Seconds between unprompted cycles; 0 (default) runs only when triggered (POST /graph/update)
+EVOLUTION_INTERVAL = float(os.getenv("EVOLUTION_INTERVAL", "0"))
+EVOLUTION_TOPICS = int(os.getenv("EVOLUTION_TOPICS", "3"))
+EVOLUTION_CONCURRENCY = int(os.getenv("EVOLUTION_CONCURRENCY", "2"))
+EVOLUTION_COOLDOWN = float(os.getenv("EVOLUTION_COOLDOWN", "86400"))
+# Ranked candidates looked at per cycle, so topics on cooldown do not empty the frontier
+CANDIDATES_PER_TOPIC = 5
+CHANGES_FEED_SIZE = 100
+
+def topic_query(topic: str) -> str:
+    return f"{topic} latest developments trends news"
+
+def _topic_key(topic: str) -> str:
+    return " ".join(str(topic).lower().split())
+
+class EvolutionScheduler:
+    def __init__(self):
+        self.searched = {} # topic key -> monotonic time of its last search
+        self.changes = deque(maxlen=CHANGES_FEED_SIZE)
+        self.seq = 0
+        self.cycles = 0
+        self.running = False
+        self.wake = asyncio.Event()
+        self.lock = asyncio.Lock()
+
+    # --- Topic Selection ---
+
+    async def frontier(self, driver) -> list:
+        """Most central topics not searched within the cooldown window."""
+        now = time.monotonic()
+        self.searched = {k: t for k, t in self.searched.items() if now - t < EVOLUTION_COOLDOWN}
+        candidates = await get_top_keywords(limit=EVOLUTION_TOPICS * CANDIDATES_PER_TOPIC, driver=driver)
+        topics, keys = [], set()
+        for name in candidates:
+            key = _topic_key(name)
+            if not key or key in self.searched or key in keys:
+                continue
+            keys.add(key)
+            topics.append(name)
+            if len(topics) >= EVOLUTION_TOPICS:
+                break
+        return topics
+
+    # --- Cycle ---
+
+    async def _explore(self, topic: str, semaphore: asyncio.Semaphore):
+        """Extraction for one topic, or None when the search found nothing."""
+        async with semaphore:
+            query = topic_query(topic)
+            # Both calls block (DuckDuckGo, Gemini); keep them off the event loop
+            context = await asyncio.to_thread(perform_web_search, query, 5)
+            if not context or "No search results" in context or context.startswith("Error performing"):
+                return None
+            return await asyncio.to_thread(extract_concept_graph, topic, context)
+
+    async def run_cycle(self, driver) -> dict:
+        """One evolution step; returns the feed entry (empty diff when nothing was found)."""
+        async with self.lock:
+            self.running = True
+            start = time.monotonic()
+            try:
+                topics = await self.frontier(driver)
+                for topic in topics:
+                    # Cooldown starts with the search so failing topics are not retried every cycle
+                    self.searched[_topic_key(topic)] = time.monotonic()
+                semaphore = asyncio.Semaphore(EVOLUTION_CONCURRENCY)
+                results = await asyncio.gather(*(self._explore(t, semaphore) for t in topics),
+                                               return_exceptions=True)
+                extractions = []
+                for topic, result in zip(topics, results):
+                    if isinstance(result, Exception):
+                        print(f"[Evolution] '{topic}' failed: {result}")
+                    elif result and result.get("nodes"):
+                        extractions.append(result)
+                # One bulk write for everything this cycle found
+                diff = await merge_extractions(extractions, driver)
+            finally:
+                self.running = False
+            self.cycles += 1
+            self.seq += 1
+            entry = {
+                "seq": self.seq,
+                "finished_at": time.time(),
+                "topics": topics,
+                "queries": [topic_query(t) for t in topics],
+                "diff": diff,
+            }
+            self.changes.append(entry)
+            print(f"[Evolution] Cycle {self.seq}: {len(topics)} topics, {len(diff['nodes'])} nodes "
+                  f"in {time.monotonic() - start:.1f}s")
+            return entry
+
+    def trigger(self):
+        """Runs a cycle as soon as the current one (if any) finishes."""
+        self.wake.set()
+
+    async def run_forever(self, driver):
+        while True:
+            try:
+                if EVOLUTION_INTERVAL > 0:
+                    await asyncio.wait_for(self.wake.wait(), timeout=EVOLUTION_INTERVAL)
+                else:
+                    await self.wake.wait()
+            except asyncio.TimeoutError:
+                pass
+            self.wake.clear()
+            try:
+                await self.run_cycle(driver)
+            except Exception as e:
+                print(f"[Evolution] Cycle failed: {e}")
+
+    # --- Changes Feed ---
+
+    def changes_since(self, since: int = 0) -> dict:
+        """Feed entries after `since`; `complete` is False when older entries were dropped."""
+        entries = [entry for entry in self.changes if entry["seq"] > since]
+        oldest = self.changes[0]["seq"] if self.changes else self.seq + 1
+        return {
+            "seq": self.seq,
+            "running": self.running or self.wake.is_set(),
+            "complete": since >= oldest - 1,
+            "changes": entries,
+        }
+
+evolution_scheduler = EvolutionScheduler()
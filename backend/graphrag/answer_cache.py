@@ -0,0 +1,152 @@
+"""
+Cache of chat answers keyed by normalized question and the version of the graph data
+the answer was built from.
+
+Each entry remembers which parts of the graph its Cypher depended on:
+- anchored queries (a name/topic/id literal or parameter) depend on the anchors and on
+  the entities in their results
+- other queries depend on every label and relationship type they match
+Every write (record_write) gets a sequence number that is stored per key and per label.
+An entry is stale once anything it depends on was written after its retrieval started.
+clear() drops everything (resets, manual edits).
+"""
+import os
+import re
+from collections import OrderedDict
+
+from .query_cache import normalize_question
+
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "256"))
+MAX_KEY_CHARS = 100
+
+ANCHOR_PARAMS = ("name", "topic", "id")
+ANCHOR_LITERAL = re.compile(
+    r"\b(?:name|topic|id)\)?\s*(?:=|:|CONTAINS|STARTS\s+WITH)\s*(?:toLower\(\s*)?['\"]([^'\"]+)['\"]",
+    re.IGNORECASE,
+)
+LABEL = re.compile(r":\s*`?([A-Za-z_]\w*)`?")
+STRING_LITERAL = re.compile(r"'[^']*'|\"[^\"]*\"")
+KEY_PROPERTIES = ("name", "topic", "id", "summary")
+
+def _key(value) -> str:
+    return str(value).strip().lower()
+
+def _row_keys(value, keys: set):
+    if isinstance(value, dict):
+        keys.update(_key(value[k]) for k in KEY_PROPERTIES if value.get(k))
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _row_keys(item, keys)
+    elif isinstance(value, str) and len(value) <= MAX_KEY_CHARS:
+        keys.add(_key(value))
+
+def dependencies(cypher: str, params: dict = None, rows: list = None) -> tuple:
+    """(kind, items) the result of a query depends on: ("keys", ...) or ("labels", ...)."""
+    anchors = {_key(m) for m in ANCHOR_LITERAL.findall(cypher)}
+    anchors |= {_key(v) for k, v in (params or {}).items() if k in ANCHOR_PARAMS and v}
+    if anchors:
+        keys = set(anchors)
+        for row in rows or []:
+            for value in row.values():
+                _row_keys(value, keys)
+        return "keys", frozenset(keys)
+    # Labels are read with literals blanked so values like 'a:b' are not mistaken for labels
+    return "labels", frozenset(LABEL.findall(STRING_LITERAL.sub("''", cypher)))
+
+def written_items(graph_data: dict) -> tuple:
+    """(labels, keys) touched by an ingest_batch payload."""
+    labels, keys = set(), set()
+    for node in graph_data.get("nodes", []):
+        if node.get("label"):
+            labels.add(node["label"])
+        if node.get("layer"):
+            labels.add(node["layer"])
+        props = node.get("properties") or {}
+        keys.update(_key(v) for v in (node.get("id"), node.get("name")) if v)
+        keys.update(_key(props[k]) for k in KEY_PROPERTIES if props.get(k))
+    for rel in graph_data.get("relationships", []):
+        labels.add(rel.get("type") or rel.get("relationship") or "RELATED")
+        keys.update(_key(v) for v in (rel.get("source") or rel.get("from"), rel.get("target") or rel.get("to")) if v)
+    return labels, keys
+
+class _Entry:
+    __slots__ = ("context", "answer", "context_tokens", "kind", "items", "built_at", "llm_calls")
+
+class AnswerCache:
+    def __init__(self, max_entries: int = ANSWER_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict() # normalized question -> _Entry, LRU order
+        self.write_seq = 0
+        self.key_writes = {} # key -> seq of its last write
+        self.label_writes = {} # label / relationship type -> seq of its last write
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.llm_calls_avoided = 0
+
+    def version(self) -> int:
+        """Graph version to capture before retrieval and pass to store()."""
+        return self.write_seq
+
+    def _current(self, entry: _Entry) -> bool:
+        table = self.key_writes if entry.kind == "keys" else self.label_writes
+        return all(table.get(item, 0) <= entry.built_at for item in entry.items)
+
+    def lookup(self, question: str):
+        """Cached _Entry (context, answer, context_tokens) if still current, else None."""
+        key = normalize_question(question)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if not self._current(entry):
+            del self.entries[key]
+            self.stale += 1
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        self.llm_calls_avoided += entry.llm_calls
+        return entry
+
+    def store(self, question: str, context: str, answer: str, context_tokens: int,
+              depends_on: tuple, built_at: int, llm_calls: int):
+        """
+        depends_on: dependencies() of the query behind the context
+        built_at: version() taken before retrieval; llm_calls: calls a hit will save
+        """
+        key = normalize_question(question)
+        if not key or depends_on is None:
+            return
+        entry = _Entry()
+        entry.context, entry.answer, entry.context_tokens = context, answer, context_tokens
+        entry.kind, entry.items = depends_on
+        entry.built_at = built_at
+        entry.llm_calls = llm_calls
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def record_write(self, labels, keys):
+        self.write_seq += 1
+        for label in labels:
+            self.label_writes[label] = self.write_seq
+        for key in keys:
+            self.key_writes[_key(key)] = self.write_seq
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "llm_calls_avoided": self.llm_calls_avoided,
+        }
+
+answer_cache = AnswerCache()
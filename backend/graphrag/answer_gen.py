@@ -12,14 +12,8 @@ If the context is empty or irrelevant, you may say "I don't have enough informat
 However, try to answer based on the partial information provided.
 """
 
-def generate_answer(question: str, context: str) -> str:
-    """
-    Synthesizes an answer using Gemini given the retrieved context.
-    """
-    try:
-        model = genai.GenerativeModel('gemini-3-flash')
-        
-        prompt = f"""{ANSWER_SYSTEM_PROMPT}
+def _answer_prompt(question: str, context: str) -> str:
+    return f"""{ANSWER_SYSTEM_PROMPT}
 
 [Graph Context]
 {context}
@@ -28,8 +22,25 @@ def generate_answer(question: str, context: str) -> str:
 {question}
 
 Answer:"""
-        
-        response = model.generate_content(prompt)
+
+def generate_answer(question: str, context: str) -> str:
+    """
+    Synthesizes an answer using Gemini given the retrieved context.
+    """
+    try:
+        model = genai.GenerativeModel('gemini-3-flash')
+        response = model.generate_content(_answer_prompt(question, context))
         return response.text.strip()
     except Exception as e:
         return f"Error generating answer: {e}"
+
+async def stream_answer(question: str, context: str):
+    """
+    Same answer as generate_answer, yielded as text chunks while Gemini produces them.
+    Errors are raised rather than yielded, so a partial answer is never mistaken for a full one.
+    """
+    model = genai.GenerativeModel('gemini-3-flash')
+    response = await model.generate_content_async(_answer_prompt(question, context), stream=True)
+    async for chunk in response:
+        if chunk.text:
+            yield chunk.text
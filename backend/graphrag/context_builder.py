@@ -0,0 +1,133 @@
+"""
+Compact graph context for answer generation.
+
+Query rows (record.data()) are rendered as one pipe table. Nodes become short entity
+refs (E1, E2, ...) listed once with their useful properties, and relationships become
+"E1 -TYPE-> E2" triples. When the rows do not fit the token budget, rows touching the
+most central entities (pagerank, then degree) are kept and shown in query order.
+"""
+import os
+import math
+
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1500"))
+MAX_VALUE_CHARS = 200
+
+# Analytics and bookkeeping properties that cost tokens without helping the answer
+HIDDEN_PROPERTIES = {"embedding", "pagerank", "degree", "community", "source", "layer", "hop", "id"}
+LABEL_PROPERTIES = ("name", "summary", "topic", "title", "id")
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: ~4 ASCII chars per token, one per other (e.g. Hangul) char."""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+def _short(value) -> str:
+    text = str(value)
+    return text if len(text) <= MAX_VALUE_CHARS else text[:MAX_VALUE_CHARS] + "…"
+
+def _is_relationship(value) -> bool:
+    # record.data() turns a relationship into (start_props, type, end_props)
+    return (isinstance(value, (tuple, list)) and len(value) == 3
+            and isinstance(value[0], dict) and isinstance(value[1], str) and isinstance(value[2], dict))
+
+def _is_path(value) -> bool:
+    # ...and a path into [node, type, node, type, node, ...]
+    return (isinstance(value, (tuple, list)) and len(value) >= 3 and len(value) % 2 == 1
+            and all(isinstance(v, dict) for v in value[::2]) and all(isinstance(v, str) for v in value[1::2]))
+
+class _Entities:
+    def __init__(self):
+        self.refs = {} # identity -> ref
+        self.lines = {} # ref -> rendered line
+        self.rank = {} # ref -> centrality
+
+    @staticmethod
+    def _identity(props: dict):
+        if props.get("id") is not None:
+            return ("id", props["id"])
+        return tuple(sorted((k, str(v)) for k, v in props.items() if k not in HIDDEN_PROPERTIES))
+
+    def ref(self, props: dict) -> str:
+        key = self._identity(props)
+        ref = self.refs.get(key)
+        if ref is None:
+            ref = f"E{len(self.refs) + 1}"
+            self.refs[key] = ref
+            label = next((props[k] for k in LABEL_PROPERTIES if props.get(k) not in (None, "")), ref)
+            details = ", ".join(f"{k}: {_short(v)}" for k, v in sorted(props.items())
+                                if k not in HIDDEN_PROPERTIES and v not in (None, "", []) and v != label)
+            self.lines[ref] = f"{ref} {_short(label)}" + (f" ({details})" if details else "")
+            self.rank[ref] = (props.get("pagerank") or 0.0, props.get("degree") or 0)
+        return ref
+
+def _cell(value, entities: _Entities, used: set) -> str:
+    if isinstance(value, dict):
+        ref = entities.ref(value)
+        used.add(ref)
+        return ref
+    if _is_relationship(value) or _is_path(value):
+        parts = []
+        for i, item in enumerate(value):
+            if i % 2:
+                parts.append(f"-{item}->")
+            else:
+                ref = entities.ref(item)
+                used.add(ref)
+                parts.append(ref)
+        return " ".join(parts)
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(_cell(v, entities, used) for v in value) + "]"
+    return "" if value is None else _short(value).replace("|", "/").replace("\n", " ")
+
+def build_context(rows: list, budget: int = CONTEXT_TOKEN_BUDGET, truncated: bool = False) -> tuple:
+    """(context text, estimated tokens) for query rows."""
+    if not rows:
+        text = "No information found in the graph."
+        return text, estimate_tokens(text)
+
+    entities = _Entities()
+    columns = list(rows[0].keys())
+    rendered, seen = [], set()
+    for row in rows:
+        used = set()
+        line = " | ".join(_cell(row.get(col), entities, used) for col in columns)
+        if line in seen:
+            continue
+        seen.add(line)
+        rendered.append((line, used))
+
+    # Most central rows first when choosing what fits; ties keep query order. Entities in
+    # every row (usually the entity asked about) say nothing about which rows matter.
+    counts = {}
+    for _, used in rendered:
+        for ref in used:
+            counts[ref] = counts.get(ref, 0) + 1
+    def priority(item):
+        used = item[1][1]
+        ranked = [ref for ref in used if counts[ref] < len(rendered)] or used
+        return max((entities.rank[ref] for ref in ranked), default=(0.0, 0))
+    order = sorted(enumerate(rendered), key=priority, reverse=True)
+
+    header = " | ".join(columns)
+    tokens = estimate_tokens(header) + 8 # section titles
+    kept, listed = set(), set()
+    for position, (line, used) in order:
+        new_refs = used - listed
+        cost = estimate_tokens(line) + sum(estimate_tokens(entities.lines[ref]) for ref in new_refs) + len(new_refs) + 1
+        if kept and tokens + cost > budget:
+            break
+        kept.add(position)
+        listed |= new_refs
+        tokens += cost
+
+    parts = []
+    if listed:
+        parts.append("Entities:")
+        parts.extend(entities.lines[ref] for ref in sorted(listed, key=lambda r: int(r[1:])))
+        parts.append("Rows:")
+    parts.append(header)
+    parts.extend(rendered[i][0] for i in sorted(kept))
+    if len(kept) < len(rendered) or truncated:
+        parts.append(f"(Showing {len(kept)} of {len(rendered)}{'+' if truncated else ''} rows.)")
+    text = "\n".join(parts)
+    return text, estimate_tokens(text)
@@ -21,6 +21,7 @@ Nodes:
 - Skill {name}
 - Interest {topic}
 - Location {name}
+Every node also has `pagerank` (importance), `degree` (number of neighbors) and `community` (topic cluster id).
 
 Relationships:
 - (:Person)-[:EXPERIENCED]->(:Event)
@@ -35,6 +36,7 @@ Relationships:
 3. RETURN the specific node or property asked for.
 4. Output ONLY the Cypher query text, no markdown.
 5. Current date is 2025-12-21.
+6. For "main", "most important" or "top" questions, ORDER BY n.pagerank DESC instead of counting relationships.
 
 ### Examples
 Q: "Where does Jinsu work?"
@@ -42,11 +44,21 @@ A: MATCH (p:Person {name: 'Jinsu'})-[:BELONGS_TO]->(o:Organization) RETURN o.nam
 
 Q: "What events happened in 2024?"
 A: MATCH (e:Event) WHERE e.date STARTS WITH '2024' RETURN e.summary, e.date
+
+Q: "What are Jinsu's most important skills?"
+A: MATCH (p:Person {name: 'Jinsu'})-[:HAS_SKILL]->(s:Skill) RETURN s.name ORDER BY s.pagerank DESC LIMIT 5
 """
 
-def generate_cypher(question: str) -> str:
+def _entity_hints(entities) -> str:
+    if not entities:
+        return ""
+    lines = "\n".join(f"- {e['label'] or 'Node'}: {e['text']}" for e in entities if e.get("text"))
+    return f"\n\n### Entities mentioned (exact values stored in the graph; use them verbatim)\n{lines}" if lines else ""
+
+def generate_cypher(question: str, entities: list = None) -> str:
     """
     Converts a natural language question to a Cypher query using Gemini.
+    entities: matches from graphrag.entity_index, so the query uses stored names instead of guesses.
     """
     if not GENAI_API_KEY:
         print("Error: GEMINI_API_KEY not found.")
@@ -55,7 +67,7 @@ def generate_cypher(question: str) -> str:
     try:
         model = genai.GenerativeModel('gemini-3-flash-preview') # Consistent with Extractor
         
-        prompt = f"{SYSTEM_PROMPT}\n\nQ: {question}\nA:"
+        prompt = f"{SYSTEM_PROMPT}{_entity_hints(entities)}\n\nQ: {question}\nA:"
         
         response = model.generate_content(prompt)
         cypher = response.text.strip()
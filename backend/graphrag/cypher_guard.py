@@ -0,0 +1,96 @@
+"""
+Execution guard for LLM-generated Cypher.
+
+Before a generated query reaches the database it is:
+- rejected if it writes, calls admin procedures or holds several statements
+- bounded: a missing LIMIT is added, a larger one is lowered to GUARD_MAX_ROWS
+- planned with EXPLAIN (same read transaction); plans estimating more than
+  GUARD_MAX_ESTIMATED_ROWS rows at any operator (e.g. cartesian products) are rejected
+Then it runs in a read transaction with a server-side timeout, and records are
+streamed until the row or byte cap instead of being materialized all at once.
+"""
+import os
+import re
+
+from neo4j import unit_of_work
+
+GUARD_MAX_ROWS = int(os.getenv("CYPHER_GUARD_MAX_ROWS", "200"))
+GUARD_MAX_BYTES = int(os.getenv("CYPHER_GUARD_MAX_BYTES", str(256 * 1024)))
+GUARD_MAX_ESTIMATED_ROWS = float(os.getenv("CYPHER_GUARD_MAX_ESTIMATED_ROWS", "1000000"))
+GUARD_TIMEOUT = float(os.getenv("CYPHER_GUARD_TIMEOUT", "5.0"))
+
+# Not preceded by '.', so properties such as n.set do not count
+WRITE_CLAUSES = re.compile(
+    r"(?<![.\w])(CREATE|MERGE|DELETE|DETACH|SET|REMOVE|DROP|FOREACH|LOAD\s+CSV|IN\s+TRANSACTIONS)\b",
+    re.IGNORECASE,
+)
+UNSAFE_PROCEDURES = re.compile(r"\b(dbms|apoc|gds)\s*\.", re.IGNORECASE)
+STRING_OR_COMMENT = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`|//[^\n]*|/\*.*?\*/", re.DOTALL)
+
+class UnsafeQueryError(ValueError):
+    pass
+
+def _mask(query: str) -> str:
+    """Same-length copy with literals and comments blanked, so keyword offsets match the original."""
+    return STRING_OR_COMMENT.sub(lambda m: " " * len(m.group()), query)
+
+def bound_query(query: str, max_rows: int = GUARD_MAX_ROWS) -> str:
+    """Read-only check plus LIMIT rewrite. Raises UnsafeQueryError."""
+    query = query.strip().rstrip(";").strip()
+    masked = _mask(query)
+    if ";" in masked:
+        raise UnsafeQueryError("multiple statements")
+    clause = WRITE_CLAUSES.search(masked)
+    if clause:
+        raise UnsafeQueryError(f"write clause '{clause.group(1).upper()}' is not allowed")
+    if UNSAFE_PROCEDURES.search(masked):
+        raise UnsafeQueryError("only read procedures are allowed")
+
+    if re.search(r"\bUNION\b", masked, re.IGNORECASE):
+        return f"CALL {{\n{query}\n}}\nRETURN * LIMIT {max_rows}"
+    returns = list(re.finditer(r"\bRETURN\b", masked, re.IGNORECASE))
+    if not returns:
+        return query
+    tail_start = returns[-1].end()
+    limit = re.search(r"\bLIMIT\s+(\d+)\b", masked[tail_start:], re.IGNORECASE)
+    if limit is None:
+        if re.search(r"\bLIMIT\b", masked[tail_start:], re.IGNORECASE):
+            # LIMIT given as a parameter or expression; the streaming cap still applies
+            return query
+        return f"{query}\nLIMIT {max_rows}"
+    if int(limit.group(1)) <= max_rows:
+        return query
+    start, end = tail_start + limit.start(1), tail_start + limit.end(1)
+    return query[:start] + str(max_rows) + query[end:]
+
+def _max_estimated_rows(plan) -> float:
+    if not plan:
+        return 0.0
+    args = plan.get("args") or plan.get("arguments") or {}
+    rows = float(args.get("EstimatedRows", 0.0) or 0.0)
+    return max([rows] + [_max_estimated_rows(child) for child in plan.get("children", [])])
+
+@unit_of_work(timeout=GUARD_TIMEOUT)
+async def read_bounded(tx, query, explain=True, max_rows=GUARD_MAX_ROWS, max_bytes=GUARD_MAX_BYTES, **params):
+    """
+    Transaction function: optional EXPLAIN check, then streams up to max_rows / max_bytes.
+    Returns (rows, truncated).
+    """
+    if explain:
+        summary = await (await tx.run("EXPLAIN " + query, **params)).consume()
+        estimated = _max_estimated_rows(summary.plan)
+        if estimated > GUARD_MAX_ESTIMATED_ROWS:
+            raise UnsafeQueryError(f"plan estimates {estimated:,.0f} rows (limit {GUARD_MAX_ESTIMATED_ROWS:,.0f})")
+
+    result = await tx.run(query, **params)
+    rows, size, truncated = [], 0, False
+    async for record in result:
+        row = record.data()
+        size += len(str(row))
+        if len(rows) >= max_rows or size > max_bytes:
+            truncated = True
+            break
+        rows.append(row)
+    # Discards whatever the server still holds instead of pulling it
+    await result.consume()
+    return rows, truncated
@@ -0,0 +1,176 @@
+"""
+Entity resolution over node name / summary / topic.
+
+Mentions (a search keyword, a name slot, a chat question) are resolved to Neo4j element
+ids before any Cypher runs, so the follow-up queries seek by elementId instead of scanning
+with toLower(...) CONTAINS. Resolution uses the `entity_text` full-text index (created by
+optimize_db.py) and falls back to an in-process BM25 index when it is missing; the local
+index is loaded at startup and kept current by Neo4jIngestor.ingest_batch.
+"""
+import os
+import re
+import math
+import time
+
+from database.transactions import fetch_all
+
+FULLTEXT_INDEX = "entity_text"
+TEXT_FIELDS = ("name", "topic", "summary")
+# name/topic matches count more than words inside an event summary
+FIELD_WEIGHTS = {"name": 2.0, "topic": 2.0, "summary": 1.0}
+RESOLVE_LIMIT = int(os.getenv("ENTITY_RESOLVE_LIMIT", "5"))
+# Matches scoring below this share of the best match are dropped
+RESOLVE_MIN_RELATIVE = float(os.getenv("ENTITY_RESOLVE_MIN_RELATIVE", "0.5"))
+FULLTEXT_RETRY_INTERVAL = 300.0
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Korean particles glued to names ("Jinsu는", "진수의")
+KOREAN_PARTICLES = ("에서", "으로", "은", "는", "이", "가", "을", "를", "의", "에", "와", "과", "도", "로")
+LUCENE_SPECIAL = re.compile(r'([+\-!(){}\[\]^"~*?:\\/&|])')
+
+FULLTEXT_QUERY = f"""
+CALL db.index.fulltext.queryNodes('{FULLTEXT_INDEX}', $terms, {{limit: $limit}}) YIELD node, score
+WHERE $labels IS NULL OR any(l IN labels(node) WHERE l IN $labels)
+RETURN elementId(node) AS eid, labels(node)[0] AS label,
+       coalesce(node.name, node.topic, node.summary) AS text, score
+"""
+
+ENTITY_TEXT_QUERY = """
+MATCH (n) WHERE n.name IS NOT NULL OR n.topic IS NOT NULL OR n.summary IS NOT NULL
+RETURN elementId(n) AS eid, labels(n) AS labels, n.name AS name, n.topic AS topic, n.summary AS summary
+"""
+
+def tokenize(text) -> list:
+    """Lowercase word tokens; Latin and Hangul runs are split and Korean particles stripped."""
+    tokens = []
+    for run in re.findall(r"[a-z0-9]+|[가-힣]+|[^\W\d_a-z가-힣]+", str(text).lower()):
+        if re.match(r"[가-힣]", run):
+            if run in KOREAN_PARTICLES:
+                continue
+            for particle in KOREAN_PARTICLES:
+                if run.endswith(particle) and len(run) > len(particle):
+                    run = run[:-len(particle)]
+                    break
+        tokens.append(run)
+    return tokens
+
+def lucene_query(text: str) -> str:
+    """OR query over the tokens; longer tokens also match one typo away."""
+    terms = []
+    for token in dict.fromkeys(tokenize(text)):
+        escaped = LUCENE_SPECIAL.sub(r"\\\1", token)
+        terms.append(escaped if len(token) < 4 else f"{escaped} {escaped}~1")
+    return " ".join(terms)
+
+class EntityIndex:
+    def __init__(self):
+        self.postings = {} # token -> {eid: weighted term frequency}
+        self.docs = {} # eid -> (labels, display text, weighted length, tokens)
+        self.total_length = 0.0
+        self.loaded = False
+        self.fulltext_retry_at = 0.0 # full-text index skipped until then after a failure
+
+    # --- Local BM25 Index ---
+
+    def add(self, eid: str, labels, props: dict):
+        self.remove(eid)
+        counts = {}
+        for field in TEXT_FIELDS:
+            for token in tokenize(props.get(field) or ""):
+                counts[token] = counts.get(token, 0.0) + FIELD_WEIGHTS[field]
+        if not counts:
+            return
+        text = next(props[f] for f in TEXT_FIELDS if props.get(f))
+        length = sum(counts.values())
+        self.docs[eid] = (tuple(labels), text, length, tuple(counts))
+        self.total_length += length
+        for token, tf in counts.items():
+            self.postings.setdefault(token, {})[eid] = tf
+
+    def remove(self, eid: str):
+        doc = self.docs.pop(eid, None)
+        if doc is None:
+            return
+        self.total_length -= doc[2]
+        for token in doc[3]:
+            posting = self.postings.get(token)
+            if posting is not None:
+                posting.pop(eid, None)
+                if not posting:
+                    del self.postings[token]
+
+    def load(self, records):
+        self.postings.clear()
+        self.docs.clear()
+        self.total_length = 0.0
+        for r in records:
+            self.add(r["eid"], r["labels"] or [], {f: r[f] for f in TEXT_FIELDS})
+        self.loaded = True
+
+    def search_local(self, text: str, labels=None, limit: int = RESOLVE_LIMIT) -> list:
+        n = len(self.docs)
+        if not n:
+            return []
+        avg_length = self.total_length / n
+        scores = {}
+        for token in set(tokenize(text)):
+            posting = self.postings.get(token)
+            if not posting:
+                continue
+            idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for eid, tf in posting.items():
+                length = self.docs[eid][2]
+                scores[eid] = scores.get(eid, 0.0) + idf * tf * (BM25_K1 + 1) / (
+                    tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length))
+        matches = []
+        for eid, score in sorted(scores.items(), key=lambda item: -item[1]):
+            doc_labels, display = self.docs[eid][:2]
+            if labels and not set(labels) & set(doc_labels):
+                continue
+            matches.append({"eid": eid, "label": doc_labels[0] if doc_labels else None, "text": display, "score": score})
+            if len(matches) >= limit:
+                break
+        return matches
+
+    # --- Resolution ---
+
+    async def _search_fulltext(self, driver, text: str, labels, limit: int):
+        query = lucene_query(text)
+        if not query:
+            return []
+        async with driver.session() as session:
+            records = await session.execute_read(fetch_all, FULLTEXT_QUERY, terms=query,
+                                                 labels=list(labels) if labels else None, limit=limit * 4)
+        return [dict(r) for r in records][:limit]
+
+    async def resolve(self, driver, text: str, labels=None, limit: int = RESOLVE_LIMIT):
+        """
+        Best matching nodes as [{"eid", "label", "text", "score"}], or None when neither the
+        full-text index nor the local index could answer.
+        """
+        matches = None
+        if driver is not None and time.monotonic() >= self.fulltext_retry_at:
+            try:
+                matches = await self._search_fulltext(driver, text, labels, limit)
+            except Exception as e:
+                self.fulltext_retry_at = time.monotonic() + FULLTEXT_RETRY_INTERVAL
+                print(f"[EntityIndex] Full-text index unavailable, using local BM25: {e}")
+        if matches is None:
+            if not self.loaded:
+                return None
+            matches = self.search_local(text, labels, limit)
+        if matches:
+            best = matches[0]["score"]
+            matches = [m for m in matches if m["score"] >= RESOLVE_MIN_RELATIVE * best]
+        return matches
+
+    async def bootstrap(self, driver) -> list:
+        """Loads the local index; returns the records so the vector index can reuse them."""
+        async with driver.session() as session:
+            records = await session.execute_read(fetch_all, ENTITY_TEXT_QUERY)
+        self.load(records)
+        print(f"[EntityIndex] Indexed {len(self.docs)} nodes for local lookup.")
+        return records
+
+entity_index = EntityIndex()
@@ -0,0 +1,199 @@
+"""
+Local intent router: matches frequent question shapes to parameterized Cypher templates
+(built on the schema in cypher_gen.SYSTEM_PROMPT) so they skip the Gemini round trip.
+Slots (person names, years, months) are extracted with regexes; anything that does not
+match a full question pattern with high confidence goes to the LLM as before.
+"""
+import os
+import re
+import time
+from dataclasses import dataclass, field
+
+MIN_CONFIDENCE = float(os.getenv("INTENT_ROUTER_MIN_CONFIDENCE", "0.8"))
+
+# --- Slot Patterns ---
+NAME = r"(?P<name>[A-Za-z가-힣][\w가-힣.'\- ]{0,40}?)"
+PARTICLE = r"(?:은|는|이|가|의)?"
+YEAR = r"(?P<year>(?:19|20)\d{2})"
+MONTH_NUM = r"(?P<month>1[0-2]|0?[1-9])"
+MONTH_NAMES = {
+    "january": 1, "february": 2, "march": 3, "april": 4, "may": 5, "june": 6, "july": 7,
+    "august": 8, "september": 9, "october": 10, "november": 11, "december": 12,
+}
+MONTH_NAME = r"(?P<month_name>" + "|".join(MONTH_NAMES) + r")"
+# Words that mean the 'name' slot captured part of a different question
+NON_NAMES = {"what", "where", "who", "which", "when", "how", "the", "a", "an", "무엇", "뭐", "어디", "누구", "언제"}
+
+# --- Cypher Templates ---
+# $PERSON is filled with PERSON_BY_NAME, or PERSON_BY_ID once the retriever has resolved
+# the name slot through the entity index (an elementId seek instead of a label scan)
+PERSON_BY_NAME = "toLower(p.name) = toLower($name)"
+PERSON_BY_ID = "elementId(p) IN $person_ids"
+WORKS_AT = """
+MATCH (p:Person)-[r:BELONGS_TO]->(o:Organization)
+WHERE $PERSON
+RETURN o.name AS organization, r.role AS role, r.start_date AS start_date
+"""
+SKILLS = """
+MATCH (p:Person)-[:HAS_SKILL]->(s:Skill)
+WHERE $PERSON
+RETURN s.name AS skill
+ORDER BY s.pagerank DESC
+"""
+INTERESTS = """
+MATCH (p:Person)-[:INTERESTED_IN]->(i:Interest)
+WHERE $PERSON
+RETURN i.topic AS interest
+ORDER BY i.pagerank DESC
+"""
+PERSON_EVENTS = """
+MATCH (p:Person)-[:EXPERIENCED]->(e:Event)
+WHERE $PERSON
+RETURN e.summary AS summary, e.date AS date
+ORDER BY e.date
+"""
+EVENTS_IN_PERIOD = """
+MATCH (e:Event) WHERE e.date STARTS WITH $period
+RETURN e.summary AS summary, e.date AS date
+ORDER BY e.date
+"""
+
+@dataclass
+class Intent:
+    name: str
+    cypher: str
+    patterns: list = field(default_factory=list)
+
+INTENTS = [
+    Intent("works_at", WORKS_AT, [
+        rf"where (?:does|did) {NAME} work",
+        rf"where is {NAME} working",
+        rf"(?:which|what) (?:company|organization) (?:does|did) {NAME} work (?:for|at)",
+        rf"who (?:does|did) {NAME} work for",
+        rf"{NAME}\s*{PARTICLE}\s*어디(?:에서|서)?\s*일(?:해|하|했|하고)\S*",
+        rf"{NAME}\s*{PARTICLE}\s*(?:어느|무슨)\s*회사\S*(?:\s*다녀\S*)?",
+        rf"{NAME}\s*{PARTICLE}\s*회사\S*\s*어디\S*",
+    ]),
+    Intent("skills", SKILLS, [
+        rf"what (?:are|were) {NAME}(?:'s|s')? skills",
+        rf"what skills does {NAME} have",
+        rf"what can {NAME} do",
+        rf"{NAME}\s*{PARTICLE}\s*(?:스킬|기술|역량)\S*(?:\s*(?:은|는|이|가|뭐|무엇)\S*)*",
+    ]),
+    Intent("interests", INTERESTS, [
+        rf"what is {NAME} interested in",
+        rf"what are {NAME}(?:'s|s')? interests",
+        rf"{NAME}\s*{PARTICLE}\s*관심(?:사|분야)\S*(?:\s*(?:은|는|이|가|뭐|무엇)\S*)*",
+        rf"{NAME}\s*{PARTICLE}\s*(?:뭐|무엇|어디)에\s*관심\S*(?:\s*있\S*)?",
+    ]),
+    Intent("person_events", PERSON_EVENTS, [
+        rf"what did {NAME} do",
+        rf"what (?:has|had) {NAME} done",
+        rf"{NAME}\s*{PARTICLE}\s*(?:뭘|무엇을|무슨 일을)\s*했\S*",
+    ]),
+    Intent("events_in_period", EVENTS_IN_PERIOD, [
+        rf"what happened in {MONTH_NAME} {YEAR}",
+        rf"what happened in {YEAR}(?:-{MONTH_NUM})?",
+        rf"(?:list |show )?(?:the )?events in {YEAR}",
+        rf"{YEAR}\s*년\s*(?:{MONTH_NUM}\s*월)?\s*에?\s*(?:무슨|어떤)\s*일\S*\s*(?:이|가)?\s*있었\S*",
+        rf"{YEAR}\s*년\s*(?:{MONTH_NUM}\s*월)?\s*(?:의)?\s*(?:이벤트|일정|사건)\S*",
+    ]),
+]
+
+_COMPILED = [(intent, [re.compile(p, re.IGNORECASE) for p in intent.patterns]) for intent in INTENTS]
+
+@dataclass
+class RoutedQuery:
+    intent: str
+    template: str
+    params: dict
+    confidence: float
+
+    @property
+    def cypher(self) -> str:
+        condition = PERSON_BY_ID if "person_ids" in self.params else PERSON_BY_NAME
+        return self.template.replace("$PERSON", condition)
+
+def _normalize(question: str) -> str:
+    return re.sub(r"\s+", " ", question).strip().rstrip("?!.？ ").strip()
+
+def _slots(match) -> tuple:
+    """(params, confidence) from a pattern match."""
+    groups = {k: v for k, v in match.groupdict().items() if v}
+    params = {}
+    confidence = 1.0
+    if "name" in groups:
+        name = groups["name"].strip()
+        words = name.lower().split()
+        if not words or words[0] in NON_NAMES:
+            return None, 0.0
+        # Long 'names' usually mean the pattern swallowed a more specific question
+        if len(words) > 3:
+            confidence = 0.5
+        params["name"] = name
+    if "year" in groups:
+        month = groups.get("month")
+        if "month_name" in groups:
+            month = MONTH_NAMES[groups["month_name"].lower()]
+        params["period"] = f"{groups['year']}-{int(month):02d}" if month else groups["year"]
+    return params, confidence
+
+def route_question(question: str):
+    """Best full-question template match, or None when the LLM should handle it."""
+    text = _normalize(question)
+    best = None
+    for intent, patterns in _COMPILED:
+        for pattern in patterns:
+            match = pattern.fullmatch(text)
+            if not match:
+                continue
+            params, confidence = _slots(match)
+            if params is not None and (best is None or confidence > best.confidence):
+                best = RoutedQuery(intent.name, intent.cypher.strip(), params, confidence)
+    if best is None or best.confidence < MIN_CONFIDENCE:
+        return None
+    return best
+
+class RouterStats:
+    """Hit rate and latency saved by skipping generate_cypher, across all retrievers."""
+    def __init__(self):
+        self.questions = 0
+        self.routed = 0
+        self.routed_empty = 0 # template matched but found nothing; fell back to the LLM
+        self.cache_hits = 0 # LLM path answered from the Cypher cache
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+        self.router_seconds = 0.0
+
+    def record_route(self, seconds: float, routed: bool):
+        self.questions += 1
+        self.router_seconds += seconds
+        if routed:
+            self.routed += 1
+
+    def record_llm(self, seconds: float):
+        self.llm_calls += 1
+        self.llm_seconds += seconds
+
+    def summary(self) -> dict:
+        avg_llm = self.llm_seconds / self.llm_calls if self.llm_calls else None
+        answered = self.routed - self.routed_empty
+        return {
+            "questions": self.questions,
+            "routed": self.routed,
+            "routed_empty_fallback": self.routed_empty,
+            "cypher_cache_hits": self.cache_hits,
+            "hit_rate": answered / self.questions if self.questions else 0.0,
+            "avg_llm_cypher_ms": avg_llm * 1000 if avg_llm is not None else None,
+            "avg_router_ms": self.router_seconds / self.questions * 1000 if self.questions else 0.0,
+            # Each locally answered or cached question skipped one generate_cypher call
+            "estimated_saved_ms": (answered + self.cache_hits) * avg_llm * 1000 if avg_llm is not None else None,
+        }
+
+router_stats = RouterStats()
+
+def timed_route(question: str):
+    start = time.perf_counter()
+    routed = route_question(question)
+    router_stats.record_route(time.perf_counter() - start, routed is not None)
+    return routed
@@ -0,0 +1,151 @@
+"""
+Cache of validated Cypher queries keyed by normalized question.
+
+Paraphrases are matched with cosine similarity over character trigram counts (no
+embedding service). A near-duplicate only reuses a query when every quoted literal in
+that Cypher also appears in the new question and both questions mention the same
+numbers, so "Where does Jinsu work?" never answers "Where does Minsu work?".
+Entries are tagged with the schema version, a hash of cypher_gen.SYSTEM_PROMPT and of the
+labels and relationship types in the graph (db.labels() / db.relationshipTypes() at startup,
+plus the ones ingest_batch writes), and dropped when it changes.
+"""
+import os
+import re
+import math
+import hashlib
+from collections import Counter, OrderedDict
+
+from .cypher_gen import SYSTEM_PROMPT
+
+CACHE_MAX_ENTRIES = int(os.getenv("CYPHER_CACHE_MAX_ENTRIES", "1000"))
+CACHE_MIN_SIMILARITY = float(os.getenv("CYPHER_CACHE_MIN_SIMILARITY", "0.85"))
+
+LITERAL_PATTERN = re.compile(r"'([^']*)'|\"([^\"]*)\"")
+
+def normalize_question(question: str) -> str:
+    text = re.sub(r"[^\w\s]", " ", question.lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+def _trigrams(text: str) -> Counter:
+    padded = f"  {text} "
+    return Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+
+def _literals(cypher: str) -> set:
+    """Quoted strings in the query, normalized like questions."""
+    return {normalize_question(a or b) for a, b in LITERAL_PATTERN.findall(cypher)} - {""}
+
+def _numbers(text: str) -> frozenset:
+    return frozenset(re.findall(r"\d+", text))
+
+def schema_version(labels=(), rel_types=()) -> str:
+    schema = "\n".join([SYSTEM_PROMPT, ",".join(sorted(labels)), ",".join(sorted(rel_types))])
+    return hashlib.blake2b(schema.encode(), digest_size=8).hexdigest()
+
+class _Entry:
+    __slots__ = ("cypher", "grams", "norm", "literals", "numbers")
+
+    def __init__(self, key: str, cypher: str):
+        self.cypher = cypher
+        self.grams = _trigrams(key)
+        self.norm = math.sqrt(sum(c * c for c in self.grams.values()))
+        self.literals = _literals(cypher)
+        self.numbers = _numbers(key)
+
+class QueryCache:
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, min_similarity: float = CACHE_MIN_SIMILARITY):
+        self.max_entries = max_entries
+        self.min_similarity = min_similarity
+        self.entries = OrderedDict() # normalized question -> _Entry, LRU order
+        self.postings = {} # trigram -> set of normalized questions
+        self.labels = frozenset()
+        self.rel_types = frozenset()
+        self.version = schema_version()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _update_schema(self, labels: frozenset, rel_types: frozenset):
+        version = schema_version(labels, rel_types)
+        if version != self.version:
+            if self.entries:
+                print(f"[CypherCache] Schema changed, dropping {len(self.entries)} cached queries.")
+            self.clear()
+            self.version = version
+        self.labels, self.rel_types = labels, rel_types
+
+    def set_schema(self, labels, rel_types):
+        """Schema snapshot from db.labels() / db.relationshipTypes(), e.g. at startup."""
+        self._update_schema(frozenset(labels), frozenset(rel_types))
+
+    def observe_schema(self, labels, rel_types):
+        """Labels and relationship types just written; a new one changes the schema version."""
+        if not self.labels.issuperset(labels) or not self.rel_types.issuperset(rel_types):
+            self._update_schema(self.labels | frozenset(labels), self.rel_types | frozenset(rel_types))
+
+    def clear(self):
+        self.entries.clear()
+        self.postings.clear()
+
+    def lookup(self, question: str):
+        """Cached Cypher for the question or a close paraphrase, or None."""
+        key = normalize_question(question)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            return entry.cypher
+
+        grams = _trigrams(key)
+        norm = math.sqrt(sum(c * c for c in grams.values()))
+        numbers = _numbers(key)
+        candidates = set()
+        for gram in grams:
+            candidates.update(self.postings.get(gram, ()))
+        best_key, best_score = None, self.min_similarity
+        for candidate in candidates:
+            other = self.entries[candidate]
+            if other.numbers != numbers or not all(literal in key for literal in other.literals):
+                continue
+            dot = sum(count * other.grams.get(gram, 0) for gram, count in grams.items())
+            score = dot / (norm * other.norm) if norm and other.norm else 0.0
+            if score >= best_score:
+                best_key, best_score = candidate, score
+        if best_key is None:
+            return None
+        self.entries.move_to_end(best_key)
+        print(f"[CypherCache] Reusing query for '{best_key}' (similarity {best_score:.2f}).")
+        return self.entries[best_key].cypher
+
+    def store(self, question: str, cypher: str, version: str = None):
+        """
+        Call only after the query has executed successfully. `version` is the schema version
+        read before the query was generated; a query from an older schema is not stored.
+        """
+        key = normalize_question(question)
+        if not key or not cypher or (version is not None and version != self.version):
+            return
+        self.discard(key)
+        entry = _Entry(key, cypher)
+        self.entries[key] = entry
+        for gram in entry.grams:
+            self.postings.setdefault(gram, set()).add(key)
+        while len(self.entries) > self.max_entries:
+            self.discard(next(iter(self.entries)))
+
+    def discard(self, question: str):
+        key = normalize_question(question)
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        for gram in entry.grams:
+            keys = self.postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.postings[gram]
+
+    def invalidate(self, cypher: str):
+        """Drops every entry using a query that stopped working."""
+        for key in [k for k, e in self.entries.items() if e.cypher == cypher]:
+            self.discard(key)
+
+query_cache = QueryCache()
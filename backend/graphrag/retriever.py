@@ -1,55 +1,154 @@
-from neo4j import GraphDatabase
 import os
+import asyncio
+import time
 from .cypher_gen import generate_cypher
+from .intent_router import timed_route, router_stats
+from .query_cache import query_cache
+from .cypher_guard import UnsafeQueryError, bound_query, read_bounded
+from .context_builder import build_context
+from .answer_cache import dependencies
+from .entity_index import entity_index
+from .vector_index import vector_index
+from database.pool import neo4j_pool
 
-# Use 'ssc' if needed based on previous config
-URI = os.getenv("NEO4J_URI", "neo4j+ssc://b60a0727.databases.neo4j.io")
-AUTH = (os.getenv("NEO4J_USERNAME"), os.getenv("NEO4J_PASSWORD"))
+SEED_FANOUT = int(os.getenv("HYBRID_SEED_FANOUT", "20"))
+# One hop around the vector-matched nodes, nearest seeds first
+SEED_EXPANSION_QUERY = """
+UNWIND range(0, size($eids) - 1) AS rank
+MATCH (seed) WHERE elementId(seed) = $eids[rank]
+CALL {
+    WITH seed
+    OPTIONAL MATCH (seed)-[r]-()
+    RETURN r LIMIT $fanout
+}
+RETURN seed, r AS relationship
+ORDER BY rank
+"""
 
 class GraphRetriever:
-    def __init__(self):
-        self.driver = GraphDatabase.driver(URI, auth=AUTH)
+    def __init__(self, driver=None):
+        self.driver = driver or neo4j_pool.get_driver()
+        self.context_tokens = 0 # estimated tokens of the last formatted result
+        self.depends_on = None # graph data the last context came from, for the answer cache
+        self.llm_calls = 0 # generate_cypher calls made by the last retrieve
 
-    def close(self):
-        self.driver.close()
-
-    def retrieve(self, question: str) -> str:
+    async def retrieve(self, question: str) -> str:
         """
         Main retrieval function:
-        1. Convert Question -> Cypher
+        1. Convert Question -> Cypher (local intent template, else LLM)
         2. Execute Cypher
-        3. Simple Context formatting
+        3. Compact context formatting within the token budget
+        When the Cypher finds nothing (or fails), the context comes from the neighborhoods
+        of the nodes most similar to the question (vector index) instead.
         """
-        cypher_query = generate_cypher(question)
+        routed = timed_route(question)
+        if routed:
+            if "name" in routed.params:
+                routed.params.update(await self._resolve_person(routed.params["name"]))
+            try:
+                results, truncated = await self._execute_query(routed.cypher, explain=False, **routed.params)
+            except Exception as e:
+                return f"Error executing query: {e}"
+            if results:
+                self.depends_on = dependencies(routed.cypher, routed.params, results)
+                print(f"[IntentRouter] '{routed.intent}' {routed.params} (hit rate {router_stats.summary()['hit_rate']:.0%})")
+                return (f"Cypher Query: {routed.cypher}\nParameters: {routed.params}\nResults:\n"
+                        + self._format_results(results, truncated))
+            # Template matched but found nothing (e.g. name spelled differently); let the LLM try
+            router_stats.routed_empty += 1
+
+        schema = query_cache.version
+        cypher_query = query_cache.lookup(question)
+        cached = cypher_query is not None
+        if cached:
+            router_stats.cache_hits += 1
+        else:
+            # Stored names of the entities the question mentions, so the LLM does not guess them
+            entities = await self._resolve_mentions(question)
+            start = time.perf_counter()
+            # Blocking Gemini call; keep the event loop free for concurrent chat stages
+            cypher_query = await asyncio.to_thread(generate_cypher, question, entities)
+            router_stats.record_llm(time.perf_counter() - start)
+            self.llm_calls += 1
         print(f"Generated Cypher: {cypher_query}")
         
         if not cypher_query:
-            return "No valid query generated."
-            
+            return await self._seeded_retrieve(question) or "No valid query generated."
+
         try:
-            results = self._execute_query(cypher_query)
-            # Include Query in Context for better answer generation
-            return f"Cypher Query: {cypher_query}\nResults:\n" + self._format_results(results)
+            cypher_query = bound_query(cypher_query)
+            results, truncated = await self._execute_query(cypher_query)
+        except UnsafeQueryError as e:
+            print(f"[CypherGuard] Rejected: {e}")
+            if cached:
+                query_cache.invalidate(cypher_query)
+            return await self._seeded_retrieve(question) or f"Query rejected: {e}"
         except Exception as e:
-            return f"Error executing query: {e}"
-
-    def _execute_query(self, query):
-        with self.driver.session() as session:
-            result = session.run(query)
-            return [record.data() for record in result]
+            if cached:
+                query_cache.invalidate(cypher_query)
+            return await self._seeded_retrieve(question) or f"Error executing query: {e}"
+        if not results:
+            seeded = await self._seeded_retrieve(question)
+            if seeded:
+                return seeded
+        # Only queries that ran and found something are worth reusing
+        if results and not cached:
+            query_cache.store(question, cypher_query, schema)
+        self.depends_on = dependencies(cypher_query, None, results)
+        # Include Query in Context for better answer generation
+        return f"Cypher Query: {cypher_query}\nResults:\n" + self._format_results(results, truncated)
 
-    def _format_results(self, results):
+    async def _seeded_retrieve(self, question: str):
+        """Context from the one-hop neighborhoods of the top vector matches, or None."""
+        start = time.perf_counter()
+        seeds = vector_index.search(question)
+        print(f"[VectorIndex] {len(seeds)} seeds in {(time.perf_counter() - start) * 1000:.1f}ms")
+        if not seeds:
+            return None
+        eids = [s["eid"] for s in seeds]
+        try:
+            results, truncated = await self._execute_query(SEED_EXPANSION_QUERY, explain=False,
+                                                           eids=eids, fanout=SEED_FANOUT)
+        except Exception as e:
+            print(f"[VectorIndex] Seed expansion failed: {e}")
+            return None
         if not results:
-            return "No information found in the graph."
-        
-        # Determine format based on structure
-        formatted = []
-        for row in results:
-            formatted.append(str(row))
-        
-        return "\n".join(formatted)
+            return None
+        # No name anchors here: any write to the seeds' labels or the expanded relationship
+        # types may change which nodes are nearest
+        items = {s["label"] for s in seeds if s["label"]}
+        items |= {row["relationship"][1] for row in results if row.get("relationship")}
+        self.depends_on = ("labels", frozenset(items))
+        seed_text = ", ".join(f"{s['text']} ({s['score']:.2f})" for s in seeds)
+        return (f"Cypher Query: {SEED_EXPANSION_QUERY.strip()}\nSeeds (similar to the question): {seed_text}\nResults:\n"
+                + self._format_results(results, truncated))
 
-if __name__ == "__main__":
+    async def _resolve_person(self, name: str) -> dict:
+        """{"person_ids": [...]} for a name slot, or {} to keep the name comparison."""
+        matches = await entity_index.resolve(self.driver, name, labels=["Person"])
+        if not matches:
+            return {}
+        # Exact names only; otherwise the single best (typo-tolerant) match
+        exact = [m for m in matches if str(m["text"]).strip().lower() == name.strip().lower()]
+        return {"person_ids": [m["eid"] for m in exact or matches[:1]]}
+
+    async def _resolve_mentions(self, question: str) -> list:
+        return await entity_index.resolve(self.driver, question) or []
+
+    async def _execute_query(self, query, explain=True, **params):
+        """(rows, truncated) from a timed, capped read transaction."""
+        async with self.driver.session() as session:
+            return await session.execute_read(read_bounded, query, explain=explain, **params)
+
+    def _format_results(self, results, truncated=False):
+        text, self.context_tokens = build_context(results, truncated=truncated)
+        print(f"[Context] {len(results)} rows -> ~{self.context_tokens} tokens")
+        return text
+
+async def _main():
     retriever = GraphRetriever()
-    print(retriever.retrieve("What did Jinsu do?"))
-    retriever.close()
+    print(await retriever.retrieve("What did Jinsu do?"))
+    await neo4j_pool.close()
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,319 @@
+"""
+Offline vector index over node name / topic / summary.
+
+Embeddings are signed feature hashes of word tokens and their character trigrams, so no
+model download or network call is needed and related spellings ("robot" / "robotics")
+still score a high cosine. Vectors live in one float32 NumPy matrix that grows by doubling.
+Small graphs are searched exactly; from IVF_MIN_NODES on, rows are bucketed by their nearest
+k-means centroid (IVF) and a search only scans the IVF_PROBES closest buckets. Centroids are
+retrained in a background thread whenever the index has grown RETRAIN_GROWTH times.
+The index is loaded at startup and kept current by Neo4jIngestor.ingest_batch.
+"""
+import os
+import math
+import zlib
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+from .entity_index import TEXT_FIELDS, FIELD_WEIGHTS, tokenize, entity_index
+
+VECTOR_DIM = int(os.getenv("VECTOR_DIM", "256"))
+VECTOR_TOP_K = int(os.getenv("VECTOR_TOP_K", "5"))
+# Cosine below this is hash-collision noise rather than shared words
+VECTOR_MIN_SCORE = float(os.getenv("VECTOR_MIN_SCORE", "0.25"))
+# Query words no node contains still count a little (their trigrams may match a variant)
+UNKNOWN_TOKEN_WEIGHT = 0.3
+IVF_MIN_NODES = int(os.getenv("VECTOR_IVF_MIN_NODES", "20000"))
+IVF_PROBES = int(os.getenv("VECTOR_IVF_PROBES", "16"))
+IVF_MAX_LISTS = 1024
+KMEANS_ITERATIONS = 8
+KMEANS_SAMPLE_PER_LIST = 32
+RETRAIN_GROWTH = 4
+_ASSIGN_CHUNK = 65536
+
+# Question words that say nothing about which node is meant
+STOPWORDS = frozenset("""
+a an the of in on at to for and or with about from by is are was were be been do does did
+who whom whose what which where when why how me my i you your tell show list any some
+누구 무엇 뭐 어디 언제 어떤 어떻게 알려줘 있어
+""".split())
+
+@lru_cache(maxsize=200_000)
+def _features(token: str) -> tuple:
+    """(dimensions, signed weights) of one token: the whole word plus its trigrams."""
+    padded = f"<{token}>"
+    grams = [padded[i:i + 3] for i in range(max(1, len(padded) - 2))]
+    features = [("w:" + token, 1.0)] + [("g:" + g, 1.0 / np.sqrt(len(grams))) for g in grams]
+    dims, weights = [], []
+    for feature, weight in features:
+        h = zlib.crc32(feature.encode("utf-8"))
+        dims.append(h % VECTOR_DIM)
+        weights.append(weight if (h >> 16) & 1 else -weight)
+    return dims, weights
+
+def _hashed(text, scale: float, weight, dims: list, weights: list):
+    for token in tokenize(text):
+        if token in STOPWORDS:
+            continue
+        d, w = _features(token)
+        factor = scale * (weight(token) if weight else 1.0)
+        dims.extend(d)
+        weights.extend(x * factor for x in w)
+
+def _unit(dims: list, weights: list) -> np.ndarray:
+    if not dims:
+        return np.zeros(VECTOR_DIM, np.float32)
+    vec = np.bincount(dims, weights=weights, minlength=VECTOR_DIM).astype(np.float32)
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+def embed(text, weight=None) -> np.ndarray:
+    """Unit-length hashed embedding (tokens scaled by weight(token)); all zeros without tokens."""
+    dims, weights = [], []
+    _hashed(text, 1.0, weight, dims, weights)
+    return _unit(dims, weights)
+
+def embed_node(props: dict) -> np.ndarray:
+    """Node embedding; name/topic words weigh more than summary words, as in the BM25 index."""
+    dims, weights = [], []
+    for field in TEXT_FIELDS:
+        if props.get(field):
+            _hashed(props[field], FIELD_WEIGHTS[field], None, dims, weights)
+    return _unit(dims, weights)
+
+def query_weight(token: str) -> float:
+    """IDF of a question word in (0, 1], from the document counts of the local entity index."""
+    n = len(entity_index.docs)
+    if not n:
+        return 1.0
+    df = len(entity_index.postings.get(token, ()))
+    return math.log(1 + n / df) / math.log(1 + n) if df else UNKNOWN_TOKEN_WEIGHT
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    out = np.empty(vectors.shape[0], np.int32)
+    for start in range(0, vectors.shape[0], _ASSIGN_CHUNK):
+        out[start:start + _ASSIGN_CHUNK] = np.argmax(vectors[start:start + _ASSIGN_CHUNK] @ centroids.T, axis=1)
+    return out
+
+def _kmeans(sample: np.ndarray, k: int, seed: int = 0) -> np.ndarray:
+    """Spherical k-means (cosine) centroids."""
+    rng = np.random.default_rng(seed)
+    centroids = sample[rng.choice(sample.shape[0], k, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assign = _nearest(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, sample)
+        norms = np.linalg.norm(sums, axis=1)
+        empty = norms == 0
+        # Empty clusters restart from random sample points
+        sums[empty] = sample[rng.choice(sample.shape[0], int(empty.sum()))]
+        norms[empty] = 1.0
+        centroids = (sums / norms[:, None]).astype(np.float32)
+    return centroids
+
+class VectorIndex:
+    def __init__(self, dim: int = VECTOR_DIM):
+        self.dim = dim
+        self.vectors = np.zeros((1024, dim), np.float32)
+        self.size = 0
+        self.eids = [] # row -> eid (None once removed)
+        self.labels = [] # row -> labels
+        self.texts = [] # row -> display text
+        self.rows = {} # eid -> row
+        # (centroids, row array per centroid from training, rows filed since) once trained
+        self.ivf = None
+        self.trained_size = 0
+        self.training = False
+        self.lock = threading.Lock()
+        # Adds (vector, labels, text) and removals (None) by eid since a load started,
+        # replayed onto the loaded index at the swap
+        self.pending = None
+        self.generation = 0 # bumped by load/clear, so an outdated load is discarded
+
+    # --- Updates ---
+
+    def add(self, eid: str, labels, props: dict):
+        vec = embed_node(props)
+        if not vec.any():
+            self.remove(eid)
+            return
+        entry = (vec, tuple(labels), next(props[f] for f in TEXT_FIELDS if props.get(f)))
+        with self.lock:
+            self._put(eid, *entry)
+            if self.pending is not None:
+                self.pending[eid] = entry
+        self._maybe_train()
+
+    def _put(self, eid: str, vec: np.ndarray, labels: tuple, text: str):
+        # Caller holds the lock (or owns the index, as load() does)
+        row = self.rows.get(eid)
+        if row is None:
+            row = self._append(eid)
+        self.vectors[row] = vec
+        self.labels[row] = labels
+        self.texts[row] = text
+        if self.ivf is not None:
+            self._file(row, self.ivf)
+
+    def _append(self, eid: str) -> int:
+        if self.size == self.vectors.shape[0]:
+            grown = np.zeros((self.vectors.shape[0] * 2, self.dim), np.float32)
+            grown[:self.size] = self.vectors[:self.size]
+            self.vectors = grown
+        row = self.size
+        self.size += 1
+        self.eids.append(eid)
+        self.labels.append(())
+        self.texts.append(None)
+        self.rows[eid] = row
+        return row
+
+    def _file(self, row: int, ivf: tuple):
+        # An updated row may stay listed under its old centroid too; search dedupes
+        ivf[2][int(np.argmax(ivf[0] @ self.vectors[row]))].append(row)
+
+    def remove(self, eid: str):
+        with self.lock:
+            self._drop(eid)
+            if self.pending is not None:
+                self.pending[eid] = None
+
+    def _drop(self, eid: str):
+        row = self.rows.pop(eid, None)
+        if row is None:
+            return
+        # Rows are not compacted; a removed row keeps its slot but never matches
+        self.eids[row] = None
+        self.vectors[row] = 0.0
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.pending = None
+            self.vectors = np.zeros((1024, self.dim), np.float32)
+            self.size = 0
+            self.eids, self.labels, self.texts = [], [], []
+            self.rows = {}
+            self.ivf = None
+            self.trained_size = 0
+
+    def _begin_load(self) -> int:
+        self.generation += 1
+        if self.pending is None:
+            self.pending = {}
+        return self.generation
+
+    def track_changes(self):
+        """Starts the log replayed by the next load(), e.g. before reading the records it loads."""
+        with self.lock:
+            self._begin_load()
+
+    def discard_changes(self):
+        """Stops the log started by track_changes() when the load will not happen."""
+        with self.lock:
+            self.generation += 1
+            self.pending = None
+
+    def load(self, records):
+        """
+        Rebuilds from ENTITY_TEXT_QUERY records. Blocking, so run it off the event loop;
+        the index is built aside and swapped in, searches keep using the old one meanwhile.
+        Adds and removals made since track_changes() (or since the call) are replayed onto it.
+        """
+        with self.lock:
+            generation = self._begin_load()
+        fresh = VectorIndex(self.dim)
+        for r in records:
+            props = {f: r[f] for f in TEXT_FIELDS}
+            vec = embed_node(props)
+            if not vec.any():
+                continue
+            fresh._put(r["eid"], vec, tuple(r["labels"] or ()), next(props[f] for f in TEXT_FIELDS if props.get(f)))
+        if fresh.size >= IVF_MIN_NODES:
+            fresh.train()
+        with self.lock:
+            if generation != self.generation:
+                return # cleared or reloaded meanwhile
+            for attr in ("vectors", "size", "eids", "labels", "texts", "rows", "ivf", "trained_size"):
+                setattr(self, attr, getattr(fresh, attr))
+            for eid, entry in self.pending.items():
+                if entry is None:
+                    self._drop(eid)
+                else:
+                    self._put(eid, *entry)
+            self.pending = None
+        self._maybe_train()
+
+    # --- IVF Training ---
+
+    def _maybe_train(self):
+        due = (self.size >= IVF_MIN_NODES if self.ivf is None
+               else self.size >= RETRAIN_GROWTH * self.trained_size)
+        if due and not self.training:
+            self.training = True
+            threading.Thread(target=self.train, name="vector-ivf-train", daemon=True).start()
+
+    def train(self):
+        """
+        Fits the IVF centroids on a sample and buckets every row. The heavy part reads a
+        snapshot of the first `size` rows unlocked; rows added meanwhile are bucketed at the swap.
+        """
+        self.training = True
+        try:
+            n = self.size
+            vectors = self.vectors # still holds rows below n if the matrix regrows meanwhile
+            k = int(min(IVF_MAX_LISTS, max(16, np.sqrt(n))))
+            rng = np.random.default_rng(n)
+            sample = vectors[rng.choice(n, min(n, k * KMEANS_SAMPLE_PER_LIST), replace=False)]
+            centroids = _kmeans(sample, k)
+            assign = _nearest(vectors[:n], centroids)
+            order = np.argsort(assign, kind="stable")
+            bounds = np.searchsorted(assign[order], np.arange(k + 1))
+            ivf = (centroids, [order[bounds[c]:bounds[c + 1]] for c in range(k)], [[] for _ in range(k)])
+            with self.lock:
+                for row in range(n, self.size):
+                    if self.eids[row] is not None:
+                        self._file(row, ivf)
+                self.ivf = ivf
+                self.trained_size = self.size
+            print(f"[VectorIndex] IVF trained: {k} lists over {n} nodes.")
+        finally:
+            self.training = False
+
+    # --- Search ---
+
+    def search(self, text: str, k: int = VECTOR_TOP_K) -> list:
+        """Top-k nodes by cosine as [{"eid", "label", "text", "score"}]."""
+        # Question words are IDF-weighted so filler ("anyone", "go") does not drown the topic
+        query = embed(text, query_weight)
+        if not self.size or not query.any():
+            return []
+        ivf = self.ivf
+        if ivf is None:
+            rows = np.arange(self.size)
+            scores = self.vectors[:self.size] @ query
+        else:
+            centroids, base, filed = ivf
+            probes = np.argpartition(-(centroids @ query), min(IVF_PROBES, len(base)) - 1)[:IVF_PROBES]
+            rows = np.concatenate([base[p] for p in probes])
+            extra = [row for p in probes for row in filed[p]]
+            if extra:
+                rows = np.unique(np.concatenate([rows, np.array(extra, dtype=rows.dtype)]))
+            scores = self.vectors[rows] @ query
+        want = min(len(scores), k)
+        if not want:
+            return []
+        top = np.argpartition(-scores, want - 1)[:want]
+        matches = []
+        for i in top[np.argsort(-scores[top])]:
+            row, score = int(rows[i]), float(scores[i])
+            eid = self.eids[row]
+            if score < VECTOR_MIN_SCORE or eid is None:
+                continue
+            matches.append({"eid": eid, "label": self.labels[row][0] if self.labels[row] else None,
+                            "text": self.texts[row], "score": score})
+        return matches
+
+vector_index = VectorIndex()
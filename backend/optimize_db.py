@@ -50,7 +50,27 @@ def create_constraints_and_indexes():
         # Indexes (Speed up Lookups)
         "CREATE INDEX node_name_index IF NOT EXISTS FOR (n:Person) ON (n.name)",
         "CREATE INDEX node_topic_index IF NOT EXISTS FOR (n:Interest) ON (n.topic)",
-        "CREATE INDEX node_label_index IF NOT EXISTS FOR (n:Concept) ON (n.label)"
+        "CREATE INDEX node_label_index IF NOT EXISTS FOR (n:Concept) ON (n.label)",
+
+        # Id Indexes (Seek start nodes for /graph/expand by (:Label {id}))
+        "CREATE INDEX person_id_index IF NOT EXISTS FOR (n:Person) ON (n.id)",
+        "CREATE INDEX org_id_index IF NOT EXISTS FOR (n:Organization) ON (n.id)",
+        "CREATE INDEX skill_id_index IF NOT EXISTS FOR (n:Skill) ON (n.id)",
+        "CREATE INDEX interest_id_index IF NOT EXISTS FOR (n:Interest) ON (n.id)",
+        "CREATE INDEX event_id_index IF NOT EXISTS FOR (n:Event) ON (n.id)"
+    ]
+
+    # Full-text Index (entity resolution in graphrag.entity_index: search keywords, chat mentions)
+    commands.append(
+        "CREATE FULLTEXT INDEX entity_text IF NOT EXISTS "
+        "FOR (n:Person|Organization|Skill|Interest|Event|Concept|Location) ON EACH [n.name, n.summary, n.topic]"
+    )
+
+    # Analytics Indexes (pagerank/degree/community written by analysis.materialize)
+    commands += [
+        f"CREATE INDEX {label.lower()}_{prop}_index IF NOT EXISTS FOR (n:{label}) ON (n.{prop})"
+        for label in ["Person", "Organization", "Skill", "Interest", "Event", "Concept"]
+        for prop in ["pagerank", "degree", "community"]
     ]
     
     try:
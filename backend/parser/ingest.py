@@ -1,35 +1,47 @@
-import os
-from neo4j import GraphDatabase
-from dotenv import load_dotenv
+from database.pool import neo4j_pool
+from analysis.incremental_pagerank import centrality_service, batch_names
+from graphrag.answer_cache import answer_cache, written_items
+from graphrag.query_cache import query_cache
+from graphrag.entity_index import entity_index
+from graphrag.vector_index import vector_index
 
-load_dotenv()
+# Appended to node / relationship MERGEs (`x`) that mark creation with ON CREATE SET x._created
+# and capture `before` = properties(x) ahead of their SET. A matched element counts as
+# changed when a written property differs from what was stored.
+def _merge_result(var: str, props: str) -> str:
+    return f"""
+WITH {var}, before, {var}._created IS NOT NULL AS created
+REMOVE {var}._created
+RETURN elementId({var}) AS eid, created,
+       created OR any(k IN keys({props}) WHERE coalesce(before[k] <> {props}[k], before[k] IS NOT NULL OR {props}[k] IS NOT NULL)) AS changed,
+       CASE WHEN created THEN null ELSE before END AS before
+"""
 
-URI = os.getenv("NEO4J_URI", "neo4j+ssc://b60a0727.databases.neo4j.io")
+CREATE_RESULT = "\nRETURN elementId(n) AS eid, true AS created, true AS changed, null AS before"
 
-print(f"[Ingestor] Using URI: {URI}")
-AUTH = (os.getenv("NEO4J_USERNAME"), os.getenv("NEO4J_PASSWORD"))
+def _diff_status(record, props: dict) -> dict:
+    """status, plus for updates the stored values (None if unset) of the properties the write changed."""
+    if record["created"]:
+        return {"status": "created"}
+    before = record["before"] or {}
+    return {"status": "updated", "before": {k: before.get(k) for k, v in props.items() if before.get(k) != v}}
 
 class Neo4jIngestor:
     def __init__(self, driver_override=None):
-        self.driver = driver_override or GraphDatabase.driver(URI, auth=AUTH)
-        self.owns_driver = driver_override is None
+        self.driver = driver_override or neo4j_pool.get_driver()
 
-    def close(self):
-        if self.owns_driver:
-            self.driver.close()
-
-    def ingest_data(self, graph_data: dict):
-        with self.driver.session() as session:
+    async def ingest_data(self, graph_data: dict):
+        async with self.driver.session() as session:
             # 1. Merge Nodes
             for node in graph_data.get("nodes", []):
-                session.execute_write(self._merge_node, node)
+                await session.execute_write(self._merge_node, node)
             
             # 2. Merge Relationships
             for rel in graph_data.get("relationships", []):
-                session.execute_write(self._merge_relationship, rel)
+                await session.execute_write(self._merge_relationship, rel)
 
     @staticmethod
-    def _merge_node(tx, node_data):
+    async def _merge_node(tx, node_data):
         label = node_data.get("label")
         props = node_data.get("properties", {})
         
@@ -79,15 +91,15 @@ class Neo4jIngestor:
         # Here we try to run generic merge if keys exist.
         
         if label != "Event": # Use specific MERGE queries above
-             tx.run(query, props=props)
+             await tx.run(query, props=props)
         else:
              # Event handling
              # We assume extraction provides an 'id' or we generate a random one?
              # For now, let's just create.
-             tx.run(f"CREATE (n:{label}) SET n += $props", props=props)
+             await tx.run(f"CREATE (n:{label}) SET n += $props", props=props)
 
     @staticmethod
-    def _merge_relationship(tx, rel_data):
+    async def _merge_relationship(tx, rel_data):
         # We need to find source and target nodes to connect.
         # This requires the nodes to have some unique ID from the extraction phase that we can match on.
         # But our simple extraction might not sync IDs with DB IDs.
@@ -109,31 +121,53 @@ class Neo4jIngestor:
         # 1. Create/Match nodes, store their DB IDs in a map (temp_id -> db_id).
         # 2. Create relationships using the map.
 
-    def ingest_batch(self, graph_data: dict):
+    async def ingest_batch(self, graph_data: dict) -> dict:
         """
         Ingests the whole batch in one transaction to maintain referential integrity using temp IDs from extraction.
+        Returns the database diff: {"nodes": [...], "links": [...]} with only the elements this
+        batch created or changed, each tagged status "created" / "updated". Updated elements
+        also carry "before": the stored values of the properties this batch changed.
         """
         node_count = len(graph_data.get("nodes", []))
         rel_count = len(graph_data.get("relationships", []))
         print(f"[Neo4jIngestor] Ingesting batch: {node_count} nodes, {rel_count} relationships.")
         
-        with self.driver.session() as session:
-            session.execute_write(self._ingest_batch_tx, graph_data)
+        async with self.driver.session() as session:
+            written, edges, diff = await session.execute_write(self._ingest_batch_tx, graph_data)
+
+        # Keep PageRank/degree (and the top-degree keywords) current without a full recomputation.
+        # Only what the transaction wrote: skipped relationships must not become phantom edges.
+        centrality_service.add([str(props["id"]) for _, _, props in written], edges)
+        centrality_service.set_names(batch_names(graph_data))
+        centrality_service.set_element_ids({str(props["id"]): eid for eid, _, props in written})
+        # A label or relationship type the graph did not have changes the Cypher cache's schema
+        query_cache.observe_schema({l for _, labels, _ in written for l in labels},
+                                   {link["type"] for link in diff["links"]})
+        # Cached chat answers built on the changed nodes are now stale
+        answer_cache.record_write(*written_items({"nodes": diff["nodes"], "relationships": diff["links"]}))
+        # Local fallback for entity resolution (the Neo4j full-text index updates itself)
+        # and the vector index seeding hybrid retrieval
+        for eid, labels, props in written:
+            entity_index.add(eid, labels, props)
+            vector_index.add(eid, labels, props)
+        print(f"[Neo4jIngestor] Diff: {len(diff['nodes'])} nodes, {len(diff['links'])} relationships created or changed.")
+        return diff
 
-    def _ingest_batch_tx(self, tx, data):
-        # 1. Create Nodes and map extracted IDs to them
-        # We'll just set the 'temp_id' property on nodes to match them, then remove it? 
-        # Or just match by properties like Name for Person/Org.
+    async def _ingest_batch_tx(self, tx, data):
+        # 1. Create Nodes and map extracted IDs to their element ids
+        # Returns (elementId, labels, props) per written node for the entity index,
+        # the (source, target) extracted ids of the relationships written, and the diff.
         
+        written = []
+        edges = []
+        element_ids = {} # extracted id -> elementId, for the relationships
+        diff = {"nodes": [], "links": []}
         for node in data.get("nodes", []):
             lbl = node["label"]
             props = node.get("properties", {})
             nid = node["id"]
             layer = node.get("layer") # New: Extract layer info
             
-            # Add temp_id to props for matching
-            props["_temp_id"] = nid
-            
             # [ALIVE FIX] Ensure 'id' and 'name' are in properties for DB retention
             if "id" not in props: props["id"] = nid
             if "name" in node: props["name"] = node["name"]
@@ -171,8 +205,9 @@ class Neo4jIngestor:
                     # MERGE using ONLY Primary Label + Key
                     cypher = f"""
                     MERGE (n:{primary_label} {{{key_prop}: $props.{key_prop}}})
-                    ON CREATE SET n += $props{extra_labels_set}
-                    ON MATCH SET n += $props{extra_labels_set}
+                    ON CREATE SET n._created = true
+                    WITH n, properties(n) AS before
+                    SET n += $props{extra_labels_set}
                     """
             
             elif lbl == "Concept":
@@ -180,8 +215,9 @@ class Neo4jIngestor:
                     # Valid Concept MERGE
                     cypher = f"""
                     MERGE (n:Concept {{id: $props.id}})
-                    ON CREATE SET n += $props{extra_labels_set}
-                    ON MATCH SET n += $props{extra_labels_set}
+                    ON CREATE SET n._created = true
+                    WITH n, properties(n) AS before
+                    SET n += $props{extra_labels_set}
                     """
                 else:
                     full_labels = f":{primary_label}{extra_labels_colon}"
@@ -194,15 +230,23 @@ class Neo4jIngestor:
                 if "id" in props:
                      cypher = f"""
                      MERGE (n:{primary_label} {{id: $props.id}})
-                     ON CREATE SET n += $props{extra_labels_set}
-                     ON MATCH SET n += $props{extra_labels_set}
+                     ON CREATE SET n._created = true
+                     WITH n, properties(n) AS before
+                     SET n += $props{extra_labels_set}
                      """
                 else:
                      cypher = f"CREATE (n{full_labels}) SET n += $props"
             
-            tx.run(cypher, props=props)
+            result_clause = _merge_result("n", "$props") if "MERGE" in cypher else CREATE_RESULT
+            result = await tx.run(cypher + result_clause, props=props)
+            record = await result.single()
+            if record:
+                written.append((record["eid"], [l for l in (lbl, layer) if l], props))
+                element_ids[str(nid)] = record["eid"]
+                if record["changed"]:
+                    diff["nodes"].append({**node, "properties": props, "eid": record["eid"], **_diff_status(record, props)})
 
-        # 2. Create Relationships matching by _temp_id
+        # 2. Create Relationships between the element ids written above
         for rel in data.get("relationships", []):
             from_id = rel.get("source") or rel.get("from")
             to_id = rel.get("target") or rel.get("to")
@@ -212,16 +256,27 @@ class Neo4jIngestor:
             if not from_id or not to_id: continue
             rtype = str(rtype).upper().replace(" ", "_").replace("-", "_")
 
+            from_eid = element_ids.get(str(from_id))
+            to_eid = element_ids.get(str(to_id))
+            if not from_eid or not to_eid: continue
+
             cypher = f"""
-            MATCH (a), (b)
-            WHERE a._temp_id = $from_id AND b._temp_id = $to_id
+            MATCH (a) WHERE elementId(a) = $from_eid
+            MATCH (b) WHERE elementId(b) = $to_eid
             MERGE (a)-[r:{rtype}]->(b)
+            ON CREATE SET r._created = true
+            WITH r, properties(r) AS before
             SET r += $rprops
             """
-            tx.run(cypher, from_id=str(from_id), to_id=str(to_id), rprops=rprops)
+            result = await tx.run(cypher + _merge_result("r", "$rprops"), from_eid=from_eid, to_eid=to_eid, rprops=rprops)
+            record = await result.single()
+            if record:
+                edges.append((str(from_id), str(to_id)))
+            if record and record["changed"]:
+                diff["links"].append({"source": from_id, "target": to_id, "name": rtype, "type": rtype,
+                                      **_diff_status(record, rprops)})
         
-        # 3. Cleanup _temp_id
-        tx.run("MATCH (n) WHERE n._temp_id IS NOT NULL REMOVE n._temp_id")
+        return written, edges, diff
 
 if __name__ == "__main__":
     # Test
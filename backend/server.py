@@ -1,11 +1,14 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Query
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 import uvicorn
 import os
 import io
 import json
+import re
+import asyncio
 from pypdf import PdfReader
 from dotenv import load_dotenv
 
@@ -15,10 +18,20 @@ from parser.file_loader import load_file_content
 from agent.classifier import classify_and_extract
 from parser.ingest import Neo4jIngestor
 from parser.web_search import perform_web_search
-from analysis.network_stats import enrich_graph_data, filter_connected_component
+from analysis.worker_pool import enrich_view_async, filter_view_async, layout_view_async, seed_groups, warm_up, shutdown_pool
+from analysis.network_stats import apply_centrality, personalized_centrality, top_by_centrality
+from analysis.graph_view import GraphView
+from analysis.incremental_pagerank import centrality_service
+from analysis.materialize import AnalyticsMaterializer, ELEMENT_IDS_QUERY
 from graphrag.retriever import GraphRetriever
-from graphrag.answer_gen import generate_answer
-from neo4j import GraphDatabase
+from graphrag.intent_router import router_stats
+from graphrag.answer_cache import answer_cache
+from graphrag.query_cache import query_cache
+from graphrag.entity_index import entity_index
+from graphrag.vector_index import vector_index
+from graphrag.answer_gen import generate_answer, stream_answer
+from database.pool import neo4j_pool, URI
+from database.transactions import fetch_all, fetch_single, consume
 
 
 # Load Env
@@ -31,6 +44,7 @@ class ChatRequest(BaseModel):
 class ChatResponse(BaseModel):
     answer: str
     context: Optional[str] = None
+    context_tokens: int = 0
     nodes_created: int = 0
 
 class IngestRequest(BaseModel):
@@ -57,21 +71,104 @@ app.add_middleware(
 )
 
 # --- Neo4j Config ---
-URI = os.getenv("NEO4J_URI", "neo4j+s://1a1d8907.databases.neo4j.io")
-
 # [ALIVE DEBUG] Log URI during startup
 print(f"[Neo4j] Using URI: {URI}")
 
-AUTH = (os.getenv("NEO4J_USERNAME"), os.getenv("NEO4J_PASSWORD"))
-
-# Global Driver for efficiency and stability
+# Global Async Driver: every handler awaits its Cypher round trips so the
+# event loop keeps serving other requests while one waits on Aura.
+# It is the process-wide pooled driver, passed to every component that queries Neo4j.
 driver = None
 try:
-    driver = GraphDatabase.driver(URI, auth=AUTH)
-    print("[Neo4j] Driver initialized.")
+    driver = neo4j_pool.get_driver()
+    print("[Neo4j] Async driver initialized.")
 except Exception as e:
     print(f"[Neo4j] Driver initialization FAILED: {e}")
 
+@app.on_event("startup")
+async def start_analytics_pool():
+    # Graph analytics (PageRank, communities) run in worker processes, off the event loop
+    await warm_up()
+    asyncio.create_task(bootstrap_centrality())
+    asyncio.create_task(bootstrap_entity_index())
+    asyncio.create_task(bootstrap_schema())
+    # Web-search driven graph evolution; results go to the /graph/changes feed.
+    # Trigger-only (POST /graph/update) unless EVOLUTION_INTERVAL enables periodic cycles.
+    asyncio.create_task(evolution_scheduler.run_forever(driver))
+
+@app.on_event("shutdown")
+async def close_driver():
+    await neo4j_pool.close()
+    shutdown_pool()
+
+# --- Incremental Centrality Bootstrap ---
+
+CENTRALITY_NODES_QUERY = """
+MATCH (n)
+RETURN coalesce(n.id, elementId(n)) AS id, elementId(n) AS eid, n.community AS community, n.name AS name
+"""
+CENTRALITY_EDGES_QUERY = """
+MATCH (a)-[]->(b)
+RETURN coalesce(a.id, elementId(a)) AS a, coalesce(b.id, elementId(b)) AS b
+"""
+
+async def bootstrap_centrality():
+    """
+    Loads the full graph once; ingestion keeps the PageRank service current afterwards.
+    Then starts the job that materializes the analytics onto the nodes.
+    """
+    try:
+        # Batches ingested while the graph is read and loaded are replayed onto it
+        centrality_service.track_changes()
+        async with driver.session() as session:
+            node_records = await session.execute_read(fetch_all, CENTRALITY_NODES_QUERY)
+            edge_records = await session.execute_read(fetch_all, CENTRALITY_EDGES_QUERY)
+        # Full power iteration; off the event loop
+        await asyncio.to_thread(centrality_service.load, [r["id"] for r in node_records],
+                                [(r["a"], r["b"]) for r in edge_records])
+        centrality_service.set_names({r["id"]: r["name"] for r in node_records})
+        centrality_service.set_element_ids({r["id"]: r["eid"] for r in node_records})
+        # Persisted communities keep group colors stable across restarts
+        seed_groups({r["id"]: r["community"] for r in node_records if r["community"] is not None})
+        print(f"[Centrality] Loaded {len(node_records)} nodes, {len(edge_records)} edges.")
+    except Exception as e:
+        centrality_service.discard_changes()
+        print(f"[Centrality] Bootstrap failed, /graph falls back to per-request PageRank: {e}")
+        return
+    # Write pagerank/degree/community back onto the nodes for Cypher consumers
+    asyncio.create_task(AnalyticsMaterializer(driver).run_forever())
+
+async def bootstrap_entity_index():
+    """
+    Local BM25 fallback for entity resolution when the full-text index is missing, and the
+    vector index behind hybrid retrieval (embedded off the event loop).
+    """
+    # Nodes ingested or deleted while the records are read and embedded are replayed onto the index
+    vector_index.track_changes()
+    try:
+        records = await entity_index.bootstrap(driver)
+    except Exception as e:
+        vector_index.discard_changes()
+        print(f"[EntityIndex] Bootstrap failed, resolution relies on the full-text index: {e}")
+        return
+    await asyncio.to_thread(vector_index.load, records)
+    print(f"[VectorIndex] Embedded {vector_index.size} nodes.")
+
+# --- Cypher Cache Schema ---
+
+SCHEMA_LABELS_QUERY = "CALL db.labels() YIELD label RETURN collect(label) AS labels"
+SCHEMA_TYPES_QUERY = "CALL db.relationshipTypes() YIELD relationshipType RETURN collect(relationshipType) AS types"
+
+async def bootstrap_schema():
+    """Labels and relationship types in the graph, for the Cypher cache's schema version."""
+    try:
+        async with driver.session() as session:
+            labels = await session.execute_read(fetch_single, SCHEMA_LABELS_QUERY)
+            types = await session.execute_read(fetch_single, SCHEMA_TYPES_QUERY)
+        query_cache.set_schema(labels["labels"], types["types"])
+        print(f"[CypherCache] Schema: {len(labels['labels'])} labels, {len(types['types'])} relationship types.")
+    except Exception as e:
+        print(f"[CypherCache] Schema snapshot failed, ingestion still tracks new labels: {e}")
+
 # --- Endpoints ---
 
 @app.get("/graph", response_model=GraphData)
@@ -92,13 +189,12 @@ async def get_graph():
     LIMIT 500
     """
     
-    nodes_map = {}
-    links = []
+    view = GraphView()
     
     try:
-        with driver.session() as session:
-            result = session.run(query)
-            for record in result:
+        async with driver.session() as session:
+            records = await session.execute_read(fetch_all, query)
+            for record in records:
                 n = record["n"]
                 m = record["m"]
                 r = record["r"]
@@ -110,141 +206,439 @@ async def get_graph():
                     return props.get('id') or (node.element_id if hasattr(node, "element_id") else str(node.id))
 
                 n_id = get_node_id(n)
-                n_label = list(n.labels)[0] if n.labels else "Unknown"
                 
-                if n_id not in nodes_map:
-                    nodes_map[n_id] = {
+                if n_id not in view:
+                    view.add_node(n_id, {
                         "id": n_id,
-                        "label": n_label, 
+                        "label": list(n.labels)[0] if n.labels else "Unknown", 
                         "layer": n.get("layer"), 
                         "name": n.get("name") or n.get("summary") or n.get("topic") or n_id,
                         "val": 1,
                         **dict(n)
-                    }
-                    # Ensure property 'id' doesn't fight with our chosen 'id'
-                    nodes_map[n_id]["id"] = n_id
+                    })
                 
                 # Process M and R only if they exist
                 if m and r is not None:
                     m_id = get_node_id(m)
-                    m_label = list(m.labels)[0] if m.labels else "Unknown"
 
-                    if m_id not in nodes_map:
-                        nodes_map[m_id] = {
+                    if m_id not in view:
+                        view.add_node(m_id, {
                             "id": m_id,
-                            "label": m_label, 
+                            "label": list(m.labels)[0] if m.labels else "Unknown", 
                             "layer": m.get("layer"), 
                             "name": m.get("name") or m.get("summary") or m.get("topic") or m_id,
                             "val": 1,
                             **dict(m)
-                        }
-                        nodes_map[m_id]["id"] = m_id
+                        })
                         
                     # Links (Consistent IDs)
-                    links.append({
-                        "source": n_id,
-                        "target": m_id,
-                        "name": r.type
-                    })
+                    view.add_link(n_id, m_id, r.type)
                 
                 
         # Apply Network Analysis (Weight 'user/Me' as root for global view)
-        raw_nodes = list(nodes_map.values())
-        enriched_data = enrich_graph_data(raw_nodes, links, root_id="user")
+        # Global PageRank from the incremental service, when it covers every node
+        centrality = centrality_service.scores_for(view.ids)
+        # Layout runs next to the analytics jobs; both only write their own record fields
+        await asyncio.gather(
+            enrich_view_async(view, root_id="user", centrality=centrality),
+            layout_view_async(view),
+        )
+        enriched_data = view.to_payload()
                 
         return GraphData(nodes=enriched_data["nodes"], links=enriched_data["links"])
     except Exception as e:
         print(f"Graph Fetch Error: {e}")
         return GraphData(nodes=[], links=[])
 
+# --- Lazy Neighborhood Expansion ---
+
+# Each hop seeks frontier nodes by elementId and keeps only the top `fanout`
+# neighbors per node, ranked by stored centrality (degree as tie-breaker).
+# Degree is only counted for nodes the materializer has not reached yet.
+EXPAND_HOP_QUERY = """
+UNWIND $frontier AS fid
+MATCH (n) WHERE elementId(n) = fid
+MATCH (n)-[]-(m)
+WHERE NOT elementId(m) IN $visited
+WITH n, m, coalesce(m.pagerank, 0.0) AS score,
+     CASE WHEN m.degree IS NULL THEN COUNT { (m)--() } ELSE m.degree END AS degree
+ORDER BY score DESC, degree DESC
+WITH n, collect(DISTINCT {m: m, score: score, degree: degree})[..$fanout] AS top
+UNWIND top AS hit
+RETURN hit.m AS m, hit.score AS score, hit.degree AS degree
+"""
+
+# Induced edges among the expanded node set (bounded by max_nodes)
+EXPAND_EDGES_QUERY = """
+MATCH (a)-[r]->(b)
+WHERE elementId(a) IN $ids AND elementId(b) IN $ids
+RETURN elementId(a) AS a, elementId(b) AS b, type(r) AS type
+"""
+
+def _graph_node_id(node):
+    # Use 'id' property if exists (normalized string from extractor), else element_id
+    return dict(node).get('id') or node.element_id
+
+def _graph_node_payload(node) -> dict:
+    n_id = _graph_node_id(node)
+    payload = {
+        "id": n_id,
+        "label": list(node.labels)[0] if node.labels else "Unknown",
+        "layer": node.get("layer"),
+        "name": node.get("name") or node.get("summary") or node.get("topic") or n_id,
+        "val": 1,
+        **dict(node)
+    }
+    payload["id"] = n_id
+    return payload
+
+async def _seek_start(tx, element_id):
+    result = await tx.run("MATCH (start) WHERE elementId(start) = $eid RETURN start", eid=element_id)
+    record = await result.single()
+    return record["start"] if record else None
+
+async def _expand_tx(tx, node_id, label, depth, fanout, max_nodes):
+    # 1. Resolve start node by index only: (:Label {id}) seek when the label is known, the
+    #    elementId kept by the centrality service, node_id itself as an elementId, and
+    #    finally the per-label id indexes. Never a label-less {id} match (all-node scan).
+    start = None
+    if label:
+        result = await tx.run(f"MATCH (start:{label} {{id: $id}}) RETURN start LIMIT 1", id=node_id)
+        record = await result.single()
+        start = record["start"] if record else None
+    if start is None:
+        start = await _seek_start(tx, centrality_service.element_id(node_id) or node_id)
+    if start is None:
+        result = await tx.run(ELEMENT_IDS_QUERY, ids=[node_id])
+        records = await result.fetch(1)
+        start = await _seek_start(tx, records[0]["eid"]) if records else None
+    if start is None:
+        return None
+
+    hits = {start.element_id: {"node": start, "score": None, "degree": None, "hop": 0}}
+    frontier = [start.element_id]
+
+    # 2. Expand hop by hop with a per-node fan-out cap
+    for hop in range(1, depth + 1):
+        if not frontier or len(hits) >= max_nodes:
+            break
+        result = await tx.run(EXPAND_HOP_QUERY, frontier=frontier, visited=list(hits.keys()), fanout=fanout)
+        next_frontier = []
+        async for rec in result:
+            m = rec["m"]
+            if m.element_id in hits or len(hits) >= max_nodes:
+                continue
+            hits[m.element_id] = {"node": m, "score": rec["score"], "degree": rec["degree"], "hop": hop}
+            next_frontier.append(m.element_id)
+        frontier = next_frontier
+
+    # 3. Edges among the expanded nodes
+    result = await tx.run(EXPAND_EDGES_QUERY, ids=list(hits.keys()))
+    edges = [(rec["a"], rec["b"], rec["type"]) async for rec in result]
+    return hits, edges
+
+@app.get("/graph/expand", response_model=GraphData)
+async def expand_graph(
+    node_id: str,
+    depth: int = Query(1, ge=1, le=3),
+    fanout: int = Query(10, ge=1, le=50),
+    max_nodes: int = Query(200, ge=1, le=500),
+    label: Optional[str] = None,
+):
+    """
+    Returns the k-hop neighborhood of a node for lazy loading in the 3D view.
+    Each hop keeps at most `fanout` neighbors per node, ranked by stored centrality.
+    `node_id` is a graph payload id (the node's id property, else its elementId); pass the
+    node's `label` to seek it through the (:Label {id}) index directly. 404 when no index finds it.
+    """
+    if label and not re.match(r"^[A-Za-z0-9_]+$", label):
+        raise HTTPException(status_code=400, detail="Invalid label")
+    try:
+        async with driver.session() as session:
+            expanded = await session.execute_read(_expand_tx, node_id, label, depth, fanout, max_nodes)
+    except Exception as e:
+        print(f"Expand Error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if expanded is None:
+        raise HTTPException(status_code=404, detail="Node not found")
+
+    hits, edges = expanded
+    nodes_map = {}
+    id_of = {}
+    for element_id, hit in hits.items():
+        payload = _graph_node_payload(hit["node"])
+        payload["hop"] = hit["hop"]
+        nodes_map[payload["id"]] = payload
+        id_of[element_id] = payload["id"]
+
+    links = [{"source": id_of[a], "target": id_of[b], "name": rtype} for a, b, rtype in edges]
+
+    # Size by stored centrality; fall back to degree until pagerank is materialized
+    start_id = id_of[next(iter(hits))]
+    use_pagerank = any(hit["score"] for hit in hits.values())
+    scores = {
+        id_of[element_id]: (hit["score"] if use_pagerank else hit["degree"]) or 0.0
+        for element_id, hit in hits.items()
+    }
+    apply_centrality(nodes_map, scores, start_id)
+
+    ranked = sorted(nodes_map.values(), key=lambda n: (n["hop"] > 0, -n.get("centrality", 0.0)))
+    return GraphData(nodes=ranked, links=links)
+
+# --- Chat Pipeline ---
+# The user-context lookup, auto-ingestion and retrieval are independent, so they run
+# as concurrent stages; the answer only waits on retrieval (and on the interviewer when
+# there is no context). Each stage has its own timeout and falls back instead of failing.
+CHAT_CONTEXT_TIMEOUT = float(os.getenv("CHAT_CONTEXT_TIMEOUT", "5.0"))
+CHAT_INGEST_TIMEOUT = float(os.getenv("CHAT_INGEST_TIMEOUT", "30.0"))
+CHAT_RETRIEVAL_TIMEOUT = float(os.getenv("CHAT_RETRIEVAL_TIMEOUT", "30.0"))
+CHAT_ANSWER_TIMEOUT = float(os.getenv("CHAT_ANSWER_TIMEOUT", "60.0"))
+
+async def _stage(name: str, coro, timeout: float, fallback, timings: dict):
+    start = asyncio.get_running_loop().time()
+    try:
+        return await asyncio.wait_for(coro, timeout)
+    except asyncio.TimeoutError:
+        print(f"[Chat] Stage '{name}' timed out after {timeout}s, using fallback.")
+        return fallback
+    except Exception as e:
+        print(f"[Chat] Stage '{name}' failed, using fallback: {e}")
+        return fallback
+    finally:
+        timings[name] = asyncio.get_running_loop().time() - start
+
+async def _interviewer_stage():
+    """Next interviewer question from the user node and its neighbor label counts."""
+    # [ALIVE] active_interviewer Integration
+    from actions.interviewer import GenesisInterviewer
+    
+    # 1. Check User Context & Stats (Find "Me" node and neighbor counts)
+    user_node = None
+    graph_stats = {}
+    
+    async with driver.session() as session:
+        # Fetch User Node and all connected neighbor labels
+        query = """
+        MATCH (n:Person {source: 'user'})
+        OPTIONAL MATCH (n)-[]-(m)
+        RETURN n, collect(labels(m)) as neighbor_labels
+        LIMIT 1
+        """
+        record = await session.execute_read(fetch_single, query)
+        
+        if record:
+            user_node = dict(record["n"])
+            # Aggregate Stats (e.g., {'Event': 5, 'Skill': 2})
+            all_labels = [lbl for sublist in record["neighbor_labels"] for lbl in sublist]
+            for lbl in all_labels:
+                graph_stats[lbl] = graph_stats.get(lbl, 0) + 1
+
+    # 2. Determine Next Question (Genesis Logic)
+    interviewer = GenesisInterviewer()
+    return interviewer.determine_next_question(user_node, graph_stats)
+
+async def _ingest_stage(message: str) -> int:
+    """[ALIVE] Auto-Ingestion (Active Learning): saves knowledge from the message; returns nodes created."""
+    print(f"Auto-Ingesting Chat: {message}")
+    extracted_data = await asyncio.to_thread(extract_graph_elements, message)
+    
+    if not extracted_data.get("nodes"):
+        return 0
+    # Inject Identity Tags
+    for node in extracted_data["nodes"]:
+        if "properties" not in node: node["properties"] = {}
+        node["properties"]["source"] = "user"
+        node["properties"]["layer"] = node.get("layer", "Semantic")
+    
+    # Ingest to DB
+    ingestor = Neo4jIngestor(driver_override=driver)
+    await ingestor.ingest_batch(extracted_data)
+    # DO NOT CLOSE: global driver
+    print("Auto-Ingestion Complete.")
+    return len(extracted_data["nodes"])
+
+async def _retrieval_stage(message: str) -> tuple:
+    """(context, context_tokens, depends_on, llm_calls) from the graph; the last two feed the answer cache."""
+    retriever = GraphRetriever(driver)
+    context = await retriever.retrieve(message)
+    return context, retriever.context_tokens, retriever.depends_on, retriever.llm_calls
+
+# Stage tasks outlive the request on early returns; keep references so they finish
+_chat_tasks = set()
+
+def _track(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    _chat_tasks.add(task)
+    task.add_done_callback(_chat_tasks.discard)
+    return task
+
+def _start_chat_stages(message: str) -> dict:
+    timings = {}
+    # Shielded: a slow write finishes in the background instead of being cancelled mid-batch
+    ingest = _track(_ingest_stage(message))
+    return {
+        "timings": timings,
+        "interviewer": _track(_stage("interviewer", _interviewer_stage(), CHAT_CONTEXT_TIMEOUT, None, timings)),
+        "ingest": _track(_stage("ingest", asyncio.shield(ingest), CHAT_INGEST_TIMEOUT, 0, timings)),
+        "retrieval": _track(_stage("retrieval", _retrieval_stage(message), CHAT_RETRIEVAL_TIMEOUT, ("", 0, None, 0), timings)),
+    }
+
+def _log_timings(timings: dict):
+    print("[Chat] Stages: " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items()))
+
+ANSWER_FALLBACK = "I couldn't put an answer together in time. Please ask again."
+
+def _cache_answer(message: str, answer: str, retrieval: tuple, built_at: int):
+    context, context_tokens, depends_on, cypher_calls = retrieval
+    if not context or answer == ANSWER_FALLBACK or answer.startswith("Error generating answer"):
+        return
+    # A hit skips generate_cypher, generate_answer and the extraction of an already ingested message
+    answer_cache.store(message, context, answer, context_tokens, depends_on, built_at, cypher_calls + 2)
+
+async def _cached_followup() -> Optional[str]:
+    """Interviewer question for answers served from the cache; the rest of the pipeline is skipped."""
+    return await _stage("interviewer", _interviewer_stage(), CHAT_CONTEXT_TIMEOUT, None, {})
+
 @app.post("/chat", response_model=ChatResponse)
 async def chat_endpoint(req: ChatRequest):
     try:
-        # [ALIVE] active_interviewer Integration
-        from actions.interviewer import GenesisInterviewer
-        
-        # 1. Check User Context & Stats (Find "Me" node and neighbor counts)
-        user_node = None
-        graph_stats = {}
-        
-        with driver.session() as session:
-            # Fetch User Node and all connected neighbor labels
-            query = """
-            MATCH (n:Person {source: 'user'})
-            OPTIONAL MATCH (n)-[]-(m)
-            RETURN n, collect(labels(m)) as neighbor_labels
-            LIMIT 1
-            """
-            result = session.run(query)
-            record = result.single()
-            
-            if record:
-                user_node = dict(record["n"])
-                # Aggregate Stats (e.g., {'Event': 5, 'Skill': 2})
-                all_labels = [lbl for sublist in record["neighbor_labels"] for lbl in sublist]
-                for lbl in all_labels:
-                    graph_stats[lbl] = graph_stats.get(lbl, 0) + 1
-
-        # 2. Determine Next Question (Genesis Logic)
-        interviewer = GenesisInterviewer()
-        # If the user message is short/greeting, or if we want to force genesis flow:
-        # We can implement a more complex router. For now, if "User Node" is weak, override.
-        
-        next_q = interviewer.determine_next_question(user_node, graph_stats)
-        
-        # Simple Logic: If user is just answering or starting, and we have a burning question, pre-pend it or just return it?
-        # Let's combine Retrieval + Active Question.
-        
-        # [ALIVE] Auto-Ingestion (Active Learning)
-        # Extract and save knowledge from user's message immediately
-        extracted_data = {}
-        try:
-            print(f"Auto-Ingesting Chat: {req.message}")
-            extracted_data = extract_graph_elements(req.message)
-            
-            if extracted_data.get("nodes"):
-                # Inject Identity Tags
-                for node in extracted_data["nodes"]:
-                    if "properties" not in node: node["properties"] = {}
-                    node["properties"]["source"] = "user"
-                    node["properties"]["layer"] = node.get("layer", "Semantic")
-                
-                # Ingest to DB
-                ingestor = Neo4jIngestor(driver_override=driver)
-                ingestor.ingest_batch(extracted_data)
-                # DO NOT CLOSE: global driver
-                print("Auto-Ingestion Complete.")
-        except Exception as ingest_err:
-            print(f"Auto-Ingest Warning: {ingest_err}")
-
-        retriever = GraphRetriever()
-        context = retriever.retrieve(req.message)
-        # retriever.close() # Keep driver alive
+        cached = answer_cache.lookup(req.message)
+        if cached is not None:
+            next_q = await _cached_followup()
+            answer = cached.answer + (f"\n\n(Interviewer): {next_q}" if next_q else "")
+            return ChatResponse(answer=answer, context=cached.context, context_tokens=cached.context_tokens)
+
+        built_at = answer_cache.version()
+        stages = _start_chat_stages(req.message)
+        retrieval = await stages["retrieval"]
+        context, context_tokens = retrieval[:2]
         
         # If context is empty and we are in genesis phase, just ask the question.
-        if not context and next_q:
-             return ChatResponse(answer=next_q, context="Genesis Mode: Initializing Identity")
+        if not context:
+            next_q = await stages["interviewer"]
+            if next_q:
+                return ChatResponse(answer=next_q, context="Genesis Mode: Initializing Identity")
 
-        answer = generate_answer(req.message, context)
+        answer = await _stage("answer", asyncio.to_thread(generate_answer, req.message, context),
+                              CHAT_ANSWER_TIMEOUT, ANSWER_FALLBACK, stages["timings"])
+        _cache_answer(req.message, answer, retrieval, built_at)
+        next_q = await stages["interviewer"]
         
         # Post-pend the active question to keep the flow moving
         if next_q:
             answer += f"\n\n(Interviewer): {next_q}"
 
-        return ChatResponse(answer=answer, context=context, nodes_created=len(extracted_data.get("nodes", [])))
+        nodes_created = await stages["ingest"]
+        _log_timings(stages["timings"])
+        return ChatResponse(answer=answer, context=context, context_tokens=context_tokens, nodes_created=nodes_created)
     except Exception as e:
         print(f"Chat Error: {e}")
         # Build a safe fallback response
         return ChatResponse(answer="I am listening. Tell me more about yourself.", context="Error Fallback", nodes_created=0)
 
+async def _with_deadline(chunks, timeout: float):
+    """Re-yields an async iterator; raises asyncio.TimeoutError when the next item takes longer than timeout."""
+    iterator = chunks.__aiter__()
+    try:
+        while True:
+            try:
+                yield await asyncio.wait_for(iterator.__anext__(), timeout)
+            except StopAsyncIteration:
+                return
+    finally:
+        await iterator.aclose()
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@app.post("/chat/stream")
+async def chat_stream_endpoint(req: ChatRequest):
+    """
+    /chat as Server-Sent Events:
+    - context: retrieval metadata (context, context_tokens)
+    - token: answer text chunks as Gemini produces them
+    - question: the interviewer's follow-up, if any
+    - done: nodes_created by auto-ingestion
+    - error: fallback message, also when the answer stream stalls past CHAT_ANSWER_TIMEOUT
+    """
+    async def events():
+        try:
+            cached = answer_cache.lookup(req.message)
+            if cached is not None:
+                yield _sse("context", {"context": cached.context, "context_tokens": cached.context_tokens})
+                yield _sse("token", {"text": cached.answer})
+                next_q = await _cached_followup()
+                if next_q:
+                    yield _sse("question", {"question": next_q})
+                yield _sse("done", {"nodes_created": 0})
+                return
+
+            built_at = answer_cache.version()
+            stages = _start_chat_stages(req.message)
+            retrieval = await stages["retrieval"]
+            context, context_tokens = retrieval[:2]
+            if not context:
+                next_q = await stages["interviewer"]
+                if next_q:
+                    yield _sse("context", {"context": "Genesis Mode: Initializing Identity", "context_tokens": 0})
+                    yield _sse("question", {"question": next_q})
+                    yield _sse("done", {"nodes_created": await stages["ingest"]})
+                    return
+            yield _sse("context", {"context": context, "context_tokens": context_tokens})
+
+            chunks = []
+            try:
+                # Same deadline as /chat, applied to the first chunk and to every gap between chunks
+                async for chunk in _with_deadline(stream_answer(req.message, context), CHAT_ANSWER_TIMEOUT):
+                    chunks.append(chunk)
+                    yield _sse("token", {"text": chunk})
+            except asyncio.TimeoutError:
+                print(f"[Chat] Answer stream stalled for {CHAT_ANSWER_TIMEOUT}s after {len(chunks)} chunks.")
+                yield _sse("error", {"message": ANSWER_FALLBACK})
+                return
+            except Exception as e:
+                print(f"[Chat] Answer stream failed after {len(chunks)} chunks: {e}")
+                yield _sse("error", {"message": f"Error generating answer: {e}"})
+                return
+            # Only reached when the stream finished cleanly, so no partial answer is cached
+            _cache_answer(req.message, "".join(chunks), retrieval, built_at)
+            next_q = await stages["interviewer"]
+            if next_q:
+                yield _sse("question", {"question": next_q})
+            yield _sse("done", {"nodes_created": await stages["ingest"]})
+            _log_timings(stages["timings"])
+        except Exception as e:
+            print(f"Chat Stream Error: {e}")
+            yield _sse("error", {"message": "I am listening. Tell me more about yourself."})
+
+    # No proxy buffering, so tokens reach the client as they are produced
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/chat/router-stats")
+async def chat_router_stats():
+    """Local intent router hit rate and estimated LLM latency saved."""
+    return router_stats.summary()
+
+@app.get("/chat/cache-stats")
+async def chat_cache_stats():
+    """Answer cache hits and the LLM calls they avoided."""
+    return answer_cache.stats()
+
+@app.get("/db/pool-stats")
+async def db_pool_stats():
+    """Connection pool utilization of the shared Neo4j driver."""
+    return neo4j_pool.stats()
+
 @app.post("/ingest")
 async def ingest_endpoint(req: IngestRequest):
     """General Text Ingestion"""
     try:
-        graph_data = extract_graph_elements(req.text)
+        # Gemini extraction blocks for seconds; keep it off the event loop
+        graph_data = await asyncio.to_thread(extract_graph_elements, req.text)
         if graph_data.get("nodes"):
             ingestor = Neo4jIngestor(driver_override=driver)
-            ingestor.ingest_batch(graph_data)
+            await ingestor.ingest_batch(graph_data)
             return {"status": "success", "message": "Data ingested successfully.", "data": graph_data}
         else:
             return {"status": "warning", "message": "No entities extracted."}
@@ -255,8 +649,12 @@ async def ingest_endpoint(req: IngestRequest):
 async def reset_graph():
     """Resets the entire database"""
     try:
-        with driver.session() as session:
-            session.run("MATCH (n) DETACH DELETE n")
+        async with driver.session() as session:
+            await session.execute_write(consume, "MATCH (n) DETACH DELETE n")
+        centrality_service.load([], [])
+        answer_cache.clear()
+        entity_index.load([])
+        vector_index.clear()
         return {"status": "success", "message": "Graph database reset successfully."}
     except Exception as e:
         print(f"Reset Error: {e}")
@@ -297,13 +695,30 @@ async def ingest_auth_profile(req: AuthIngestRequest):
             "relationships": []
         }
         
-        ingestor.ingest_batch(graph_data)
+        await ingestor.ingest_batch(graph_data)
         
         return {"status": "success", "message": "Auth profile ingested."}
     except Exception as e:
         print(f"Auth Ingest Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+SEARCH_NEIGHBORHOOD_QUERY = """
+MATCH (start) WHERE elementId(start) IN $eids
+MATCH (start)-[r]-(neighbor)
+RETURN start, r, neighbor
+LIMIT 500
+"""
+
+SEARCH_NEIGHBORHOOD_SCAN_QUERY = """
+MATCH (start)
+WHERE start.id = $norm_keyword
+   OR toLower(start.name) = toLower($keyword)
+   OR toLower(start.name) CONTAINS toLower($keyword)
+MATCH (start)-[r]-(neighbor)
+RETURN start, r, neighbor
+LIMIT 500
+"""
+
 @app.post("/ingest/search")
 async def ingest_search_endpoint(req: IngestRequest):
     """Concept Ingestion (Web Search + Ontology Build)"""
@@ -311,12 +726,12 @@ async def ingest_search_endpoint(req: IngestRequest):
         keyword = req.text
         print(f"Starting Concept Ingestion for: {keyword}")
         
-        # 1. Perform Web Search
-        search_context = perform_web_search(keyword)
+        # 1. Perform Web Search (DuckDuckGo and Gemini calls block, so both run in threads)
+        search_context = await asyncio.to_thread(perform_web_search, keyword)
         # print(f"Web Search Context Length: {len(search_context)}")
         
         # 2. Extract Ontology from Context
-        extracted_data = extract_concept_graph(keyword, search_context)
+        extracted_data = await asyncio.to_thread(extract_concept_graph, keyword, search_context)
         # print(f"Extracted Nodes: {len(extracted_data.get('nodes', []))}")
         
         # 3. Inject Source & Format Subgraph
@@ -334,31 +749,30 @@ async def ingest_search_endpoint(req: IngestRequest):
             
         print(f"Ingesting {len(nodes)} nodes and {len(relationships)} relationships into Neo4j...")
         ingestor = Neo4jIngestor(driver_override=driver)
-        ingestor.ingest_batch(extracted_data)
+        await ingestor.ingest_batch(extracted_data)
 
         # 5. Retrieve Combined Graph (AI + User Data)
-        nodes_map = {}
-        links = []
+        # One view per request, shared by root resolution, analytics and filtering
+        view = GraphView()
         
         # [ALIVE FIX] Precise neighborhood fetch.
-        # Prioritize exact ID match, then fall back to flexible name match.
+        # The keyword is resolved to start nodes through the entity index first, so the
+        # neighborhood query seeks by elementId. The name scan only runs when no index
+        # could answer (full-text index missing and local index not loaded yet).
         normalized_keyword = keyword.lower().strip().replace(" ", "_")
-        query = """
-        MATCH (start)
-        WHERE start.id = $norm_keyword 
-           OR toLower(start.name) = toLower($keyword)
-           OR toLower(start.name) CONTAINS toLower($keyword)
-        
-        MATCH (start)-[r]-(neighbor)
-        RETURN start, r, neighbor
-        LIMIT 500
-        """
+        matches = await entity_index.resolve(driver, keyword)
+        if matches is not None:
+            query = SEARCH_NEIGHBORHOOD_QUERY
+            params = {"eids": [m["eid"] for m in matches]}
+        else:
+            query = SEARCH_NEIGHBORHOOD_SCAN_QUERY
+            params = {"keyword": keyword, "norm_keyword": normalized_keyword}
         
-        print(f"[Search] Fetching neighborhood for: {keyword} (normalized: {normalized_keyword})")
-        with driver.session() as session:
-            result = session.run(query, keyword=keyword, norm_keyword=normalized_keyword)
-            # Use list() to avoid issues with double iteration or session closing
-            records = list(result)
+        print(f"[Search] Fetching neighborhood for: {keyword} (normalized: {normalized_keyword}, "
+              f"{'scan' if matches is None else f'{len(matches)} indexed start nodes'})")
+        async with driver.session() as session:
+            # Records are fully materialized inside the read transaction
+            records = await session.execute_read(fetch_all, query, **params)
             print(f"[Search] DB Query returned {len(records)} records.")
             
             def get_node_id(node):
@@ -376,17 +790,15 @@ async def ingest_search_endpoint(req: IngestRequest):
                 s_id = get_node_id(s)
                 n_id = get_node_id(neighbor)
                 
-                # Add nodes to map
+                # Add nodes to the view (first occurrence wins, id re-enforced by add_node)
                 for node, nid in [(s, s_id), (neighbor, n_id)]:
-                    if nid not in nodes_map:
-                        nodes_map[nid] = {
+                    if nid not in view:
+                        view.add_node(nid, {
                             "id": nid,
                             "label": list(node.labels)[0] if node.labels else "Concept",
                             "val": 1,
                             **dict(node)
-                        }
-                        # Re-enforce ID consistency
-                        nodes_map[nid]["id"] = nid
+                        })
 
                 # Add link (Only if r exists and is valid)
                 r_type = ""
@@ -396,20 +808,21 @@ async def ingest_search_endpoint(req: IngestRequest):
                 except:
                     pass
                 
-                links.append({
-                    "source": s_id,
-                    "target": n_id,
-                    "name": r_type
-                })
+                view.add_link(s_id, n_id, r_type)
         
-        # 6. Apply Network Analysis (Force Keyword as Root)
-        raw_nodes = list(nodes_map.values())
-        enriched_data = enrich_graph_data(raw_nodes, links, root_id=keyword)
+        # 6. Apply Network Analysis: personalized PageRank from the keyword's root
+        # (local push, cost bounded by the tolerance) sizes and truncates the neighborhood
+        root_idx = view.resolve_root(keyword)
+        adjacency = centrality_service.adj if centrality_service.ready else None
+        centrality = personalized_centrality(view, root_idx, adjacency)
+        if centrality is not None:
+            view = view.subgraph(top_by_centrality(view, centrality, root_idx))
+        await enrich_view_async(view, root_id=keyword, centrality=centrality)
         
         # 7. [ALIVE] Filter for Connected Component containing root
         # CRITICAL FIX: root_id must be normalized to match the IDs in nodes/links
         normalized_root_id = keyword.lower().strip().replace(" ", "_")
-        final_data = filter_connected_component(enriched_data["nodes"], enriched_data["links"], root_id=normalized_root_id)
+        final_data = await filter_view_async(view, root_id=normalized_root_id)
         
         return {
             "status": "success", 
@@ -460,7 +873,7 @@ async def ingest_file_endpoint(file: UploadFile = File(...)):
             "nodes": nodes,
             "relationships": relationships
         }
-        ingestor.ingest_batch(final_data)
+        await ingestor.ingest_batch(final_data)
         # DO NOT CLOSE: global driver
         
         return {
@@ -476,8 +889,8 @@ async def ingest_file_endpoint(file: UploadFile = File(...)):
 
 
 # Dynamic Evolution Imports
-from dynamic.fetcher import fetch_dynamic_content
-from dynamic.merger import merge_dynamic_data
+from dynamic.scheduler import evolution_scheduler
+from agent.interviewer import ActiveInterviewer
 
 class UpdateNodeRequest(BaseModel):
     id: str  # element_id or normalized id
@@ -495,7 +908,7 @@ class DeleteNodeRequest(BaseModel):
 @app.post("/api/node/update")
 async def update_node(req: UpdateNodeRequest):
     try:
-        with driver.session() as session:
+        async with driver.session() as session:
             # Check if it's an elementId or our property id
             # We'll try both for safety
             query = """
@@ -504,102 +917,127 @@ async def update_node(req: UpdateNodeRequest):
             SET n += $props
             RETURN n
             """
-            result = session.run(query, id=req.id, props=req.properties)
-            record = result.single()
+            record = await session.execute_write(fetch_single, query, id=req.id, props=req.properties)
             if not record:
                 raise HTTPException(status_code=404, detail="Node not found")
-            return {"status": "success", "message": "Node updated"}
+        node = record["n"]
+        centrality_service.set_names({node.get("id") or node.element_id: node.get("name")})
+        # Renamed or re-summarized nodes must resolve by their new text only
+        entity_index.add(node.element_id, list(node.labels), dict(node))
+        vector_index.add(node.element_id, list(node.labels), dict(node))
+        # Manual edits can rename nodes, so cached answers may refer to either name
+        answer_cache.clear()
+        return {"status": "success", "message": "Node updated"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/node/add")
 async def add_node_manual(req: AddNodeRequest):
     try:
-        with driver.session() as session:
-            # 1. Create Node
-            # We'll generate a normalized ID from the name
-            normalized_id = req.name.lower().strip().replace(" ", "_")
-            
+        # 1. Create Node
+        # We'll generate a normalized ID from the name
+        normalized_id = req.name.lower().strip().replace(" ", "_")
+        props = {
+            "id": normalized_id,
+            "name": req.name,
+            "layer": req.layer,
+            "source": "user",
+            "creation_date": "2025-12-29" # Should be dynamic ideally
+        }
+
+        async def _add_node_tx(tx):
             # Step 1: Create the node
             query = """
             MERGE (n:Concept {id: $id})
             ON CREATE SET n += $props
             ON MATCH SET n += $props
-            RETURN n
+            RETURN elementId(n) AS eid, labels(n) AS labels, properties(n) AS props
             """
-            props = {
-                "id": normalized_id,
-                "name": req.name,
-                "layer": req.layer,
-                "source": "user",
-                "creation_date": "2025-12-29" # Should be dynamic ideally
-            }
-            session.run(query, id=normalized_id, props=props)
+            result = await tx.run(query, id=normalized_id, props=props)
+            node = await result.single()
+            eid = node["eid"]
 
             # Step 2: Link to parent if provided
+            parent_ids = []
             if req.parent_id:
+                # The parent may be given by elementId or id property; report the id the
+                # in-process indexes key it by (coalesce(n.id, elementId(n)))
                 link_query = """
                 MATCH (a), (b)
                 WHERE (elementId(a) = $pid OR a.id = $pid)
-                  AND (elementId(b) = $cid OR b.id = $cid)
+                  AND elementId(b) = $eid
                 MERGE (a)-[r:RELATED]->(b)
-                RETURN r
+                RETURN coalesce(a.id, elementId(a)) AS pid, elementId(a) AS peid
                 """
-                session.run(link_query, pid=req.parent_id, cid=normalized_id)
+                result = await tx.run(link_query, pid=req.parent_id, eid=eid)
+                parent_ids = [(rec["pid"], rec["peid"]) async for rec in result]
+            return node, parent_ids
+
+        async with driver.session() as session:
+            # Node and parent link are committed together in one managed transaction
+            node, parent_ids = await session.execute_write(_add_node_tx)
+        eid = node["eid"]
+        # Only parents the MATCH found get an edge, keyed like every other node in the service
+        centrality_service.add([normalized_id], [(pid, normalized_id) for pid, _ in parent_ids])
+        centrality_service.set_names({normalized_id: req.name})
+        centrality_service.set_element_ids({normalized_id: eid, **dict(parent_ids)})
+        query_cache.observe_schema(["Concept"], ["RELATED"] if parent_ids else [])
+        # An existing node keeps its other labels and text, so index what the MERGE returned
+        entity_index.add(eid, node["labels"], node["props"])
+        vector_index.add(eid, node["labels"], node["props"])
+        answer_cache.record_write(["Concept", req.layer, "RELATED"], [normalized_id, req.name] + ([req.parent_id] if req.parent_id else []) + [pid for pid, _ in parent_ids])
 
-            return {"status": "success", "message": "Node added", "node_id": normalized_id}
+        return {"status": "success", "message": "Node added", "node_id": normalized_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/node/delete")
 async def delete_node_manual(req: DeleteNodeRequest):
     try:
-        with driver.session() as session:
+        async with driver.session() as session:
             query = """
             MATCH (n)
             WHERE elementId(n) = $id OR n.id = $id
+            WITH n, coalesce(n.id, elementId(n)) AS id, elementId(n) AS eid
             DETACH DELETE n
+            RETURN id, eid
             """
-            session.run(query, id=req.id)
-            return {"status": "success", "message": "Node deleted"}
+            records = await session.execute_write(fetch_all, query, id=req.id)
+        # The request id may be either key; each index uses its own
+        for r in records:
+            centrality_service.remove_node(r["id"])
+            entity_index.remove(r["eid"])
+            vector_index.remove(r["eid"])
+        answer_cache.clear()
+        return {"status": "success", "message": "Node deleted"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/graph/update")
 async def update_graph_dynamic():
     """
-    Triggers real-time evolution of the graph.
-    1. Fetches latest news/trends based on current graph state.
-    2. Extracts and merges new nodes.
-    3. Returns the 'Diff' for visualization.
+    Triggers real-time evolution of the graph in the background scheduler.
+    1. Picks central topics not searched recently and fetches news/trends for them.
+    2. Extracts and merges new nodes in one bulk write.
+    3. Publishes the 'Diff' on GET /graph/changes (poll with since=<seq returned here>).
     """
-    try:
-        print("Starting Dynamic Graph Update...")
-        # 1. Fetch
-        context, query = fetch_dynamic_content()
-        if not context or "No search results" in context:
-            return {"status": "warning", "message": "No new information found."}
-        
-        # 2. Merge
-        diff_graph = merge_dynamic_data(query, context)
-        
-        return {
-            "status": "success",
-            "message": f"Graph updated with insights on '{query}'",
-            "diff": diff_graph,
-            "query": query
-        }
+    evolution_scheduler.trigger()
+    return {
+        "status": "scheduled",
+        "message": "Graph update started; poll /graph/changes for the diff.",
+        "since": evolution_scheduler.seq,
+    }
 
-    except Exception as e:
-        print(f"Update Error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+@app.get("/graph/changes")
+async def graph_changes(since: int = Query(0, ge=0)):
+    """Diffs of the evolution cycles finished after `since`."""
+    return evolution_scheduler.changes_since(since)
 
 @app.post("/interviewer/trigger")
 async def trigger_interviewer():
     try:
-        agent = ActiveInterviewer()
-        question = agent.get_proactive_question()
-        agent.close()
+        agent = ActiveInterviewer(driver)
+        question = await agent.get_proactive_question()
         return {"question": question, "role": "agent"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
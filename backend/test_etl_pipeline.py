@@ -1,8 +1,17 @@
 import sys
 import os
 import json
+import asyncio
 from parser.extractor import extract_graph_elements
 from parser.ingest import Neo4jIngestor
+from database.pool import neo4j_pool
+
+async def _ingest(data):
+    ingestor = Neo4jIngestor()
+    try:
+        await ingestor.ingest_batch(data)
+    finally:
+        await neo4j_pool.close()
 
 def run_test_pipeline():
     print("--- 1. Testing Extraction (OpenAI) ---")
@@ -22,9 +31,7 @@ def run_test_pipeline():
 
     print("\n--- 2. Testing Ingestion (Neo4j) ---")
     try:
-        ingestor = Neo4jIngestor()
-        ingestor.ingest_batch(data)
-        ingestor.close()
+        asyncio.run(_ingest(data))
         print("Ingestion completed successfully!")
     except Exception as e:
         print(f"Ingestion failed: {e}")
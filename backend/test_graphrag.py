@@ -1,7 +1,9 @@
+import asyncio
 from graphrag.retriever import GraphRetriever
 from graphrag.answer_gen import generate_answer
+from database.pool import neo4j_pool
 
-def run_graphrag_test():
+async def run_graphrag_test():
     retriever = GraphRetriever()
     
     questions = [
@@ -16,14 +18,14 @@ def run_graphrag_test():
         print(f"\n[Q]: {q}")
         
         # 1. Retrieve
-        context = retriever.retrieve(q)
+        context = await retriever.retrieve(q)
         print(f"[Context]: {context[:100]}...") # Truncate log
         
         # 2. Generate Answer
         answer = generate_answer(q, context)
         print(f"[A]: {answer}")
         
-    retriever.close()
+    await neo4j_pool.close()
 
 if __name__ == "__main__":
-    run_graphrag_test()
+    asyncio.run(run_graphrag_test())
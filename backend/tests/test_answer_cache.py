@@ -0,0 +1,64 @@
+from graphrag.answer_cache import AnswerCache, dependencies, written_items
+
+ANCHORED = "MATCH (p:Person {name: 'Jinsu'})-[:WORKS_AT]->(o:Organization) RETURN o"
+UNANCHORED = "MATCH (p:Person)-[:HAS_SKILL]->(s:Skill) RETURN p.name, s.name"
+
+def _store(cache: AnswerCache, question: str, cypher: str, rows=None, built_at=None):
+    cache.store(question, "context", "answer", 10, dependencies(cypher, rows=rows),
+                cache.version() if built_at is None else built_at, llm_calls=2)
+
+def _ingest(cache: AnswerCache, graph_data: dict):
+    cache.record_write(*written_items(graph_data))
+
+def test_dependencies():
+    rows = [{"o": {"name": "Acme", "summary": "x" * 200}}]
+    assert dependencies(ANCHORED, rows=rows) == ("keys", frozenset({"jinsu", "acme", "x" * 200}))
+    assert dependencies("MATCH (n) WHERE n.id = $id RETURN n", {"id": "P1"}) == ("keys", frozenset({"p1"}))
+    # Literals are blanked before reading labels
+    assert dependencies("MATCH (p:Person) WHERE p.bio = 'a:b' RETURN p") == ("labels", frozenset({"Person"}))
+
+def test_written_items():
+    labels, keys = written_items({
+        "nodes": [{"id": "P1", "label": "Person", "properties": {"name": "Jinsu"}}],
+        "relationships": [{"source": "P1", "target": "O1", "type": "WORKS_AT"}],
+    })
+    assert labels == {"Person", "WORKS_AT"}
+    assert keys == {"p1", "jinsu", "o1"}
+
+def test_hit_until_dependency_written():
+    cache = AnswerCache()
+    _store(cache, "Where does Jinsu work?", ANCHORED, rows=[{"o": {"name": "Acme"}}])
+    assert cache.lookup("where does jinsu work").answer == "answer"
+
+    _ingest(cache, {"nodes": [{"id": "S1", "label": "Skill", "properties": {"name": "Rust"}}]})
+    assert cache.lookup("Where does Jinsu work?") is not None
+
+    _ingest(cache, {"nodes": [{"id": "O1", "label": "Organization", "properties": {"name": "Acme"}}]})
+    assert cache.lookup("Where does Jinsu work?") is None
+    assert cache.stats()["stale"] == 1
+
+def test_label_dependency_invalidated_by_type_write():
+    cache = AnswerCache()
+    _store(cache, "Who has which skill?", UNANCHORED)
+    _ingest(cache, {"nodes": [{"id": "E1", "label": "Event", "properties": {"name": "Meetup"}}]})
+    assert cache.lookup("Who has which skill?") is not None
+    _ingest(cache, {"nodes": [], "relationships": [{"source": "a", "target": "b", "type": "HAS_SKILL"}]})
+    assert cache.lookup("Who has which skill?") is None
+
+def test_write_during_retrieval_makes_entry_stale():
+    cache = AnswerCache()
+    built_at = cache.version()
+    _ingest(cache, {"nodes": [{"id": "P2", "label": "Person", "properties": {"name": "Jinsu"}}]})
+    _store(cache, "Where does Jinsu work?", ANCHORED, built_at=built_at)
+    assert cache.lookup("Where does Jinsu work?") is None
+
+def test_stats_and_eviction():
+    cache = AnswerCache(max_entries=1)
+    _store(cache, "Where does Jinsu work?", ANCHORED)
+    _store(cache, "Who has which skill?", UNANCHORED)
+    assert cache.lookup("Where does Jinsu work?") is None
+    assert cache.lookup("Who has which skill?") is not None
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"], stats["llm_calls_avoided"]) == (1, 1, 1, 2)
+    cache.clear()
+    assert cache.lookup("Who has which skill?") is None
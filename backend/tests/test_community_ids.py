@@ -0,0 +1,46 @@
+import pytest
+
+from analysis import worker_pool
+from analysis.network_stats import match_groups
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    worker_pool._cached_groups.clear()
+    yield
+    worker_pool._cached_groups.clear()
+
+def _partition(groups: dict) -> dict:
+    """{group id: set of node ids}"""
+    members = {}
+    for nid, group in groups.items():
+        members.setdefault(group, set()).add(nid)
+    return members
+
+def test_unmatched_group_takes_id_above_previous():
+    assert match_groups({0: "a", 1: "a", 2: "b", 3: "b"}, {0: 5, 1: 5}) == {0: 5, 1: 5, 2: 6, 3: 6}
+    assert match_groups({0: "a", 1: "a", 2: "b"}, {0: 5}, max_id=9) == {0: 5, 1: 5, 2: 10}
+
+def test_matched_groups_keep_their_ids():
+    previous = {0: 3, 1: 3, 2: 7, 3: 7}
+    assert match_groups({0: "x", 1: "x", 2: "y", 3: "y", 4: "z"}, previous) == {0: 3, 1: 3, 2: 7, 3: 7, 4: 8}
+
+def test_overlapping_subgraphs_never_share_ids():
+    # First view: two clusters
+    first = worker_pool._store_groups({0: 1, 1: 1, 2: 2, 3: 2}, {}, ["a", "b", "c", "d"])
+    assert first[0] != first[2]
+
+    # Second view overlaps on "a" and "b" and brings two clusters the cache has not seen.
+    # Its detection numbered them 1 and 2 locally, the ids "a"/"b" and "c"/"d" already hold.
+    ids = ["a", "b", "e", "f", "g", "h"]
+    previous = {idx: worker_pool._cached_groups[nid] for idx, nid in enumerate(ids) if nid in worker_pool._cached_groups}
+    worker_pool._store_groups({0: 1, 1: 1, 2: 2, 3: 2, 4: 3, 5: 3}, previous, ids)
+
+    cache = worker_pool._cached_groups
+    assert cache["a"] == cache["b"] == first[0] # continued cluster keeps its id
+    expected = [{"a", "b"}, {"c", "d"}, {"e", "f"}, {"g", "h"}]
+    assert sorted(map(sorted, _partition(cache).values())) == sorted(map(sorted, expected))
+
+def test_disjoint_subgraph_does_not_reuse_ids():
+    worker_pool._store_groups({"a": 1, "b": 2}, {})
+    worker_pool._store_groups({"x": 1, "y": 2}, {})
+    assert len(set(worker_pool._cached_groups.values())) == 4
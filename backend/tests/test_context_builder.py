@@ -0,0 +1,49 @@
+from graphrag.context_builder import build_context, estimate_tokens
+
+JINSU = {"id": "P1", "name": "Jinsu", "summary": "Engineer", "pagerank": 0.1}
+
+def _skill(i: int, pagerank: float = 0.0) -> dict:
+    return {"id": f"S{i}", "name": f"Skill {i}", "pagerank": pagerank}
+
+def test_estimate_tokens():
+    assert estimate_tokens("abcdefgh") == 2
+    assert estimate_tokens("진수") == 2
+
+def test_empty_rows():
+    assert build_context([])[0] == "No information found in the graph."
+
+def test_entities_listed_once_with_refs():
+    rows = [{"p": JINSU, "r": (JINSU, "HAS_SKILL", _skill(1)), "n": 3},
+            {"p": JINSU, "r": (JINSU, "HAS_SKILL", _skill(2)), "n": None}]
+    text, tokens = build_context(rows)
+    assert text.splitlines() == [
+        "Entities:",
+        "E1 Jinsu (summary: Engineer)",
+        "E2 Skill 1",
+        "E3 Skill 2",
+        "Rows:",
+        "p | r | n",
+        "E1 | E1 -HAS_SKILL-> E2 | 3",
+        "E1 | E1 -HAS_SKILL-> E3 | ",
+    ]
+    assert tokens == estimate_tokens(text)
+
+def test_duplicate_rows_and_plain_values():
+    rows = [{"name": "a|b", "tags": ["x", "y"]}, {"name": "a|b", "tags": ["x", "y"]}]
+    assert build_context(rows)[0] == "name | tags\na/b | [x, y]"
+
+def test_budget_keeps_most_central_rows_in_query_order():
+    rows = [{"p": JINSU, "s": _skill(i, pagerank=i / 100)} for i in range(1, 21)]
+    text, tokens = build_context(rows, budget=60)
+    lines = text.splitlines()
+    shown = [line for line in lines if line.startswith("E1 | ")]
+    assert 0 < len(shown) < 20
+    assert lines[-1] == f"(Showing {len(shown)} of 20 rows.)"
+    # The highest-pagerank skills survive, listed in query order
+    entities = lines[2:lines.index("Rows:")]
+    assert [line.split(" ", 1)[1] for line in entities] == [f"Skill {i}" for i in range(21 - len(shown), 21)]
+    assert tokens <= 60
+
+def test_truncated_marker():
+    text, _ = build_context([{"n": 1}], truncated=True)
+    assert text.endswith("(Showing 1 of 1+ rows.)")
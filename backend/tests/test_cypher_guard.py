@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from graphrag.cypher_guard import UnsafeQueryError, bound_query, read_bounded
+
+@pytest.mark.parametrize("query", [
+    "CREATE (n:Person {name: 'x'}) RETURN n",
+    "MATCH (n) MERGE (n)-[:KNOWS]->(m) RETURN n",
+    "MATCH (n) SET n.name = 'x' RETURN n",
+    "MATCH (n) REMOVE n.name RETURN n",
+    "MATCH (n) DELETE n",
+    "MATCH (n) DETACH DELETE n",
+    "match (n) detach delete n",
+    "MATCH (n) FOREACH (x IN [1] | SET n.v = x)",
+    "LOAD CSV FROM 'file:///x.csv' AS row RETURN row",
+    "DROP INDEX entity_text",
+])
+def test_rejects_write_clauses(query):
+    with pytest.raises(UnsafeQueryError):
+        bound_query(query)
+
+@pytest.mark.parametrize("query", [
+    "CALL apoc.cypher.runWrite('MATCH (n) DETACH DELETE n', {})",
+    "CALL dbms.killQueries(['1'])",
+    "CALL gds.graph.drop('g')",
+    "RETURN apoc.text.join(['a'], '')",
+])
+def test_rejects_admin_and_plugin_procedures(query):
+    with pytest.raises(UnsafeQueryError):
+        bound_query(query)
+
+def test_rejects_multiple_statements():
+    with pytest.raises(UnsafeQueryError):
+        bound_query("MATCH (n) RETURN n; MATCH (m) RETURN m")
+
+def test_trailing_semicolon_is_not_a_second_statement():
+    assert bound_query("MATCH (n) RETURN n LIMIT 5;") == "MATCH (n) RETURN n LIMIT 5"
+
+def test_keywords_inside_literals_and_properties_are_allowed():
+    query = "MATCH (n) WHERE n.name = 'CREATE; DELETE' AND n.set IS NULL RETURN n.set LIMIT 5"
+    assert bound_query(query) == query
+
+def test_adds_missing_limit():
+    assert bound_query("MATCH (n:Person) RETURN n.name", max_rows=50) == "MATCH (n:Person) RETURN n.name\nLIMIT 50"
+
+def test_lowers_larger_limit():
+    assert bound_query("MATCH (n) RETURN n LIMIT 5000", max_rows=50) == "MATCH (n) RETURN n LIMIT 50"
+
+def test_keeps_smaller_limit():
+    assert bound_query("MATCH (n) RETURN n LIMIT 10", max_rows=50) == "MATCH (n) RETURN n LIMIT 10"
+
+def test_limit_inside_subquery_does_not_bound_the_result():
+    query = "CALL { MATCH (n) RETURN n LIMIT 1 } MATCH (n)--(m) RETURN m"
+    assert bound_query(query, max_rows=50).endswith("RETURN m\nLIMIT 50")
+
+def test_union_is_wrapped_and_bounded():
+    query = "MATCH (a:Person) RETURN a.name AS name UNION MATCH (b:Skill) RETURN b.name AS name"
+    assert bound_query(query, max_rows=50) == f"CALL {{\n{query}\n}}\nRETURN * LIMIT 50"
+
+# --- read_bounded (fake transaction) ---
+
+class _Record:
+    def __init__(self, row):
+        self.row = row
+
+    def data(self):
+        return self.row
+
+class _Result:
+    def __init__(self, rows, plan=None):
+        self.rows = rows
+        self.plan = plan
+        self.pulled = 0
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for row in self.rows:
+            self.pulled += 1
+            yield _Record(row)
+
+    async def consume(self):
+        return self
+
+class _Tx:
+    def __init__(self, rows, plan=None):
+        self.rows = rows
+        self.plan = plan
+        self.result = None
+
+    async def run(self, query, **params):
+        if query.startswith("EXPLAIN "):
+            return _Result([], self.plan)
+        self.result = _Result(self.rows)
+        return self.result
+
+def test_read_bounded_stops_at_row_cap():
+    tx = _Tx([{"i": i} for i in range(1000)])
+    rows, truncated = asyncio.run(read_bounded(tx, "MATCH (n) RETURN n", explain=False, max_rows=10))
+    assert rows == [{"i": i} for i in range(10)]
+    assert truncated
+    # Streaming stops right after the cap instead of pulling every record
+    assert tx.result.pulled == 11
+
+def test_read_bounded_stops_at_byte_cap():
+    tx = _Tx([{"text": "x" * 100} for _ in range(100)])
+    rows, truncated = asyncio.run(read_bounded(tx, "MATCH (n) RETURN n", explain=False, max_bytes=1000))
+    assert truncated
+    assert 0 < len(rows) < 10
+
+def test_read_bounded_returns_everything_under_the_caps():
+    tx = _Tx([{"i": i} for i in range(5)])
+    assert asyncio.run(read_bounded(tx, "MATCH (n) RETURN n", explain=False)) == ([{"i": i} for i in range(5)], False)
+
+def test_read_bounded_rejects_expensive_plans():
+    plan = {"args": {"EstimatedRows": 10.0}, "children": [{"args": {"EstimatedRows": 1e12}, "children": []}]}
+    with pytest.raises(UnsafeQueryError):
+        asyncio.run(read_bounded(_Tx([], plan), "MATCH (a), (b) RETURN a, b"))
@@ -0,0 +1,65 @@
+import random
+
+from analysis.degree_index import DegreeIndex
+from analysis.incremental_pagerank import IncrementalPageRank
+
+def _check(index: DegreeIndex, degrees: dict):
+    assert index.degree == degrees
+    assert index.max_degree == max(degrees.values(), default=0)
+    for d, bucket in index.buckets.items():
+        assert bucket and all(degrees[u] == d for u in bucket)
+
+def test_buckets_follow_updates():
+    index = DegreeIndex()
+    index.set_names({"a": "Alice", "b": "Bob", "c": "Carol"})
+    for u in "abc":
+        index.add(u)
+    index.increment("a")
+    index.increment("a")
+    index.increment("b")
+    _check(index, {"a": 2, "b": 1, "c": 0})
+    assert index.top(2) == [("Alice", 2), ("Bob", 1)]
+
+    index.decrement("a")
+    index.decrement("a")
+    index.decrement("c") # never below zero
+    _check(index, {"a": 0, "b": 1, "c": 0})
+    assert index.top(1) == [("Bob", 1)]
+
+    index.discard("b")
+    _check(index, {"a": 0, "c": 0})
+    assert index.top(5) == [("Alice", 0), ("Carol", 0)]
+
+def test_random_updates_stay_consistent():
+    index, degrees = DegreeIndex(), {}
+    rng = random.Random(0)
+    for _ in range(2000):
+        u = rng.randrange(50)
+        if rng.random() < 0.6:
+            index.increment(u)
+            degrees[u] = degrees.get(u, 0) + 1
+        elif u in degrees:
+            index.decrement(u)
+            degrees[u] = max(degrees[u] - 1, 0)
+    _check(index, degrees)
+
+def test_top_skips_unnamed_nodes():
+    index = DegreeIndex()
+    index.load({"a": 3, "b": 5, "c": 1})
+    index.set_names({"a": "Alice", "c": "Carol", "b": ""})
+    assert index.top(2) == [("Alice", 3), ("Carol", 1)]
+
+def test_top_names_follow_service_updates():
+    service = IncrementalPageRank(full_recompute_every=10 ** 9)
+    service.load(["hub", "x", "y"], [("hub", "x"), ("hub", "y")])
+    service.set_names({"hub": "Hub", "x": "X", "y": "Y", "z": "Z"})
+    assert service.top_names(1) == ["Hub"]
+
+    service.add(["z", "x"], [("z", "x"), ("z", "y"), ("z", "hub")])
+    assert set(service.top_names(2)) == {"Hub", "Z"} # both at degree 3
+    assert service.degree_index.degree == service.degrees()
+
+    service.remove_node("hub")
+    assert "Hub" not in service.top_names(10)
+    assert service.top_names(1) == ["Z"]
+    assert service.degree_index.degree == service.degrees()
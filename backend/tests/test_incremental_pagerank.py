@@ -0,0 +1,94 @@
+import random
+import threading
+
+import networkx as nx
+
+from analysis.incremental_pagerank import IncrementalPageRank, batch_names
+
+# Push tolerance tight enough to compare with networkx at 1e-5
+TOLERANCE = 1e-5
+
+def _max_error(service: IncrementalPageRank) -> float:
+    G = nx.Graph()
+    G.add_nodes_from(service.adj)
+    G.add_edges_from((u, v) for u, nbrs in service.adj.items() for v in nbrs)
+    # The service keeps an isolated node's mass on itself (self-loop); networkx would spread it
+    G.add_edges_from((u, u) for u, nbrs in service.adj.items() if not nbrs)
+    expected = nx.pagerank(G, alpha=0.85, tol=1e-12)
+    scores = service.scores()
+    return max(abs(scores[u] - expected[u]) for u in expected)
+
+def _loaded(n=200, m=800, seed=1, tolerance=TOLERANCE, **kwargs) -> IncrementalPageRank:
+    G = nx.gnm_random_graph(n, m, seed=seed)
+    service = IncrementalPageRank(tolerance=tolerance, **kwargs)
+    service.load([str(u) for u in G.nodes], [(str(u), str(v)) for u, v in G.edges])
+    return service
+
+def _wait_for_recompute(service: IncrementalPageRank):
+    for thread in threading.enumerate():
+        if thread.name == "pagerank-recompute":
+            thread.join()
+
+def test_load_matches_networkx():
+    assert _max_error(_loaded()) < 1e-5
+
+def test_default_tolerance_stays_close():
+    service = _loaded(tolerance=1e-3, full_recompute_every=10 ** 9)
+    for u in range(0, 200, 7):
+        service.add([str(u), "hub"], [(str(u), "hub")])
+    assert _max_error(service) < 1e-2 / len(service.adj)
+
+def test_local_updates_track_networkx():
+    # No full recompute in between: only local pushes
+    service = _loaded(full_recompute_every=10 ** 9)
+    rng = random.Random(2)
+    for _ in range(150):
+        u, v = str(rng.randrange(220)), str(rng.randrange(220))
+        if u != v:
+            service.add([u, v], [(u, v)])
+    assert _max_error(service) < 1e-5
+
+def test_node_removal_tracks_networkx():
+    service = _loaded(full_recompute_every=10 ** 9)
+    for u in ["0", "1", "2", "17", "150"]:
+        service.remove_node(u)
+    assert "0" not in service.adj
+    assert all("0" not in nbrs for nbrs in service.adj.values())
+    assert _max_error(service) < 1e-5
+
+def test_background_recompute_keeps_updates_made_meanwhile():
+    service = _loaded(full_recompute_every=40)
+    rng = random.Random(3)
+    for i in range(400):
+        u, v = str(rng.randrange(240)), str(rng.randrange(240))
+        if u != v:
+            service.add([u, v], [(u, v)])
+        if i % 50 == 0:
+            service.remove_node(str(rng.randrange(200)))
+    _wait_for_recompute(service)
+    # At least one rebuild ran (it resets the counter at its snapshot) and swapped in
+    assert service.updates_since_full < 400
+    assert service.log is None
+    assert service.degree_index.degree == service.degrees()
+    assert _max_error(service) < 1e-5
+
+def test_load_replays_updates_since_track_changes():
+    service = IncrementalPageRank(tolerance=TOLERANCE)
+    service.track_changes()
+    # Ingested while the bootstrap reads the graph
+    service.add(["x", "y"], [("x", "y")])
+    service.load(["a", "b"], [("a", "b")])
+    assert service.ready
+    assert sorted(service.adj) == ["a", "b", "x", "y"]
+    assert service.log is None
+    assert _max_error(service) < 1e-5
+
+def test_scores_for_unknown_nodes():
+    service = _loaded()
+    assert service.scores_for(["0", "1"]) is not None
+    assert service.scores_for(["0", "missing"]) is None
+    assert IncrementalPageRank().scores_for(["0"]) is None
+
+def test_batch_names():
+    batch = {"nodes": [{"id": "a", "name": "A"}, {"id": "b", "properties": {"name": "B"}}, {"id": "c"}]}
+    assert batch_names(batch) == {"a": "A", "b": "B"}
@@ -0,0 +1,121 @@
+import re
+import asyncio
+
+import pytest
+
+from parser import ingest
+from analysis.incremental_pagerank import IncrementalPageRank
+from graphrag.answer_cache import AnswerCache
+from graphrag.query_cache import QueryCache
+from graphrag.entity_index import EntityIndex
+from graphrag.vector_index import VectorIndex
+
+NODE_MERGE = re.compile(r"MERGE \(n:(\S+) \{(\w+): \$props\.\w+\}\)")
+REL_MERGE = re.compile(r"MERGE \(a\)-\[r:(\w+)\]->\(b\)")
+
+class _Result:
+    def __init__(self, record):
+        self.record = record
+
+    async def single(self):
+        return self.record
+
+class _Graph:
+    """In-memory stand-in for the MERGE / ON CREATE / before-snapshot queries of _ingest_batch_tx."""
+
+    def __init__(self):
+        self.nodes = {} # merge key -> (eid, props)
+        self.rels = {} # (from eid, type, to eid) -> props
+
+    def _write(self, store: dict, key, props: dict) -> dict:
+        created = key not in store
+        eid, stored = store.get(key) or (f"4:{len(self.nodes) + len(self.rels)}", {})
+        before = dict(stored)
+        store[key] = (eid, {**stored, **props})
+        changed = created or any(before.get(k) != v for k, v in props.items())
+        return {"eid": eid, "created": created, "changed": changed, "before": None if created else before}
+
+    async def run(self, query, **params):
+        rel = REL_MERGE.search(query)
+        if rel:
+            key = (params["from_eid"], rel.group(1), params["to_eid"])
+            return _Result(self._write(self.rels, key, params["rprops"]))
+        node = NODE_MERGE.search(query)
+        props = params["props"]
+        key = (node.group(1), props[node.group(2)]) if node else object() # CREATE: always new
+        return _Result(self._write(self.nodes, key, props))
+
+class _Session:
+    def __init__(self, graph):
+        self.graph = graph
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute_write(self, fn, *args):
+        return await fn(self.graph, *args)
+
+class _Driver:
+    def __init__(self):
+        self.graph = _Graph()
+
+    def session(self):
+        return _Session(self.graph)
+
+@pytest.fixture
+def ingestor(monkeypatch):
+    # Fresh process-wide indexes, so the test neither sees nor leaves global state
+    monkeypatch.setattr(ingest, "centrality_service", IncrementalPageRank())
+    monkeypatch.setattr(ingest, "answer_cache", AnswerCache())
+    monkeypatch.setattr(ingest, "query_cache", QueryCache())
+    monkeypatch.setattr(ingest, "entity_index", EntityIndex())
+    monkeypatch.setattr(ingest, "vector_index", VectorIndex())
+    return ingest.Neo4jIngestor(driver_override=_Driver())
+
+def _batch(nodes: list, relationships: list = ()) -> dict:
+    return {
+        "nodes": [{"id": nid, "label": "Concept", "name": name, "properties": dict(props)} for nid, name, props in nodes],
+        "relationships": [{"source": s, "target": t, "type": "RELATED_TO"} for s, t in relationships],
+    }
+
+def test_skipped_relationship_does_not_reach_centrality(ingestor):
+    batch = _batch([("a", "Alpha", {}), ("b", "Beta", {})], [("a", "b"), ("a", "ghost")])
+    diff = asyncio.run(ingestor.ingest_batch(batch))
+
+    service = ingest.centrality_service
+    assert set(service.adj) == {"a", "b"}
+    assert service.adj["a"] == {"b"}
+    assert [(link["source"], link["target"]) for link in diff["links"]] == [("a", "b")]
+
+def test_new_label_invalidates_cypher_cache(ingestor):
+    cache = ingest.query_cache
+    cache.set_schema(["Concept"], ["RELATED_TO"])
+    cache.store("What is related to Alpha?", "MATCH (:Concept {name: 'Alpha'})--(n) RETURN n.name")
+
+    asyncio.run(ingestor.ingest_batch(_batch([("a", "Alpha", {}), ("b", "Beta", {})], [("a", "b")])))
+    assert len(cache) == 1 # Concept and RELATED_TO were already known
+
+    batch = {"nodes": [{"id": "p", "label": "Project", "name": "Apollo", "properties": {}}], "relationships": []}
+    asyncio.run(ingestor.ingest_batch(batch))
+    assert len(cache) == 0
+    assert "Project" in cache.labels
+
+def test_second_write_is_an_update_with_before(ingestor):
+    first = asyncio.run(ingestor.ingest_batch(_batch(
+        [("a", "Alpha", {"summary": "old", "year": 2020}), ("b", "Beta", {})], [("a", "b")])))
+    assert [n["status"] for n in first["nodes"]] == ["created", "created"]
+    assert all("before" not in n for n in first["nodes"])
+    assert [l["status"] for l in first["links"]] == ["created"]
+
+    second = asyncio.run(ingestor.ingest_batch(_batch(
+        [("a", "Alpha", {"summary": "new", "year": 2020, "url": "https://example.com"}), ("b", "Beta", {})], [("a", "b")])))
+    # Beta and the relationship are unchanged, so only Alpha is in the diff
+    assert second["links"] == []
+    [node] = second["nodes"]
+    assert node["id"] == "a" and node["eid"] == first["nodes"][0]["eid"]
+    assert node["status"] == "updated"
+    assert node["before"] == {"summary": "old", "url": None}
+    assert node["properties"]["summary"] == "new"
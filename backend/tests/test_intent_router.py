@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from graphrag import retriever as retriever_module
+from graphrag.intent_router import RouterStats, route_question
+from graphrag.query_cache import QueryCache
+
+def _routed(question: str) -> tuple:
+    routed = route_question(question)
+    assert routed is not None, question
+    return routed.intent, routed.params
+
+@pytest.mark.parametrize("question, name", [
+    ("Where does Jinsu work?", "Jinsu"),
+    ("which company does Jinsu Kim work for?", "Jinsu Kim"),
+    ("진수는 어디에서 일해?", "진수"),
+    ("김진수의 회사는 어디야?", "김진수"),
+])
+def test_works_at(question, name):
+    assert _routed(question) == ("works_at", {"name": name})
+
+@pytest.mark.parametrize("question, name", [
+    ("What are Jinsu's skills?", "Jinsu"),
+    ("what skills does Mary-Jane have", "Mary-Jane"),
+    ("진수의 스킬은 뭐야?", "진수"),
+])
+def test_skills(question, name):
+    assert _routed(question) == ("skills", {"name": name})
+
+@pytest.mark.parametrize("question, name", [
+    ("What is Jinsu interested in?", "Jinsu"),
+    ("진수의 관심사는?", "진수"),
+    ("진수는 뭐에 관심 있어?", "진수"),
+])
+def test_interests(question, name):
+    assert _routed(question) == ("interests", {"name": name})
+
+@pytest.mark.parametrize("question, name", [
+    ("What did Jinsu do?", "Jinsu"),
+    ("진수는 무슨 일을 했어?", "진수"),
+])
+def test_person_events(question, name):
+    assert _routed(question) == ("person_events", {"name": name})
+
+@pytest.mark.parametrize("question, period", [
+    ("What happened in March 2024?", "2024-03"),
+    ("what happened in 2024-3", "2024-03"),
+    ("events in 2023", "2023"),
+    ("2024년 3월에 무슨 일이 있었어?", "2024-03"),
+    ("2024년 이벤트", "2024"),
+])
+def test_events_in_period(question, period):
+    assert _routed(question) == ("events_in_period", {"period": period})
+
+@pytest.mark.parametrize("question", [
+    "Where does the company of Jinsu work?", # works_at shape, but the slot is not a name
+    "Where does Jinsu Kim Lee Park work?", # slot too long to trust
+    "What skills are trending?", # skills
+    "What is the capital of France?", # interests-like 'what is'
+    "what did Jinsu do in 2024", # person_events plus a period no template covers
+    "What happened in 1850?", # events_in_period outside the year range
+    "Where does Jinsu work and what are his skills?",
+])
+def test_non_matches_fall_through(question):
+    assert route_question(question) is None
+
+def test_quoted_slot_is_a_parameter():
+    routed = route_question("where did O'Brien work")
+    assert routed.params == {"name": "O'Brien"}
+    # The name is bound as $name, never spliced into the Cypher
+    assert "O'Brien" not in routed.cypher and "$name" in routed.cypher
+    # Double quotes are not part of a name; the LLM handles the question
+    assert route_question('Where does "Jinsu" work?') is None
+
+def test_resolved_person_uses_element_ids():
+    routed = route_question("Where does Jinsu work?")
+    routed.params["person_ids"] = ["4:1"]
+    assert "elementId(p) IN $person_ids" in routed.cypher
+    assert "$PERSON" not in routed.cypher
+
+class _Retriever(retriever_module.GraphRetriever):
+    """Serves template queries from `rows` and records the LLM-generated ones."""
+
+    def __init__(self, rows):
+        super().__init__(driver=object())
+        self.rows = rows
+        self.queries = []
+
+    async def _resolve_person(self, name):
+        return {}
+
+    async def _resolve_mentions(self, question):
+        return []
+
+    async def _seeded_retrieve(self, question):
+        return None
+
+    async def _execute_query(self, query, explain=True, **params):
+        self.queries.append(query)
+        return (self.rows if "$name" in query else [{"answer": "from the LLM query"}]), False
+
+@pytest.fixture
+def llm(monkeypatch):
+    calls = []
+
+    def generate_cypher(question, entities=None):
+        calls.append(question)
+        return "MATCH (n:Person) RETURN n.name AS answer LIMIT 1"
+
+    monkeypatch.setattr(retriever_module, "generate_cypher", generate_cypher)
+    monkeypatch.setattr(retriever_module, "query_cache", QueryCache())
+    monkeypatch.setattr(retriever_module, "router_stats", RouterStats())
+    return calls
+
+def test_routed_question_skips_the_llm(llm):
+    retriever = _Retriever([{"organization": "Acme", "role": "Engineer", "start_date": "2020"}])
+    context = asyncio.run(retriever.retrieve("Where does Jinsu work?"))
+    assert llm == [] and retriever.llm_calls == 0
+    assert "Acme" in context
+
+def test_empty_template_result_falls_back_to_the_llm(llm):
+    retriever = _Retriever([])
+    context = asyncio.run(retriever.retrieve("Where does Jinsu work?"))
+    assert llm == ["Where does Jinsu work?"]
+    assert "from the LLM query" in context
+    assert retriever_module.router_stats.routed_empty == 1
+
+def test_unmatched_question_goes_to_the_llm(llm):
+    retriever = _Retriever([])
+    asyncio.run(retriever.retrieve("Who knows the most about graphs?"))
+    assert llm == ["Who knows the most about graphs?"]
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+import server
+from analysis.incremental_pagerank import IncrementalPageRank
+from graphrag.answer_cache import AnswerCache
+from graphrag.entity_index import EntityIndex
+from graphrag.query_cache import QueryCache
+from graphrag.vector_index import VectorIndex
+
+class _Node(dict):
+    def __init__(self, element_id, labels, props):
+        super().__init__(props)
+        self.element_id = element_id
+        self.labels = frozenset(labels)
+
+class _Result:
+    def __init__(self, records):
+        self.records = records
+
+    async def single(self):
+        return self.records[0] if self.records else None
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for record in self.records:
+            yield record
+
+class _Graph:
+    """Nodes by elementId, answering the queries of the manual add / update handlers."""
+
+    def __init__(self):
+        self.nodes = {} # eid -> _Node
+
+    def _find(self, key):
+        return [n for eid, n in self.nodes.items() if key in (eid, n.get("id"))]
+
+    async def run(self, query, **params):
+        if "MERGE (n:Concept {id: $id})" in query:
+            found = self._find(params["id"])
+            node = found[0] if found else _Node(f"4:{len(self.nodes)}", ["Concept"], {})
+            node.update(params["props"])
+            self.nodes[node.element_id] = node
+            return _Result([{"eid": node.element_id, "labels": sorted(node.labels), "props": dict(node)}])
+        if "MERGE (a)-[r:RELATED]->(b)" in query:
+            return _Result([{"pid": n.get("id") or n.element_id, "peid": n.element_id} for n in self._find(params["pid"])])
+        if "SET n += $props" in query:
+            found = self._find(params["id"])
+            for node in found:
+                node.update(params["props"])
+            return _Result([{"n": node} for node in found])
+        raise AssertionError(f"unexpected query: {query}")
+
+class _Session:
+    def __init__(self, graph):
+        self.graph = graph
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute_write(self, fn, *args, **params):
+        return await fn(self.graph, *args, **params)
+
+class _Driver:
+    def __init__(self):
+        self.graph = _Graph()
+
+    def session(self):
+        return _Session(self.graph)
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(server, "driver", _Driver())
+    monkeypatch.setattr(server, "centrality_service", IncrementalPageRank())
+    monkeypatch.setattr(server, "answer_cache", AnswerCache())
+    monkeypatch.setattr(server, "query_cache", QueryCache())
+    monkeypatch.setattr(server, "entity_index", EntityIndex())
+    monkeypatch.setattr(server, "vector_index", VectorIndex())
+
+def _add(name: str, parent_id: str = None) -> str:
+    response = asyncio.run(server.add_node_manual(server.AddNodeRequest(name=name, parent_id=parent_id)))
+    return response["node_id"]
+
+def _eids(matches) -> list:
+    return [m["eid"] for m in matches]
+
+def test_added_node_is_resolvable():
+    _add("Quantum Sensing")
+    matches = server.entity_index.search_local("quantum")
+    assert [(m["label"], m["text"]) for m in matches] == [("Concept", "Quantum Sensing")]
+    assert _eids(server.vector_index.search("quantum sensors")) == _eids(matches)
+
+def test_rename_replaces_indexed_text():
+    _add("Quantum Sensing")
+    eid = _eids(server.entity_index.search_local("quantum"))[0]
+    asyncio.run(server.update_node(server.UpdateNodeRequest(id=eid, properties={"name": "Photonic Sensing"})))
+    assert server.entity_index.search_local("quantum") == []
+    assert _eids(server.entity_index.search_local("photonic")) == [eid]
+    # Re-embedded in place: the old name no longer matches
+    assert server.vector_index.search("quantum") == []
+    assert _eids(server.vector_index.search("photonic")) == [eid]
@@ -0,0 +1,70 @@
+from graphrag.query_cache import QueryCache, normalize_question
+
+WORKS_AT = "MATCH (p:Person {name: 'Jinsu'})-[:WORKS_AT]->(o) RETURN o.name"
+TOP_PEOPLE = "MATCH (p:Person) RETURN p LIMIT 5"
+
+def _cache(**kwargs) -> QueryCache:
+    cache = QueryCache(**kwargs)
+    cache.store("Where does Jinsu work?", WORKS_AT)
+    cache.store("Who are the top 5 people?", TOP_PEOPLE)
+    return cache
+
+def test_normalize_question():
+    assert normalize_question("  Where does  Jinsu work?! ") == "where does jinsu work"
+
+def test_exact_and_normalized_hits():
+    cache = _cache()
+    assert cache.lookup("Where does Jinsu work?") == WORKS_AT
+    assert cache.lookup("where does jinsu work") == WORKS_AT
+
+def test_paraphrase_hit():
+    cache = _cache()
+    assert cache.lookup("Where does Jinsu work now?") == WORKS_AT
+    assert cache.lookup("who are the top 5 people please") == TOP_PEOPLE
+
+def test_different_name_misses():
+    # Similar enough by trigrams, but the cached query's literal 'Jinsu' is not in the question
+    assert _cache(min_similarity=0.5).lookup("Where does Minsu work?") is None
+
+def test_different_tense_misses():
+    assert _cache().lookup("Where did Jinsu work?") is None
+
+def test_different_number_misses():
+    assert _cache(min_similarity=0.5).lookup("Who are the top 10 people?") is None
+
+def test_invalidate_and_discard():
+    cache = _cache()
+    cache.invalidate(WORKS_AT)
+    assert cache.lookup("Where does Jinsu work?") is None
+    cache.discard("Who are the top 5 people?")
+    assert len(cache) == 0
+    assert cache.postings == {}
+
+def test_lru_eviction():
+    cache = _cache(max_entries=2)
+    cache.lookup("Where does Jinsu work?") # most recently used
+    cache.store("How many skills are there?", "MATCH (s:Skill) RETURN count(s)")
+    assert len(cache) == 2
+    assert cache.lookup("Who are the top 5 people?") is None
+    assert cache.lookup("Where does Jinsu work?") == WORKS_AT
+
+def test_new_label_or_type_drops_entries():
+    cache = _cache()
+    cache.set_schema(["Person", "Organization"], ["WORKS_AT"])
+    cache.store("Where does Jinsu work?", WORKS_AT)
+    cache.observe_schema(["Person"], ["WORKS_AT"]) # nothing new
+    assert cache.lookup("Where does Jinsu work?") == WORKS_AT
+    cache.observe_schema(["Person", "Project"], [])
+    assert cache.lookup("Where does Jinsu work?") is None
+    cache.store("Where does Jinsu work?", WORKS_AT)
+    cache.observe_schema([], ["MANAGES"])
+    assert len(cache) == 0
+
+def test_query_from_older_schema_is_not_stored():
+    cache = QueryCache()
+    version = cache.version
+    cache.observe_schema(["Person"], [])
+    cache.store("Where does Jinsu work?", WORKS_AT, version)
+    assert len(cache) == 0
+    cache.store("Where does Jinsu work?", WORKS_AT, cache.version)
+    assert len(cache) == 1
@@ -0,0 +1,63 @@
+from analysis.root_index import RootIndex, normalize_key
+
+NODES = [
+    {"id": "artificial_intelligence", "name": "Artificial Intelligence"},
+    {"id": "ai_ethics", "name": "AI Ethics"},
+    {"id": "4:abc:12", "name": "Machine Learning"},
+    {"id": "deep_learning", "name": "Deep Learning", "topic": "neural networks"},
+    {"id": "robotics", "name": "Robotics"},
+]
+
+def test_normalize_key_matches_extractor_ids():
+    assert normalize_key("  Artificial Intelligence ") == "artificial_intelligence"
+
+def test_exact_id_match():
+    assert RootIndex(NODES).resolve("artificial_intelligence") == "artificial_intelligence"
+
+def test_exact_name_match_on_element_id_node():
+    # Nodes without an id property are keyed by elementId; the name still resolves
+    assert RootIndex(NODES).resolve("Machine Learning") == "4:abc:12"
+
+def test_exact_match_ranks_above_partial():
+    ranked = RootIndex(NODES).rank("AI Ethics")
+    assert ranked[0][0] == "ai_ethics"
+    assert ranked[0][1] > 1.0
+
+def test_topic_match():
+    assert RootIndex(NODES).resolve("neural networks") == "deep_learning"
+
+def test_token_match():
+    # 'ethics' is one token of 'ai_ethics'
+    assert RootIndex(NODES).resolve("ethics") == "ai_ethics"
+
+def test_trigram_match_for_typos():
+    index = RootIndex(NODES)
+    assert index.resolve("robotcs") == "robotics"
+    # Only built when no token matched
+    assert index.trigrams is not None
+
+def test_trigram_index_is_lazy():
+    index = RootIndex(NODES)
+    index.resolve("robotics")
+    assert index.trigrams is None
+
+def test_no_match():
+    assert RootIndex(NODES).resolve("quantum chromodynamics") is None
+
+def test_flagged_root_wins():
+    nodes = NODES + [{"id": "search_root", "name": "Search Root", "isRoot": True}]
+    assert RootIndex(nodes).resolve("robotics") == "search_root"
+
+def test_best_flagged_root_for_the_query():
+    nodes = [
+        {"id": "python", "name": "Python", "properties": {"isRoot": True}},
+        {"id": "rust", "name": "Rust", "properties": {"isRoot": True}},
+    ]
+    assert RootIndex(nodes).resolve("rust") == "rust"
+
+def test_resolution_is_memoized():
+    index = RootIndex(NODES)
+    assert index.resolve("Robotics") == "robotics"
+    index.keys.clear()
+    index.exact.clear()
+    assert index.resolve("robotics") == "robotics"
@@ -0,0 +1,77 @@
+import numpy as np
+
+from graphrag.vector_index import VectorIndex, embed
+
+def _record(eid, name, topic=None, summary=None, labels=("Concept",)):
+    return {"eid": eid, "labels": list(labels), "name": name, "topic": topic, "summary": summary}
+
+def _eids(matches) -> list:
+    return [m["eid"] for m in matches]
+
+def _index() -> VectorIndex:
+    index = VectorIndex()
+    index.add("e1", ["Skill"], {"name": "Robotics", "summary": "Building autonomous robots"})
+    index.add("e2", ["Organization"], {"name": "Acme Bakery", "summary": "Bread and pastries"})
+    index.add("e3", ["Person"], {"name": "Jinsu Kim", "summary": "Works on machine learning"})
+    return index
+
+def test_embedding_is_unit_length():
+    assert abs(np.linalg.norm(embed("robot arms")) - 1.0) < 1e-5
+    assert not embed("who is the").any() # stopwords only
+
+def test_search_finds_related_spelling():
+    matches = _index().search("robot")
+    assert _eids(matches)[0] == "e1"
+    assert matches[0]["label"] == "Skill"
+    assert matches[0]["text"] == "Robotics"
+
+def test_unrelated_query_is_below_threshold():
+    assert _index().search("quantum chromodynamics") == []
+
+def test_add_replaces_and_remove_drops():
+    index = _index()
+    index.add("e2", ["Organization"], {"name": "Acme Robot Works"})
+    assert index.size == 3 # updated in place
+    assert "e2" in _eids(index.search("robot works"))
+    index.remove("e1")
+    assert "e1" not in _eids(index.search("robotics"))
+    # A node without text is removed rather than indexed as a zero vector
+    index.add("e3", ["Person"], {"name": ""})
+    assert "e3" not in index.rows
+
+def test_load_replays_changes_made_meanwhile():
+    index = _index()
+    index.track_changes()
+    index.add("e4", ["Skill"], {"name": "Pastry baking"})
+    index.remove("e3")
+    index.load([_record("e1", "Robotics"), _record("e3", "Jinsu Kim"), _record("e5", "Gardening")])
+    assert set(index.rows) == {"e1", "e4", "e5"}
+    assert index.pending is None
+    assert _eids(index.search("pastry"))[0] == "e4"
+
+def test_clear_discards_outdated_load():
+    index = _index()
+
+    def records():
+        yield _record("e1", "Robotics")
+        index.clear() # e.g. a graph reset while the startup load is still reading
+        yield _record("e2", "Acme Bakery")
+
+    index.load(records())
+    assert index.size == 0
+    assert index.pending is None
+
+def test_ivf_search_matches_exact():
+    rng = np.random.default_rng(0)
+    words = ["alpha", "beta", "gamma", "delta", "omega", "sigma", "kappa", "theta"]
+    index = VectorIndex()
+    for i in range(600):
+        name = " ".join(rng.choice(words, 2, replace=False)) + f" item{i}"
+        index.add(f"e{i}", ["Concept"], {"name": name})
+    exact = _eids(index.search("item123"))
+    index.train()
+    assert index.ivf is not None
+    index.add("late", ["Concept"], {"name": "item123 late"}) # filed after training
+    found = _eids(index.search("item123"))
+    assert exact[0] in found
+    assert "late" in found
@@ -18,6 +18,10 @@ const nextConfig: NextConfig = {
         source: '/api/chat',
         destination: `${API_URL}/chat`,
       },
+      {
+        source: '/api/chat/:path*',
+        destination: `${API_URL}/chat/:path*`,
+      },
       {
         source: '/api/ingest',
         destination: `${API_URL}/ingest`,
@@ -4,7 +4,7 @@ import { signIn, useSession } from "next-auth/react";
 import { useState, useEffect, useRef } from 'react';
 import axios from 'axios';
 import dynamic from 'next/dynamic';
-import { Network, Database, Trash2, Plus, HelpCircle, RefreshCw, Maximize2, X, Upload, Save, MessageCircle, ChevronDown, ChevronUp, Layers } from 'lucide-react';
+import { Network, Database, Trash2, Plus, HelpCircle, RefreshCw, Maximize2, X, Upload, Save, MessageCircle, ChevronDown, ChevronUp, Layers, Share2 } from 'lucide-react';
 import { AmbientBackground } from '@/components/ui/AmbientBackground';
 import { AppSidebar } from '@/components/layout/AppSidebar';
 import MagicInput from '@/components/MagicInput';
@@ -248,10 +248,56 @@ export default function Home() {
                     setMessages(prev => [...prev, { role: 'agent', text: `Expanded graph with "${text}".` }]);
                 }
             } else {
-                // Chat / Interaction
-                const res = await axios.post(`${API_URL}/chat`, { message: text });
-                setMessages(prev => [...prev, { role: 'agent', text: res.data.answer }]);
-                if (res.data.nodes_created > 0) refreshGraph();
+                // Chat / Interaction (streamed: context, answer tokens, interviewer question)
+                const res = await fetch(`${API_URL}/chat/stream`, {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ message: text }),
+                });
+                if (!res.ok || !res.body) throw new Error(`Chat stream failed: ${res.status}`);
+
+                setMessages(prev => [...prev, { role: 'agent', text: '' }]);
+                const appendToAnswer = (chunk: string, separator = '') => setMessages(prev => {
+                    const next = [...prev];
+                    const last = next[next.length - 1];
+                    next[next.length - 1] = { ...last, text: last.text ? last.text + separator + chunk : chunk };
+                    return next;
+                });
+
+                const reader = res.body.getReader();
+                const decoder = new TextDecoder();
+                let buffer = '';
+                let nodesCreated = 0;
+                while (true) {
+                    const { done, value } = await reader.read();
+                    if (done) break;
+                    buffer += decoder.decode(value, { stream: true });
+                    const events = buffer.split('\n\n');
+                    buffer = events.pop() ?? '';
+                    for (const raw of events) {
+                        let event = 'message';
+                        let data = '';
+                        for (const line of raw.split('\n')) {
+                            if (line.startsWith('event:')) event = line.slice(6).trim();
+                            else if (line.startsWith('data:')) data += line.slice(5).trim();
+                        }
+                        if (!data) continue;
+                        const payload = JSON.parse(data);
+                        if (event === 'context') {
+                            setIsLoading(false);
+                        } else if (event === 'token') {
+                            appendToAnswer(payload.text);
+                        } else if (event === 'question') {
+                            // Genesis mode sends only the question, without the interviewer prefix
+                            appendToAnswer(payload.question, '\n\n(Interviewer): ');
+                        } else if (event === 'done') {
+                            nodesCreated = payload.nodes_created;
+                        } else if (event === 'error') {
+                            appendToAnswer(payload.message);
+                        }
+                    }
+                }
+                if (nodesCreated > 0) refreshGraph();
             }
         } catch (e) {
             console.error(e);
@@ -376,6 +422,27 @@ export default function Home() {
         }
     };
 
+    // Lazy neighborhood loading: stored graph only, no web search
+    const handleLoadNeighbors = async () => {
+        if (!selectedNode) return;
+        setIsLoading(true);
+        try {
+            const label = /^[A-Za-z0-9_]+$/.test(selectedNode.label || '') && selectedNode.label !== 'Unknown' ? selectedNode.label : undefined;
+            const res = await axios.get(`${API_URL}/graph/expand`, {
+                params: { node_id: selectedNode.id, label, depth: 1 }
+            });
+            setGraphData(prev => mergeGraphData(prev, res.data));
+            setArrangeTrigger(prev => prev + 1);
+            const loaded = res.data.nodes.length - 1;
+            setMessages(prev => [...prev, { role: 'agent', text: `Loaded ${loaded} neighbors of "${selectedNode.name || selectedNode.id}".` }]);
+        } catch (e) {
+            console.error(e);
+            setMessages(prev => [...prev, { role: 'agent', text: "Failed to load neighbors." }]);
+        } finally {
+            setIsLoading(false);
+        }
+    };
+
     const handleNodeAdd = async () => {
         if (!selectedNode) return;
         const name = window.prompt("새로운 지식(노드)의 이름을 입력하세요:");
@@ -624,6 +691,13 @@ export default function Home() {
                                     >
                                         <Plus className="w-3.5 h-3.5" /> ADD
                                     </button>
+                                    <button
+                                        onClick={handleLoadNeighbors}
+                                        className="flex-1 py-2 bg-cyan-500/5 border border-cyan-500/20 rounded-xl text-cyan-400 text-[10px] font-bold hover:bg-cyan-500/10 transition-all flex items-center justify-center gap-2 tracking-widest"
+                                        title="Load stored neighbors"
+                                    >
+                                        <Share2 className="w-3.5 h-3.5" /> NEIGHBORS
+                                    </button>
                                     <button
                                         onClick={handleNodeDelete}
                                         className="px-4 py-2 bg-red-500/5 border border-red-500/20 rounded-xl text-red-400 text-[10px] font-bold hover:bg-red-500/10 transition-all flex items-center justify-center gap-2"
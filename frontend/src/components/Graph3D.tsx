@@ -71,6 +71,12 @@ const Graph3D = forwardRef<Graph3DRef, Graph3DProps>((props, ref) => {
         return { nodes: Array.from(nodeMap.values()), links: newLinks };
     }, [data]);
 
+    // Backend layout: every node arrives pinned, so the simulation has nothing to settle
+    const hasServerLayout = useMemo(
+        () => cleanData.nodes.length > 0 && cleanData.nodes.every((n: any) => n.fx !== undefined),
+        [cleanData]
+    );
+
     // Initial / New Data Recenter (Stable)
     useEffect(() => {
         if (!fgRef.current || !cleanData.nodes.length || selectedNodeId) return;
@@ -244,7 +250,7 @@ const Graph3D = forwardRef<Graph3DRef, Graph3DProps>((props, ref) => {
                 showNavInfo={false}
                 d3VelocityDecay={0.5} // Higher dampening to prevent jitter (Organic Flow)
                 d3AlphaDecay={0.015}  // Much slower settling for liquid-like movement
-                cooldownTicks={1000}  // Allow longer settling time
+                cooldownTicks={hasServerLayout ? 0 : 1000}  // Allow longer settling time
 
                 // Node Props
                 nodeThreeObject={nodeObject}